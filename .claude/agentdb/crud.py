@@ -32,7 +32,7 @@ from __future__ import annotations
 import fnmatch
 import logging
 from datetime import datetime, timedelta
-from typing import Any, Optional, Union
+from typing import Any, Iterable, Optional, Union
 
 from .db import Database
 from .models import (
@@ -200,6 +200,29 @@ class FileRepository(BaseRepository):
             return File.from_row(row)
         return None
 
+    def get_ids_by_paths(self, paths: Iterable[str]) -> dict[str, int]:
+        """
+        Résout plusieurs chemins en IDs, par lots de requêtes IN.
+
+        Args:
+            paths: Chemins de fichiers (relatifs à la racine du projet)
+
+        Returns:
+            Dictionnaire {path: id} des seuls chemins présents en base
+        """
+        paths = list(dict.fromkeys(paths))
+        ids: dict[str, int] = {}
+        # Reste sous la limite de variables SQLite (999 sur les anciennes versions)
+        for i in range(0, len(paths), 500):
+            batch = paths[i:i + 500]
+            placeholders = ", ".join(["?"] * len(batch))
+            rows = self.db.fetch_all(
+                f"SELECT id, path FROM {self.TABLE} WHERE path IN ({placeholders})",
+                tuple(batch),
+            )
+            ids.update((row["path"], row["id"]) for row in rows)
+        return ids
+
     def get_all(self, limit: int = 1000, offset: int = 0) -> list[File]:
         """
         Récupère tous les fichiers avec pagination.
@@ -483,6 +506,8 @@ class SymbolRepository(BaseRepository):
         """
         Insère plusieurs symboles en batch.
 
+        Chaque Symbol reçoit l'ID qui lui a été attribué.
+
         Args:
             symbols: Liste de Symbol à insérer
 
@@ -492,22 +517,29 @@ class SymbolRepository(BaseRepository):
         if not symbols:
             return 0
 
+        # Chaque objet n'est sérialisé qu'une fois : les colonnes sont
+        # reprises du premier dict au lieu d'un second to_dict()
         now = datetime.now().isoformat()
         params = []
+        columns: list[str] = []
         for s in symbols:
             data = s.to_dict(exclude_id=True)
             if not data.get("indexed_at"):
                 data["indexed_at"] = now
+            if not columns:
+                columns = list(data)
             params.append(tuple(data.values()))
 
-        columns = list(symbols[0].to_dict(exclude_id=True).keys())
         placeholders = ", ".join(["?"] * len(columns))
         sql = f"INSERT INTO {self.TABLE} ({', '.join(columns)}) VALUES ({placeholders})"
 
-        count = self.db.execute_many(sql, params)
+        # Les IDs générés sont reportés sur les objets (évite une relecture)
+        ids = self.db.insert_many_ids(sql, params)
+        for s, symbol_id in zip(symbols, ids):
+            s.id = symbol_id
 
-        logger.debug(f"Inserted {count} symbols")
-        return count
+        logger.debug(f"Inserted {len(ids)} symbols")
+        return len(ids)
 
     def get_by_id(self, symbol_id: int) -> Optional[Symbol]:
         """
@@ -858,12 +890,13 @@ class RelationRepository(BaseRepository):
         if not relations:
             return 0
 
-        data = relations[0].to_dict(exclude_id=True)
-        columns = list(data.keys())
+        # Une seule sérialisation par relation (la première fournit les colonnes)
+        rows = [r.to_dict(exclude_id=True) for r in relations]
+        columns = list(rows[0])
         placeholders = ", ".join(["?"] * len(columns))
         sql = f"INSERT INTO {self.TABLE} ({', '.join(columns)}) VALUES ({placeholders})"
 
-        params = [tuple(r.to_dict(exclude_id=True).values()) for r in relations]
+        params = [tuple(data.values()) for data in rows]
         return self.db.execute_many(sql, params)
 
     def insert_or_increment(self, relation: Relation) -> int:
@@ -1113,6 +1146,29 @@ class FileRelationRepository(BaseRepository):
         cursor.close()
         return rel_id
 
+    def insert_many(self, relations: list[FileRelation]) -> int:
+        """
+        Insère plusieurs relations entre fichiers en batch.
+
+        Les doublons (même source, cible et type) sont ignorés.
+
+        Args:
+            relations: Liste de FileRelation à insérer
+
+        Returns:
+            Nombre de relations insérées
+        """
+        if not relations:
+            return 0
+
+        rows = [r.to_dict(exclude_id=True) for r in relations]
+        columns = list(rows[0])
+        placeholders = ", ".join(["?"] * len(columns))
+        sql = f"INSERT OR IGNORE INTO {self.TABLE} ({', '.join(columns)}) VALUES ({placeholders})"
+
+        params = [tuple(data.values()) for data in rows]
+        return self.db.execute_many(sql, params)
+
     def get_includes(self, source_file_id: int) -> list[FileRelation]:
         """
         Récupère les fichiers inclus par un fichier.
@@ -1744,15 +1800,19 @@ class SnapshotSymbolRepository(BaseRepository):
         if not snapshots:
             return 0
 
+        # Chaque objet n'est sérialisé qu'une fois : les colonnes sont
+        # reprises du premier dict au lieu d'un second to_dict()
         now = datetime.now().isoformat()
         params = []
+        columns: list[str] = []
         for s in snapshots:
             data = s.to_dict(exclude_id=True)
             if not data.get("created_at"):
                 data["created_at"] = now
+            if not columns:
+                columns = list(data)
             params.append(tuple(data.values()))
 
-        columns = list(snapshots[0].to_dict(exclude_id=True).keys())
         placeholders = ", ".join(["?"] * len(columns))
         sql = f"INSERT INTO {self.TABLE} ({', '.join(columns)}) VALUES ({placeholders})"
 
@@ -51,8 +51,14 @@ PRAGMA journal_mode = WAL;
 PRAGMA synchronous = NORMAL;
 PRAGMA cache_size = -64000;
 PRAGMA temp_store = MEMORY;
+PRAGMA mmap_size = 268435456;
 """
 
+# Taille du cache de requêtes préparées de la connexion (clé = texte SQL).
+# Les requêtes de queries.py et des outils MCP sont des constantes : une
+# fois préparées, elles ne sont plus ni re-parsées ni re-planifiées.
+STATEMENT_CACHE_SIZE = 256
+
 # Tables requises pour vérifier l'initialisation
 REQUIRED_TABLES = [
     "files",
@@ -140,6 +146,8 @@ class Database:
         self.path = Path(path)
         self._connection: Optional[sqlite3.Connection] = None
         self._lock = threading.RLock()
+        # Profondeur de transaction : execute() ne commite pas à l'intérieur
+        self._tx_depth = 0
 
     @property
     def connection(self) -> sqlite3.Connection:
@@ -179,6 +187,7 @@ class Database:
                     str(self.path),
                     check_same_thread=False,  # Pour usage multi-thread avec lock
                     timeout=30.0,
+                    cached_statements=STATEMENT_CACHE_SIZE,
                 )
 
                 # Configurer le row factory pour retourner des dicts
@@ -252,6 +261,11 @@ class Database:
                 cursor.execute("UPDATE ...")
             # Auto-commit si pas d'erreur, rollback sinon
 
+        Les appels execute()/execute_many() faits dans le bloc ne commitent
+        pas individuellement : tout est validé en une fois à la sortie.
+        Une transaction imbriquée devient un SAVEPOINT : en cas d'erreur,
+        seules ses propres écritures sont annulées.
+
         Yields:
             Curseur SQLite
 
@@ -260,17 +274,65 @@ class Database:
         """
         with self._lock:
             cursor = self.connection.cursor()
+            depth = self._tx_depth
+            savepoint = f"agentdb_sp_{depth}"
+            if depth == 0:
+                if not self.connection.in_transaction:
+                    cursor.execute("BEGIN")
+            else:
+                cursor.execute(f"SAVEPOINT {savepoint}")
+            self._tx_depth += 1
             try:
                 yield cursor
-                self.connection.commit()
-                logger.debug("Transaction committed")
+                if depth == 0:
+                    self.connection.commit()
+                    logger.debug("Transaction committed")
+                else:
+                    cursor.execute(f"RELEASE {savepoint}")
             except Exception as e:
-                self.connection.rollback()
+                if depth == 0:
+                    self.connection.rollback()
+                else:
+                    cursor.execute(f"ROLLBACK TO {savepoint}")
+                    cursor.execute(f"RELEASE {savepoint}")
                 logger.error(f"Transaction rolled back: {e}")
                 raise TransactionError(f"Transaction failed: {e}") from e
             finally:
+                self._tx_depth -= 1
                 cursor.close()
 
+    @contextmanager
+    def deferred_indexes(self, *tables: str) -> Generator[None, None, None]:
+        """
+        Supprime les index secondaires de tables le temps d'un chargement massif.
+
+        Construire un index en une passe après coup est bien plus rapide que
+        le maintenir ligne par ligne. Les index sont recréés à la sortie, même
+        en cas d'erreur (dans une transaction, un rollback annule l'ensemble).
+        Le chargement ne doit pas dépendre de ces index pour ses lectures.
+
+        Usage:
+            with db.transaction(), db.deferred_indexes("symbols", "relations"):
+                db.execute_many("INSERT INTO symbols ...", rows)
+        """
+        placeholders = ",".join("?" * len(tables))
+        with self._lock:
+            indexes = self.fetch_all(
+                f"""
+                SELECT name, sql FROM sqlite_master
+                WHERE type = 'index' AND sql IS NOT NULL AND tbl_name IN ({placeholders})
+                """,
+                tables,
+            )
+            for index in indexes:
+                self.execute(f'DROP INDEX IF EXISTS "{index["name"]}"')
+            try:
+                yield
+            finally:
+                for index in indexes:
+                    self.execute(index["sql"])
+                logger.debug(f"Rebuilt {len(indexes)} indexes on {', '.join(tables)}")
+
     # -------------------------------------------------------------------------
     # HELPERS D'EXÉCUTION
     # -------------------------------------------------------------------------
@@ -300,7 +362,8 @@ class Database:
                     cursor.execute(sql)
                 else:
                     cursor.execute(sql, params)
-                self.connection.commit()
+                if not self._tx_depth:
+                    self.connection.commit()
                 return cursor
             except sqlite3.Error as e:
                 logger.error(f"Execute failed: {e}\nSQL: {sql[:200]}")
@@ -328,7 +391,8 @@ class Database:
             try:
                 cursor = self.connection.cursor()
                 cursor.executemany(sql, params_list)
-                self.connection.commit()
+                if not self._tx_depth:
+                    self.connection.commit()
                 rows_affected = cursor.rowcount
                 cursor.close()
                 logger.debug(f"Batch executed: {rows_affected} rows affected")
@@ -337,6 +401,55 @@ class Database:
                 logger.error(f"Execute many failed: {e}\nSQL: {sql[:200]}")
                 raise DatabaseError(f"Execute many failed: {e}") from e
 
+    def insert_many_ids(
+        self,
+        sql: str,
+        params_list: list[Union[tuple, dict]],
+    ) -> list[int]:
+        """
+        Insère plusieurs lignes en batch et retourne leurs IDs, dans l'ordre.
+
+        executemany() ne renseigne pas lastrowid : les IDs sont déduits de
+        last_insert_rowid(). Un INSERT simple (sans OR IGNORE) exécuté sous
+        le verrou, dans une seule transaction, alloue des rowids contigus ;
+        si une ligne n'a pas été insérée (clause de conflit), les IDs ne
+        sont pas déductibles et une DatabaseError est levée.
+
+        Args:
+            sql: Requête INSERT avec placeholders
+            params_list: Liste de tuples ou dicts de paramètres
+
+        Returns:
+            IDs des lignes insérées
+
+        Raises:
+            DatabaseError: Si l'exécution échoue
+        """
+        if not params_list:
+            return []
+        with self._lock:
+            try:
+                count = len(params_list)
+                cursor = self.connection.cursor()
+                cursor.executemany(sql, params_list)
+                if cursor.rowcount != count:
+                    cursor.close()
+                    if not self._tx_depth:
+                        self.connection.rollback()
+                    raise DatabaseError(
+                        f"Insert many inserted {cursor.rowcount} of {count} rows, "
+                        f"cannot derive their ids"
+                    )
+                last_id = cursor.execute("SELECT last_insert_rowid() AS id").fetchone()["id"]
+                if not self._tx_depth:
+                    self.connection.commit()
+                cursor.close()
+                logger.debug(f"Batch inserted: {count} rows")
+                return list(range(last_id - count + 1, last_id + 1))
+            except sqlite3.Error as e:
+                logger.error(f"Insert many failed: {e}\nSQL: {sql[:200]}")
+                raise DatabaseError(f"Insert many failed: {e}") from e
+
     def execute_script(self, script: str) -> None:
         """
         Exécute un script SQL (plusieurs instructions).
@@ -518,6 +631,9 @@ class DatabaseManager(Database):
         else:
             self.schema_path = Path(schema_path)
 
+        # Extension optionnelle (FTS5) à côté du schéma principal
+        self.fts_schema_path = self.schema_path.with_name("schema_fts.sql")
+
     # -------------------------------------------------------------------------
     # INITIALISATION DU SCHÉMA
     # -------------------------------------------------------------------------
@@ -550,12 +666,35 @@ class DatabaseManager(Database):
             self.execute_script(schema_sql)
 
             logger.info(f"Schema initialized from: {self.schema_path}")
-            return True
 
         except Exception as e:
             logger.error(f"Failed to initialize schema: {e}")
             raise SchemaError(f"Failed to initialize schema: {e}") from e
 
+        self.init_fts()
+        return True
+
+    def init_fts(self) -> bool:
+        """
+        Crée l'index plein texte des symboles (schema_fts.sql).
+
+        Optionnel : si FTS5/trigram n'est pas disponible dans la version de
+        SQLite, un warning est loggé et la recherche reste en LIKE simple.
+
+        Returns:
+            True si l'index FTS est en place
+        """
+        if not self.fts_schema_path.exists():
+            return False
+
+        try:
+            self.execute_script(self.fts_schema_path.read_text(encoding="utf-8"))
+            logger.info("Full-text symbol index initialized")
+            return True
+        except Exception as e:
+            logger.warning(f"FTS5 symbol index unavailable, using LIKE search: {e}")
+            return False
+
     def is_initialized(self) -> bool:
         """
         Vérifie si la base est initialisée (tables créées).
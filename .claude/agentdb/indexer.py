@@ -30,22 +30,35 @@ Usage:
 
         # Réindexer des fichiers modifiés
         results = indexer.reindex_files(["src/modified.c", "src/new.c"])
+
+        # Arrêter le processus ctags interactif
+        indexer.close()
 """
 
 from __future__ import annotations
 
+import ast
 import fnmatch
 import hashlib
 import json
 import logging
+import mmap
+import os
 import re
 import shutil
 import subprocess
+import tempfile
+import threading
 import time
+from collections import OrderedDict
+from contextlib import ExitStack
+from functools import lru_cache
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Callable, Iterator, Optional, Union
 
 from .db import Database, DatabaseManager
 from .models import (
@@ -63,15 +76,278 @@ from .crud import (
     FileRelationRepository,
 )
 
+try:
+    import xxhash
+except ImportError:  # xxhash est optionnel, fallback sur blake3/hashlib
+    xxhash = None
+
+try:
+    import blake3
+except ImportError:  # blake3 est optionnel, fallback sur hashlib
+    blake3 = None
+
+try:
+    import orjson
+except ImportError:  # orjson est optionnel, fallback sur json
+    orjson = None
+
 # Configuration du logging
 logger = logging.getLogger("agentdb.indexer")
 
+# Nombre d'AST Python conservés entre deux indexations d'un même fichier
+PYTHON_AST_CACHE_SIZE = 256
+
+# Analyse parallèle des fichiers dans index_directory
+INDEXER_MAX_WORKERS = os.cpu_count() or 1
+PARALLEL_MIN_FILES = 16  # En dessous, le coût des processus l'emporte
+PARALLEL_MAX_CHUNKSIZE = 64  # Fichiers par aller-retour IPC vers un worker
+
+# Fichiers par processus ctags (un lot en échec ne pénalise que ses fichiers)
+CTAGS_BATCH_SIZE = 1000
+
+# Entrées conservées dans le cache disque des sorties ctags (LRU sur mtime)
+CTAGS_CACHE_MAX_FILES = 20000
+
+# Longueur max du champ "pattern" des tags (défaut d'Universal Ctags), fixée
+# explicitement : une config utilisateur à 0 (illimité) donnerait des lignes
+# entières (fichiers minifiés) aux regex de signature, dont le coût croît
+# bien plus vite que la longueur du texte en cas d'échec
+CTAGS_PATTERN_LENGTH_LIMIT = 96
+
+# Première indexation d'au moins ce nombre de fichiers : index secondaires
+# des symboles/relations reconstruits en fin de chargement
+BULK_LOAD_MIN_FILES = 200
+
+# Tables dont les index secondaires sont différés pendant un chargement massif
+_BULK_TABLES = ("symbols", "relations", "file_relations")
+
+# Type de fichier déduit de l'extension (hors tests, repérés par le nom)
+_FILE_TYPE_BY_EXT = {
+    **dict.fromkeys((".h", ".hpp", ".hh", ".hxx"), "header"),
+    **dict.fromkeys((".json", ".yaml", ".yml", ".toml", ".ini", ".cfg"), "config"),
+    **dict.fromkeys((".md", ".rst", ".txt"), "doc"),
+}
+
+# Taille à partir de laquelle hash_file passe par mmap plutôt que read()
+MMAP_MIN_SIZE = 1024 * 1024
+
+# Clé agentdb_meta du dernier commit indexé (point de départ de reindex_since)
+LAST_INDEXED_COMMIT_KEY = "last_indexed_commit"
+
+
+# =============================================================================
+# REGEX PATTERNS
+# =============================================================================
+
+# Compilés une fois : ces motifs sont appliqués à chaque fichier indexé
+
+# Points de décision : les mots-clés et opérateurs disjoints sont réunis dans
+# une seule alternance (un seul parcours du texte). Un groupe 1 capturé compte
+# double : "else if (" contient aussi le "if (" compté par l'alternative voisine.
+# Les motifs qui peuvent chevaucher les autres (ternaires, opérateurs encadrés
+# d'espaces) gardent leur propre parcours pour conserver les mêmes totaux.
+# Le lookahead (?=[...]) de tête liste les premiers caractères possibles : le
+# moteur écarte ainsi la plupart des positions sans essayer chaque alternative
+# (les \b en tête de branche l'empêchent sinon de le déduire seul).
+
+# Ternaires : un match se termine au premier ":" qui suit le "?". Sans ":"
+# plus loin, chaque "?" ferait parcourir le reste du texte avant d'échouer
+# (quadratique : ~1 min pour 20 000 "?" sans ":") ; la recherche est donc
+# bornée au dernier ":" (voir _count_decision_points).
+_FUNCTION_TERNARY_RE = re.compile(r'\b\?\s*[^:]+\s*:')
+_C_LIKE_TERNARY_RE = re.compile(r'\?\s*[^:]+\s*:')
+_COLON_TERMINATED_PATTERNS = (_FUNCTION_TERNARY_RE, _C_LIKE_TERNARY_RE)
+
+# Corps d'une fonction (ctags_to_symbols)
+_FUNCTION_COMPLEXITY_PATTERNS = [
+    re.compile(
+        r'(?=[eifwdc])(?:(\belse\s+if\s*\()|\bif\s*\(|\bfor\s*\(|\bwhile\s*\('
+        r'|\bdo\s*\{|\bcase\s+\S+\s*:|\bcatch\s*\()'
+    ),
+    _FUNCTION_TERNARY_RE,
+    re.compile(r'\s&&\s'),
+    re.compile(r'\s\|\|\s'),
+]
+
+# Fichier entier (calculate_complexity)
+_C_LIKE_COMPLEXITY_PATTERNS = [
+    re.compile(
+        r'(?=[eifwdc&|])(?:(\belse\s+if\s*\()|\bif\s*\(|\bfor\s*\(|\bwhile\s*\('
+        r'|\bdo\s*\{|\bcase\s+|\bcatch\s*\(|&&|\|\|)'
+    ),
+    _C_LIKE_TERNARY_RE,
+]
+_COMPLEXITY_PATTERNS: dict[Optional[str], list[re.Pattern]] = {
+    "c": _C_LIKE_COMPLEXITY_PATTERNS,
+    "cpp": _C_LIKE_COMPLEXITY_PATTERNS,
+    "javascript": _C_LIKE_COMPLEXITY_PATTERNS,
+    "python": [
+        # (?=\w) : le mot suivant "except" reste visible ("except for")
+        re.compile(
+            r'(?=[iefwao])(?:\bif\s+|\belif\s+|\bfor\s+|\bwhile\s+|\bexcept\s*:'
+            r'|\bexcept\s+(?=\w)|\band\b|\bor\b)'
+        ),
+        re.compile(r'(?=i)\bif\s+\S+\s+else\s+'),  # ternaire Python
+    ],
+}
+# Patterns génériques (autres langages)
+_GENERIC_COMPLEXITY_PATTERNS = [
+    re.compile(r'(?=[ifwc&|])(?:\bif\b|\bfor\b|\bwhile\b|\bcase\b|&&|\|\|)'),
+]
+
+
+def _count_decision_points(patterns: list[re.Pattern], text: str) -> int:
+    """Compte les points de décision de `text` (voir les motifs ci-dessus)."""
+    total = 0
+    for pattern in patterns:
+        endpos = len(text)
+        if pattern in _COLON_TERMINATED_PATTERNS:
+            endpos = text.rfind(":") + 1
+        # findall compte en C, sans objet Match ni itération Python par match
+        found = pattern.findall(text, 0, endpos)
+        total += len(found)
+        if pattern.groups:
+            # Groupe 1 capturé (non vide) : compte double
+            total += len(found) - found.count("")
+    return total
+
+# Estimation du nombre de fonctions (moyenne de complexité). "\s+(?:\*\s*)?"
+# reconnaît la même chose que "\s+\*?\s*" sans essayer chaque découpage
+# d'une longue suite d'espaces entre \s+ et \s* en cas d'échec.
+_C_FUNCTION_COUNT_RE = re.compile(r'\b\w+\s+(?:\*\s*)?\w+\s*\([^)]*\)\s*\{')
+_FUNCTION_COUNT_PATTERNS: dict[Optional[str], re.Pattern] = {
+    "c": _C_FUNCTION_COUNT_RE,
+    "cpp": _C_FUNCTION_COUNT_RE,
+    "python": re.compile(r'\bdef\s+\w+'),
+}
+_GENERIC_FUNCTION_COUNT_PATTERN = re.compile(r'\bfunction\b|\bdef\b|\bfunc\b')
+
+# Commentaires et littéraux chaîne style C (count_lines) : les chaînes sont
+# reconnues pour ne pas prendre un "/*" ou "//" qu'elles contiennent pour un
+# commentaire. Motifs "déroulés" (pas d'alternative par caractère).
+_C_COMMENT_OR_STRING_RE = re.compile(
+    r'//[^\n]*|/\*[^*]*(?:\*(?!/)[^*]*)*(?:\*/|\Z)'
+    r'|"[^"\\\n]*(?:\\.[^"\\\n]*)*"'
+    r"|'[^'\\\n]*(?:\\.[^'\\\n]*)*'"
+    r'|`[^`\\]*(?:\\.[^`\\]*)*`',
+    re.DOTALL,
+)
+# Idem pour Python : commentaires "#", chaînes triples (éventuellement non
+# terminées) puis chaînes simples. Les préfixes r/b/f/u restent hors du match.
+_PY_COMMENT_OR_STRING_RE = re.compile(
+    r'#[^\n]*'
+    r'|"""[^"\\]*(?:(?:\\.|"(?!""))[^"\\]*)*(?:"""|\Z)'
+    r"|'''[^'\\]*(?:(?:\\.|'(?!''))[^'\\]*)*(?:'''|\Z)"
+    r'|"[^"\\\n]*(?:\\.[^"\\\n]*)*"'
+    r"|'[^'\\\n]*(?:\\.[^'\\\n]*)*'",
+    re.DOTALL,
+)
+
+# Includes / imports (extract_includes)
+# Appliquées au texte entier : chaque motif commence par un littéral (recherche
+# rapide), [^\S\n] remplace \s pour ne pas déborder sur la ligne suivante, et
+# le début de ligne est vérifié après coup (_iter_line_matches)
+_C_INCLUDE_RE = re.compile(r'#[^\S\n]*include[^\S\n]*([<"])([^>"\n]+)[>"]')
+_PY_IMPORT_RE = re.compile(r'import[^\S\n]+([\w.]+)|from[^\S\n]+([\w.]+)[^\S\n]+import')
+_JS_IMPORT_RE = re.compile(r'''import[^\S\n]+.*?from[^\S\n]+['"]([\w./@-]+)['"]''')
+_JS_REQUIRE_RE = re.compile(
+    r'''require[^\S\n]*\([^\S\n]*['"]([\w./@-]+)['"][^\S\n]*\)'''
+)
+
+# Kinds ctags -> SymbolKind (ctags_to_symbols)
+_CTAGS_KIND_MAPPING = {
+    "function": "function",
+    "method": "method",
+    "class": "class",
+    "struct": "struct",
+    "union": "union",
+    "enum": "enum",
+    "enumerator": "constant",
+    "typedef": "typedef",
+    "macro": "macro",
+    "variable": "variable",
+    "externvar": "variable",
+    "member": "field",
+    "field": "field",
+    "prototype": "function",
+    "namespace": "namespace",
+    "interface": "interface",
+    "property": "property",
+    "constant": "constant",
+    "parameter": "parameter",
+    "local": "variable",
+}
+
+# Appels de fonction : name( (extract_calls_regex)
+_CALL_RE = re.compile(r'\b([a-zA-Z_]\w*)\s*\(')
+
+# Identifiants d'un texte (fichiers mentionnant un symbole apparu)
+_IDENTIFIER_RE = re.compile(r'[^\W\d]\w*')
+
+# Mots-clés suivis d'une parenthèse qui ne sont pas des appels de fonction
+_CALL_KEYWORDS = frozenset({
+    # C/C++
+    "if", "for", "while", "switch", "catch", "sizeof", "typeof", "alignof",
+    "return", "else", "do", "case", "default", "break", "continue", "goto",
+    "struct", "class", "enum", "union", "typedef", "define", "ifdef", "ifndef",
+    "include", "pragma", "static_cast", "dynamic_cast", "const_cast", "reinterpret_cast",
+    # Python (au cas où)
+    "elif", "except", "with", "assert", "print", "lambda", "yield", "async", "await",
+    # JS
+    "function", "const", "let", "var", "new", "delete", "instanceof", "typeof",
+})
+
+# Marqueurs de fichiers sensibles (_is_security_sensitive), en minuscules.
+# str.lower() + `in` reste bien plus rapide qu'une regex re.IGNORECASE ; les
+# marqueurs de contenu finissant tous par "_key", ce suffixe sert de filtre.
+_SENSITIVE_NAME_PATTERNS = ("password", "secret", "token", "key", "crypt", "auth")
+_SENSITIVE_KEY_PATTERNS = ("private_key", "api_key", "secret_key")
+
+
+# Signature / type de retour (ctags_to_symbols) : regex indépendantes du
+# nom, le nom capturé (ou trouvé par str.find) est comparé à celui du tag
+_SIGNATURE_RE = re.compile(r'(\w[\w\s\*]*\s+\*?\s*(\w+)\s*\([^)]*\))')
+_RETURN_TYPE_PREFIX_RE = re.compile(r'([\w\s\*]+?)\s+\*?\s*')
+
+
+@lru_cache(maxsize=1024)
+def _signature_pattern(name: str) -> re.Pattern:
+    """Regex de signature propre à un nom non identifiant (opérateurs C++...)."""
+    return re.compile(r'(\w[\w\s\*]*\s+\*?\s*' + re.escape(name) + r'\s*\([^)]*\))')
+
+
+def _extract_signature(pattern: str, name: str) -> Optional[str]:
+    """Signature `type nom(args)` trouvée dans un pattern ctags."""
+    if not name.isidentifier():
+        match = _signature_pattern(name).search(pattern)
+        return match.group(1).strip() if match else None
+
+    # Les arguments peuvent contenir "(" : reprendre juste après chaque
+    # nom capturé plutôt qu'après la fin du match
+    match = _SIGNATURE_RE.search(pattern)
+    while match is not None:
+        if match.group(2) == name:
+            return match.group(1).strip()
+        match = _SIGNATURE_RE.search(pattern, match.end(2))
+    return None
+
+
+def _extract_return_type(signature: str, name: str) -> Optional[str]:
+    """Type de retour : ce qui précède la première occurrence utilisable du nom."""
+    idx = signature.find(name)
+    while idx != -1:
+        match = _RETURN_TYPE_PREFIX_RE.fullmatch(signature, 0, idx)
+        if match:
+            return match.group(1).strip()
+        idx = signature.find(name, idx + 1)
+    return None
+
 
 # =============================================================================
 # DATA CLASSES
 # =============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class IndexResult:
     """
     Résultat de l'indexation d'un fichier.
@@ -84,6 +360,7 @@ class IndexResult:
         duration_ms: Temps d'indexation en millisecondes
         errors: Liste des erreurs rencontrées
         warnings: Liste des avertissements
+        skipped: True si le fichier était inchangé (index existant conservé)
     """
     file_path: str
     file_id: Optional[int] = None
@@ -92,6 +369,7 @@ class IndexResult:
     duration_ms: float = 0.0
     errors: list[str] = field(default_factory=list)
     warnings: list[str] = field(default_factory=list)
+    skipped: bool = False
 
     @property
     def success(self) -> bool:
@@ -108,10 +386,25 @@ class IndexResult:
             "duration_ms": self.duration_ms,
             "errors": self.errors,
             "warnings": self.warnings,
+            "skipped": self.skipped,
             "success": self.success,
         }
 
 
+@lru_cache(maxsize=32)
+def _glob_union(patterns: tuple[str, ...]) -> re.Pattern:
+    """
+    Compile une liste de globs en une seule regex (union des fnmatch.translate).
+
+    Un seul match par chemin au lieu d'un appel fnmatch par pattern ; le
+    cache est indexé sur le tuple de patterns, donc reste juste si la
+    liste de la config est modifiée.
+    """
+    if not patterns:
+        return re.compile(r"(?!)")  # ne matche jamais
+    return re.compile("|".join(f"(?:{fnmatch.translate(p)})" for p in patterns))
+
+
 @dataclass
 class IndexerConfig:
     """
@@ -124,6 +417,7 @@ class IndexerConfig:
         critical_paths: Patterns des chemins critiques
         high_importance_paths: Patterns haute importance
         ctags_path: Chemin vers l'exécutable ctags (auto-détecté si None)
+        ctags_cache_dir: Cache disque des tags par hash de contenu (désactivé si None)
     """
     project_root: Path = field(default_factory=lambda: Path("."))
     extensions: dict[str, list[str]] = field(default_factory=dict)
@@ -131,6 +425,15 @@ class IndexerConfig:
     critical_paths: list[str] = field(default_factory=list)
     high_importance_paths: list[str] = field(default_factory=list)
     ctags_path: Optional[str] = None
+    ctags_cache_dir: Optional[Path] = None
+
+    # Table extension -> langage, reconstruite si `extensions` est réassigné
+    _language_by_ext: dict[str, str] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _language_source: Optional[dict[str, list[str]]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     def __post_init__(self):
         # Valeurs par défaut si non fournies
@@ -158,6 +461,40 @@ class IndexerConfig:
                 "**/core/**", "**/api/**", "**/main.*",
             ]
 
+    def language_for(self, ext: str) -> Optional[str]:
+        """Langage d'une extension (en minuscules), None si non indexée."""
+        if self._language_source is not self.extensions:
+            by_ext: dict[str, str] = {}
+            for lang, exts in self.extensions.items():
+                for e in exts:
+                    by_ext.setdefault(e, lang)  # premier langage déclaré prioritaire
+            self._language_by_ext = by_ext
+            self._language_source = self.extensions
+        return self._language_by_ext.get(ext)
+
+    def is_excluded(self, path: str) -> bool:
+        """Vérifie si un chemin relatif correspond à un pattern d'exclusion."""
+        return _glob_union(tuple(self.exclude_patterns)).match(path) is not None
+
+    def is_excluded_dir(self, path: str) -> bool:
+        """
+        Vérifie si tout le contenu d'un répertoire relatif est exclu.
+
+        Seuls les patterns finissant par "*" sont retenus : s'ils acceptent
+        "rep/", ils acceptent aussi "rep/<n'importe quoi>", ce qui permet
+        d'élaguer le répertoire sans changer le résultat d'is_excluded.
+        """
+        prunable = tuple(p for p in self.exclude_patterns if p.endswith("*"))
+        return _glob_union(prunable).match(path + "/") is not None
+
+    def is_critical(self, path: str) -> bool:
+        """Vérifie si un chemin correspond à un chemin critique."""
+        return _glob_union(tuple(self.critical_paths)).match(path) is not None
+
+    def is_high_importance(self, path: str) -> bool:
+        """Vérifie si un chemin correspond à un pattern haute importance."""
+        return _glob_union(tuple(self.high_importance_paths)).match(path) is not None
+
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> "IndexerConfig":
         """Crée une config depuis un dictionnaire."""
@@ -168,17 +505,66 @@ class IndexerConfig:
             critical_paths=data.get("critical_paths", []),
             high_importance_paths=data.get("high_importance_paths", []),
             ctags_path=data.get("ctags_path"),
+            ctags_cache_dir=Path(data["ctags_cache_dir"]) if data.get("ctags_cache_dir") else None,
         )
 
 
+# =============================================================================
+# CONTENT HASHING
+# =============================================================================
+
+def compute_content_hash(data: bytes) -> str:
+    """
+    Calcule l'empreinte d'un contenu pour la détection de changements.
+
+    Pas besoin d'un hash cryptographique ici : xxh3_128 si xxhash est
+    installé, sinon BLAKE3 (SIMD), sinon blake2b ; tous en 128 bits et
+    nettement plus rapides que sha256. Les scripts bootstrap/update
+    utilisent le même ordre pour que leurs empreintes restent comparables.
+
+    Args:
+        data: Contenu brut du fichier
+
+    Returns:
+        Empreinte hexadécimale (32 caractères)
+    """
+    if xxhash is not None:
+        return xxhash.xxh3_128_hexdigest(data)
+    if blake3 is not None:
+        return blake3.blake3(data).hexdigest(length=16)
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def hash_file(path: Union[str, Path]) -> str:
+    """
+    Empreinte d'un fichier sur disque (même valeur que compute_content_hash).
+
+    Au-delà de MMAP_MIN_SIZE, le fichier est projeté en mémoire et haché
+    directement depuis le mapping, sans copie dans un objet bytes : la
+    détection des fichiers inchangés ne lit alors que les pages.
+
+    Raises:
+        OSError: Si le fichier ne peut pas être lu
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size < MMAP_MIN_SIZE:
+            return compute_content_hash(f.read())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return compute_content_hash(mm)
+
+
 # =============================================================================
 # CTAGS FUNCTIONS
 # =============================================================================
 
+@lru_cache(maxsize=None)
 def check_ctags_available(ctags_path: Optional[str] = None) -> tuple[bool, str]:
     """
     Vérifie si ctags est disponible.
 
+    Le résultat est mémorisé par chemin : `ctags --version` n'est lancé
+    qu'une fois par processus (cache_clear() pour forcer une revérification).
+
     Args:
         ctags_path: Chemin optionnel vers ctags
 
@@ -215,6 +601,43 @@ def check_ctags_available(ctags_path: Optional[str] = None) -> tuple[bool, str]:
         return False, f"Error checking ctags: {e}"
 
 
+@lru_cache(maxsize=None)
+def _ctags_version(ctags_path: str) -> str:
+    """Sortie de `ctags --version` ("" si ctags ne répond pas), mémorisée par chemin."""
+    try:
+        result = subprocess.run(
+            [ctags_path, "--version"], capture_output=True, text=True, timeout=5
+        )
+    except (OSError, subprocess.SubprocessError):
+        return ""
+    return result.stdout.strip()
+
+
+def _ctags_command(ctags_path: str, language: Optional[str] = None) -> list[str]:
+    """Construit la ligne de commande ctags commune (sans entrée ni sortie)."""
+    # Options ctags optimisées pour extraction complète
+    # --fields=+iaS : i=inheritance, a=access, S=signature
+    # --extras=+q : qualified tags (namespace::class::method)
+    # --c++-kinds=+p : inclure prototypes pour C++
+    cmd = [
+        ctags_path,
+        "--output-format=json",
+        "--fields=+iaSneSKlZ",  # i=inheritance, a=access, S=signature, n=line, e=end, K=kind, l=lang, Z=scope
+        "--extras=+q",  # qualified names
+        "--kinds-all=*",
+        f"--pattern-length-limit={CTAGS_PATTERN_LENGTH_LIMIT}",
+    ]
+
+    # Options spécifiques au langage
+    if language in ("c", "cpp"):
+        cmd.extend([
+            "--c-kinds=+p+x+l",  # +p=prototypes, +x=externs, +l=local vars
+            "--c++-kinds=+p+l",  # +p=prototypes, +l=local vars
+        ])
+
+    return cmd
+
+
 def run_ctags(file_path: str, ctags_path: str = "ctags", language: str = None) -> list[dict[str, Any]]:
     """
     Exécute ctags sur un fichier et retourne les tags au format JSON.
@@ -240,57 +663,299 @@ def run_ctags(file_path: str, ctags_path: str = "ctags", language: str = None) -
     if not path.exists():
         raise FileNotFoundError(f"File not found: {file_path}")
 
-    # Options ctags optimisées pour extraction complète
-    # --fields=+iaS : i=inheritance, a=access, S=signature
-    # --extras=+q : qualified tags (namespace::class::method)
-    # --c++-kinds=+p : inclure prototypes pour C++
-    cmd = [
-        ctags_path,
-        "--output-format=json",
-        "--fields=+iaSneSKlZ",  # i=inheritance, a=access, S=signature, n=line, e=end, K=kind, l=lang, Z=scope
-        "--extras=+q",  # qualified names
-        "--kinds-all=*",
-    ]
-
-    # Options spécifiques au langage
-    if language in ("c", "cpp"):
-        cmd.extend([
-            "--c-kinds=+p+x+l",  # +p=prototypes, +x=externs, +l=local vars
-            "--c++-kinds=+p+l",  # +p=prototypes, +l=local vars
-        ])
-
+    cmd = _ctags_command(ctags_path, language)
     cmd.extend([
         "-o", "-",  # Sortie sur stdout
         str(path.absolute())
     ])
 
-    try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
+    # stderr dans un fichier temporaire : relu seulement en cas d'échec,
+    # sans risque de bloquer ctags sur un pipe plein
+    with tempfile.TemporaryFile() as stderr:
+        try:
+            proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr)
+        except FileNotFoundError:
+            raise RuntimeError(f"ctags not found at {ctags_path}")
+
+        timed_out = threading.Event()
+
+        def on_timeout() -> None:
+            timed_out.set()
+            proc.kill()
+
+        timer = threading.Timer(30, on_timeout)
+        timer.start()
+        try:
+            # Parser au fil de l'eau plutôt que de matérialiser toute la sortie
+            tags = []
+            with proc.stdout:
+                for line in proc.stdout:
+                    tag = _parse_ctags_line(line)
+                    if tag is not None and tag.get("_type") != "ptag":
+                        tags.append(tag)
+            returncode = proc.wait()
+        finally:
+            timer.cancel()
+
+        if timed_out.is_set():
+            raise RuntimeError(f"ctags timed out processing {file_path}")
 
         # ctags peut retourner 0 même avec des warnings, on vérifie stdout
-        if result.returncode != 0 and not result.stdout.strip():
-            error_msg = result.stderr.strip() or "Unknown ctags error"
-            raise RuntimeError(f"ctags failed: {error_msg}")
+        if returncode != 0 and not tags:
+            stderr.seek(0)
+            error_msg = stderr.read().decode("utf-8", errors="replace").strip()
+            raise RuntimeError(f"ctags failed: {error_msg or 'Unknown ctags error'}")
+
+    return tags
+
+
+def _parse_ctags_line(line: str | bytes) -> Optional[dict[str, Any]]:
+    """
+    Parse une ligne JSON de ctags (None si vide ou invalide).
+
+    Les sorties de ctags sont lues en binaire : orjson parse directement
+    les bytes, sans décodage UTF-8 intermédiaire.
+    """
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        if orjson is not None:
+            return orjson.loads(line)
+        return json.loads(line)
+    except ValueError as e:  # json/orjson.JSONDecodeError
+        logger.warning(f"Failed to parse ctags line: {line[:100]}... - {e}")
+        return None
+
+
+def run_ctags_batch(
+    file_paths: list[str],
+    ctags_path: str = "ctags",
+    language: str = None,
+    timeout: float = 600,
+) -> dict[str, list[dict[str, Any]]]:
+    """
+    Exécute un seul processus ctags sur une liste de fichiers.
+
+    Les chemins sont envoyés sur stdin (`-L -`) et les tags JSON lus en
+    continu sur stdout, ce qui évite un fork/exec par fichier.
+
+    Args:
+        file_paths: Chemins des fichiers à analyser
+        ctags_path: Chemin vers l'exécutable ctags
+        language: Langage (active les kinds C/C++ supplémentaires)
+        timeout: Délai maximal pour l'ensemble du lot (secondes)
+
+    Returns:
+        Dict {chemin tel que fourni: liste des tags}
+
+    Raises:
+        RuntimeError: Si ctags échoue ou dépasse le délai
+    """
+    # ctags rapporte les chemins absolus tels qu'on les lui donne
+    by_abs_path: dict[str, str] = {}
+    for fp in file_paths:
+        by_abs_path[str(Path(fp).absolute())] = fp
+    tags_by_file: dict[str, list[dict[str, Any]]] = {fp: [] for fp in file_paths}
+    if not by_abs_path:
+        return tags_by_file
 
-        return parse_ctags_output(result.stdout)
+    cmd = _ctags_command(ctags_path, language)
+    cmd.extend(["-L", "-", "-o", "-"])
 
-    except subprocess.TimeoutExpired:
-        raise RuntimeError(f"ctags timed out processing {file_path}")
+    try:
+        proc = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
     except FileNotFoundError:
         raise RuntimeError(f"ctags not found at {ctags_path}")
 
+    def feed() -> None:
+        try:
+            for abs_path in by_abs_path:
+                proc.stdin.write(os.fsencode(abs_path) + b"\n")
+        except (BrokenPipeError, ValueError):
+            pass
+        finally:
+            try:
+                proc.stdin.close()
+            except (BrokenPipeError, OSError):
+                pass
+
+    # Alimenter stdin depuis un thread pour ne pas bloquer sur un pipe plein
+    feeder = threading.Thread(target=feed, daemon=True)
+    feeder.start()
+
+    timed_out = threading.Event()
+
+    def on_timeout() -> None:
+        timed_out.set()
+        proc.kill()
+
+    timer = threading.Timer(timeout, on_timeout)
+    timer.start()
+    try:
+        for line in proc.stdout:
+            tag = _parse_ctags_line(line)
+            if tag is None or tag.get("_type") == "ptag":
+                continue
+            fp = by_abs_path.get(tag.get("path", ""))
+            if fp is not None:
+                tags_by_file[fp].append(tag)
+        returncode = proc.wait()
+    finally:
+        timer.cancel()
+        feeder.join()
+
+    if timed_out.is_set():
+        raise RuntimeError(f"ctags timed out processing {len(by_abs_path)} files")
+    if returncode != 0 and not any(tags_by_file.values()):
+        raise RuntimeError(f"ctags failed with exit code {returncode}")
+
+    return tags_by_file
+
+
+class CtagsDaemon:
+    """
+    Processus ctags persistant (mode `--_interactive` de Universal Ctags).
+
+    Un seul fork/exec pour toute la vie de l'indexeur : chaque fichier est
+    demandé par une commande JSON `generate-tags` sur stdin, et ses tags
+    sont lus jusqu'à la réponse `completed`. Si ctags ne supporte pas ce
+    mode (option inconnue, compilé sans JSON), start() renvoie False et
+    l'appelant garde run_ctags().
 
-def parse_ctags_output(output: str) -> list[dict[str, Any]]:
+    Example:
+        >>> daemon = CtagsDaemon("ctags")
+        >>> if daemon.start():
+        ...     tags = daemon.tags_for("src/main.c")
+        ...     daemon.close()
+    """
+
+    def __init__(self, ctags_path: str = "ctags", timeout: float = 30):
+        self.ctags_path = ctags_path
+        self.timeout = timeout
+        self._proc: Optional[subprocess.Popen] = None
+
+    @property
+    def is_running(self) -> bool:
+        """Vérifie si le processus ctags est actif."""
+        return self._proc is not None and self._proc.poll() is None
+
+    def start(self) -> bool:
+        """
+        Lance ctags en mode interactif.
+
+        Returns:
+            True si ctags a répondu par sa bannière `program`
+        """
+        # language="c" active les kinds C/C++ (sans effet sur JS), comme les lots
+        cmd = _ctags_command(self.ctags_path, "c")
+        cmd.append("--_interactive")
+        try:
+            self._proc = subprocess.Popen(
+                cmd,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+        except OSError as e:
+            logger.debug(f"Cannot start interactive ctags: {e}")
+            self._proc = None
+            return False
+
+        timer = threading.Timer(self.timeout, self._proc.kill)
+        timer.start()
+        try:
+            banner = self._read_message()
+        finally:
+            timer.cancel()
+        if banner is None or banner.get("_type") != "program":
+            logger.debug("ctags does not support --_interactive, using one process per file")
+            self.close()
+            return False
+        return True
+
+    def tags_for(self, file_path: str) -> list[dict[str, Any]]:
+        """
+        Tags d'un fichier (mêmes dicts que run_ctags).
+
+        Raises:
+            RuntimeError: Si ctags signale une erreur, meurt ou dépasse le délai
+        """
+        if not self.is_running:
+            raise RuntimeError("interactive ctags is not running")
+
+        request = {"command": "generate-tags", "filename": os.path.abspath(file_path)}
+        try:
+            self._proc.stdin.write(json.dumps(request).encode() + b"\n")
+            self._proc.stdin.flush()
+        except (BrokenPipeError, OSError) as e:
+            self.close()
+            raise RuntimeError(f"interactive ctags died: {e}")
+
+        # Délai pour toute la réponse : ctags tué, la lecture voit la fin du flux
+        timer = threading.Timer(self.timeout, self._proc.kill)
+        timer.start()
+        try:
+            tags = []
+            while True:
+                message = self._read_message()
+                if message is None:
+                    self.close()
+                    raise RuntimeError(f"interactive ctags stopped while processing {file_path}")
+                msg_type = message.get("_type")
+                if msg_type == "completed":
+                    return tags
+                if msg_type == "error":
+                    if message.get("fatal"):
+                        self.close()
+                    raise RuntimeError(f"ctags failed on {file_path}: {message.get('message')}")
+                if msg_type == "tag":
+                    tags.append(message)
+        finally:
+            timer.cancel()
+
+    def close(self) -> None:
+        """Arrête le processus ctags (fin de stdin, puis kill si nécessaire)."""
+        proc, self._proc = self._proc, None
+        if proc is None:
+            return
+        try:
+            proc.stdin.close()
+        except OSError:
+            pass
+        try:
+            proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+        proc.stdout.close()
+
+    def _read_message(self) -> Optional[dict[str, Any]]:
+        """Prochain message JSON de ctags, None en fin de flux."""
+        while True:
+            line = self._proc.stdout.readline()
+            if not line:
+                return None
+            message = _parse_ctags_line(line)
+            if message is not None:
+                return message
+
+
+def parse_ctags_output(output: str | bytes) -> list[dict[str, Any]]:
     """
     Parse la sortie JSON de ctags (une ligne JSON par tag).
 
+    Les bytes sont à préférer (stdout lu en binaire) : orjson les parse sans
+    décodage intermédiaire. Les pseudo-tags (`_type` == "ptag") sont écartés,
+    comme dans run_ctags.
+
     Args:
-        output: Sortie brute de ctags --output-format=json
+        output: Sortie brute de ctags --output-format=json (str ou bytes)
 
     Returns:
         Liste de dictionnaires, un par tag
@@ -302,15 +967,10 @@ def parse_ctags_output(output: str) -> list[dict[str, Any]]:
         'main'
     """
     tags = []
-    for line in output.strip().split("\n"):
-        line = line.strip()
-        if not line:
-            continue
-        try:
-            tag = json.loads(line)
+    for line in output.splitlines():
+        tag = _parse_ctags_line(line)
+        if tag is not None and tag.get("_type") != "ptag":
             tags.append(tag)
-        except json.JSONDecodeError as e:
-            logger.warning(f"Failed to parse ctags line: {line[:100]}... - {e}")
     return tags
 
 
@@ -328,30 +988,6 @@ def ctags_to_symbols(tags: list[dict[str, Any]], file_id: int, file_content: str
     """
     symbols = []
 
-    # Mapping des kinds ctags vers SymbolKind
-    kind_mapping = {
-        "function": "function",
-        "method": "method",
-        "class": "class",
-        "struct": "struct",
-        "union": "union",
-        "enum": "enum",
-        "enumerator": "constant",
-        "typedef": "typedef",
-        "macro": "macro",
-        "variable": "variable",
-        "externvar": "variable",
-        "member": "field",
-        "field": "field",
-        "prototype": "function",
-        "namespace": "namespace",
-        "interface": "interface",
-        "property": "property",
-        "constant": "constant",
-        "parameter": "parameter",
-        "local": "variable",
-    }
-
     # Pré-calculer les lignes pour la complexité
     lines = file_content.split("\n") if file_content else []
 
@@ -361,11 +997,13 @@ def ctags_to_symbols(tags: list[dict[str, Any]], file_id: int, file_content: str
             continue
 
         kind_raw = tag.get("kind", "").lower()
-        kind = kind_mapping.get(kind_raw, "variable")
+        kind = _CTAGS_KIND_MAPPING.get(kind_raw, "variable")
 
         # Extraire la signature pour les fonctions
         signature = tag.get("signature", "")
         pattern = tag.get("pattern", "")
+        # Minuscules calculées une fois par tag (visibilité, static/inline/extern)
+        pattern_lower = pattern.lower() if pattern else ""
 
         # Si pas de signature, essayer de l'extraire du pattern
         if not signature and kind in ("function", "method", "prototype"):
@@ -373,24 +1011,20 @@ def ctags_to_symbols(tags: list[dict[str, Any]], file_id: int, file_content: str
             if pattern:
                 # Nettoyer le pattern (enlever /^ et $/)
                 clean_pattern = pattern.strip("/^$")
-                sig_match = re.search(r'(\w[\w\s\*]*\s+\*?\s*' + re.escape(name) + r'\s*\([^)]*\))', clean_pattern)
-                if sig_match:
-                    signature = sig_match.group(1).strip()
+                signature = _extract_signature(clean_pattern, name) or ""
 
         # Extraire le type de retour
         return_type = tag.get("typeref", "")
         if not return_type and kind in ("function", "method") and signature:
             # Essayer d'extraire le type de retour de la signature
-            match = re.match(r'^([\w\s\*]+?)\s+\*?\s*' + re.escape(name), signature)
-            if match:
-                return_type = match.group(1).strip()
+            return_type = _extract_return_type(signature, name) or ""
 
         # Déterminer la visibilité depuis le champ 'access' de ctags
         access = tag.get("access", "").lower()
         visibility = "public"
         if access in ("private", "protected", "public"):
             visibility = access
-        elif "static" in pattern.lower():
+        elif "static" in pattern_lower:
             visibility = "private"  # static en C = portée fichier = private
         elif tag.get("file"):  # tag marqué comme file-scope
             visibility = "private"
@@ -421,9 +1055,9 @@ def ctags_to_symbols(tags: list[dict[str, Any]], file_id: int, file_content: str
             base_classes = [b.strip() for b in inherits.split(",")]
 
         # Détecter si c'est static/inline/extern
-        is_static = "static" in pattern.lower() if pattern else False
-        is_inline = "inline" in pattern.lower() if pattern else False
-        is_extern = tag.get("kind") == "externvar" or ("extern" in pattern.lower() if pattern else False)
+        is_static = "static" in pattern_lower
+        is_inline = "inline" in pattern_lower
+        is_extern = tag.get("kind") == "externvar" or "extern" in pattern_lower
 
         symbol = Symbol(
             file_id=file_id,
@@ -472,23 +1106,65 @@ def _calculate_function_complexity(lines: list[str], start: int, end: int = None
     # Compter les points de décision
     complexity = 1  # Base
 
-    patterns = [
-        r'\bif\s*\(',
-        r'\belse\s+if\s*\(',
-        r'\bfor\s*\(',
-        r'\bwhile\s*\(',
-        r'\bdo\s*\{',
-        r'\bcase\s+\S+\s*:',
-        r'\bcatch\s*\(',
-        r'\b\?\s*[^:]+\s*:',  # ternaire
-        r'\s&&\s',
-        r'\s\|\|\s',
-    ]
+    complexity += _count_decision_points(_FUNCTION_COMPLEXITY_PATTERNS, func_code)
 
-    for pattern in patterns:
-        matches = re.findall(pattern, func_code)
-        complexity += len(matches)
+    return complexity
+
+
+# Nœuds AST ajoutant un point de décision (BoolOp : un par opérande en plus)
+_PY_BRANCH_NODES = (
+    ast.If, ast.For, ast.AsyncFor, ast.While,
+    ast.ExceptHandler, ast.With, ast.AsyncWith, ast.Assert,
+    ast.comprehension, ast.IfExp,
+)
+_PY_FUNCTION_NODES = (ast.FunctionDef, ast.AsyncFunctionDef)
+
+
+def _python_decision_points(node: ast.AST, functions: list[int]) -> int:
+    """
+    Compte les points de décision sous `node` (exclu) en un seul parcours.
+
+    La complexité de chaque fonction rencontrée, imbriquées comprises, est
+    ajoutée à `functions` : pas de second parcours par fonction. Récursif
+    (plus rapide qu'ast.walk) ; RecursionError sur un AST très profond.
+    """
+    count = 0
+    for name in node._fields:
+        value = getattr(node, name, None)
+        children = value if isinstance(value, list) else (value,)
+        for child in children:
+            if not isinstance(child, ast.AST):
+                continue
+            sub = _python_decision_points(child, functions)
+            if isinstance(child, _PY_BRANCH_NODES):
+                sub += 1
+            elif isinstance(child, ast.BoolOp):
+                sub += len(child.values) - 1
+            elif isinstance(child, _PY_FUNCTION_NODES):
+                functions.append(1 + sub)
+            count += sub
+    return count
+
+
+def _python_complexity(node: ast.AST) -> int:
+    """
+    Calcule la complexité cyclomatique d'un nœud AST Python.
 
+    Contrairement aux regex, ignore les mots-clés présents dans les
+    chaînes et les commentaires.
+    """
+    try:
+        return 1 + _python_decision_points(node, [])
+    except RecursionError:
+        pass
+
+    # Repli itératif pour les expressions très imbriquées
+    complexity = 1
+    for child in ast.walk(node):
+        if isinstance(child, _PY_BRANCH_NODES):
+            complexity += 1
+        elif isinstance(child, ast.BoolOp):
+            complexity += len(child.values) - 1
     return complexity
 
 
@@ -496,13 +1172,20 @@ def _calculate_function_complexity(lines: list[str], start: int, end: int = None
 # LINE COUNTING
 # =============================================================================
 
-def count_lines(file_path: str, language: Optional[str] = None) -> dict[str, int]:
+def count_lines(
+    file_path: str,
+    language: Optional[str] = None,
+    content: Optional[str] = None,
+    tree: Optional[ast.Module] = None,
+) -> dict[str, int]:
     """
     Compte les lignes d'un fichier : total, code, commentaires, blanches.
 
     Args:
         file_path: Chemin du fichier
         language: Langage (pour déterminer les commentaires)
+        content: Contenu déjà lu (évite une relecture du fichier)
+        tree: AST Python déjà parsé (reparsé sinon)
 
     Returns:
         Dict avec total, code, comment, blank
@@ -511,76 +1194,114 @@ def count_lines(file_path: str, language: Optional[str] = None) -> dict[str, int
         >>> counts = count_lines("src/main.c", "c")
         >>> print(f"Code: {counts['code']}, Comments: {counts['comment']}")
     """
-    try:
-        content = Path(file_path).read_text(encoding="utf-8", errors="replace")
-    except Exception as e:
-        logger.warning(f"Cannot read {file_path}: {e}")
-        return {"total": 0, "code": 0, "comment": 0, "blank": 0}
+    if content is None:
+        try:
+            content = Path(file_path).read_text(encoding="utf-8", errors="replace")
+        except Exception as e:
+            logger.warning(f"Cannot read {file_path}: {e}")
+            return {"total": 0, "code": 0, "comment": 0, "blank": 0}
 
     lines = content.split("\n")
     total = len(lines)
-    blank = 0
-    comment = 0
-    code = 0
-
-    # Déterminer les patterns de commentaires selon le langage
-    if language in ("c", "cpp", "javascript"):
-        single_comment = "//"
-        multi_start = "/*"
-        multi_end = "*/"
-    elif language == "python":
-        single_comment = "#"
-        multi_start = '"""'
-        multi_end = '"""'
+    blank = sum(1 for line in lines if not line.strip())
+
+    # Lignes portant du code, commentaires et chaînes reconnus d'un seul
+    # passage regex ; le reste des lignes non blanches est du commentaire
+    if language == "python":
+        if tree is None:
+            try:
+                tree = ast.parse(content)
+            except (SyntaxError, ValueError):
+                tree = None
+        code = _python_code_line_count(content, tree)
     else:
-        # Défaut: style C
-        single_comment = "//"
-        multi_start = "/*"
-        multi_end = "*/"
+        code = _c_style_code_line_count(content)
 
-    in_multiline = False
+    return {
+        "total": total,
+        "code": code,
+        "comment": total - blank - code,
+        "blank": blank,
+    }
 
-    for line in lines:
-        stripped = line.strip()
 
-        if not stripped:
-            blank += 1
-            continue
+# Champs contenant des blocs d'instructions (ExceptHandler et match_case
+# inclus) : suffisent pour trouver toutes les instructions-chaînes
+_STATEMENT_BLOCK_FIELDS = ("body", "orelse", "finalbody", "handlers", "cases")
 
-        # Gestion des commentaires multi-lignes
-        if in_multiline:
-            comment += 1
-            if multi_end in stripped:
-                in_multiline = False
-            continue
 
-        if multi_start in stripped:
-            comment += 1
-            if multi_end not in stripped[stripped.index(multi_start) + len(multi_start):]:
-                in_multiline = True
-            continue
+def _python_code_line_count(content: str, tree: Optional[ast.Module] = None) -> int:
+    """
+    Nombre de lignes Python contenant du code.
 
-        # Commentaire simple
-        if stripped.startswith(single_comment):
-            comment += 1
+    Les commentaires "#" hors chaînes et les chaînes qui forment à elles
+    seules une instruction (docstrings, d'après l'AST) ne comptent pas comme
+    du code ; les autres chaînes (affectées, en argument, dans une liste...),
+    si. Sans AST (fichier invalide), toutes les chaînes sont du code.
+    """
+    # Lignes couvertes par une instruction-chaîne (ast.Expr d'une str)
+    # (seuls les blocs d'instructions sont parcourus, pas les expressions)
+    docstring_lines: set[int] = set()
+    stack = list(tree.body) if tree is not None else []
+    while stack:
+        node = stack.pop()
+        if isinstance(node, ast.Expr):
+            if isinstance(node.value, ast.Constant) and isinstance(node.value.value, str):
+                docstring_lines.update(range(node.lineno, (node.end_lineno or node.lineno) + 1))
             continue
-
-        # Sinon c'est du code
-        code += 1
-
-    return {
-        "total": total,
-        "code": code,
-        "comment": comment,
-        "blank": blank,
-    }
+        for field in _STATEMENT_BLOCK_FIELDS:
+            block = getattr(node, field, None)
+            if block:
+                stack.extend(block)
+
+    # Lignes dont il ne reste qu'un préfixe r/b/f/u de docstring
+    prefix_lines: set[int] = set()
+    # Numéro de ligne du dernier match (les matches arrivent dans l'ordre)
+    position = [0, 1]
+
+    def blank_non_code(match: re.Match) -> str:
+        text = match.group(0)
+        if text[0] != "#":
+            start = match.start()
+            line_num = position[1] + content.count("\n", position[0], start)
+            position[0], position[1] = start, line_num
+            if line_num not in docstring_lines:
+                return text
+            line_start = content.rfind("\n", 0, start) + 1
+            before = content[line_start:start].strip()
+            if before and not before.strip("rbfuRBFU"):
+                prefix_lines.add(line_num)
+        # Garder les retours à la ligne pour conserver la numérotation
+        return "\n" * text.count("\n")
+
+    stripped = _PY_COMMENT_OR_STRING_RE.sub(blank_non_code, content)
+    # Une ligne de préfixe seul n'est jamais blanche : on la décompte
+    return sum(1 for line in stripped.split("\n") if line.strip()) - len(prefix_lines)
+
+
+def _c_style_code_line_count(content: str) -> int:
+    """Nombre de lignes contenant du code hors commentaires // et /* */."""
+    def blank_comment(match: re.Match) -> str:
+        text = match.group(0)
+        if text[0] in "\"'`":
+            return text
+        # Garder les retours à la ligne pour conserver la numérotation
+        return "\n" * text.count("\n")
+
+    stripped = _C_COMMENT_OR_STRING_RE.sub(blank_comment, content)
+    return sum(1 for line in stripped.split("\n") if line.strip())
 
 
 # =============================================================================
 # COMPLEXITY CALCULATION
 # =============================================================================
 
-def calculate_complexity(file_path: str, language: Optional[str] = None) -> dict[str, Any]:
+def calculate_complexity(
+    file_path: str,
+    language: Optional[str] = None,
+    content: Optional[str] = None,
+    tree: Optional[ast.Module] = None,
+) -> dict[str, Any]:
     """
     Calcule la complexité cyclomatique d'un fichier.
 
@@ -592,9 +1313,15 @@ def calculate_complexity(file_path: str, language: Optional[str] = None) -> dict
     - ternaire ? :
     - catch/except
 
+    Pour Python, les points de décision sont comptés sur l'AST (les mots-clés
+    dans les chaînes et commentaires sont ignorés) et `max` est la complexité
+    de la fonction la plus complexe.
+
     Args:
         file_path: Chemin du fichier
         language: Langage pour adapter l'analyse
+        content: Contenu déjà lu (évite une relecture du fichier)
+        tree: AST Python déjà parsé (Python uniquement)
 
     Returns:
         Dict avec sum (total), avg (moyenne par fonction), max (complexité max)
@@ -603,60 +1330,43 @@ def calculate_complexity(file_path: str, language: Optional[str] = None) -> dict
         >>> cx = calculate_complexity("src/main.c", "c")
         >>> print(f"Max complexity: {cx['max']}")
     """
-    try:
-        content = Path(file_path).read_text(encoding="utf-8", errors="replace")
-    except Exception as e:
-        logger.warning(f"Cannot read {file_path}: {e}")
-        return {"sum": 0, "avg": 0.0, "max": 0}
-
-    # Patterns de complexité pour C/C++/JS
-    if language in ("c", "cpp", "javascript"):
-        patterns = [
-            r'\bif\s*\(',
-            r'\belse\s+if\s*\(',
-            r'\bfor\s*\(',
-            r'\bwhile\s*\(',
-            r'\bdo\s*\{',
-            r'\bcase\s+',
-            r'\bcatch\s*\(',
-            r'\?\s*[^:]+\s*:',  # ternaire
-            r'&&',
-            r'\|\|',
-        ]
-    elif language == "python":
-        patterns = [
-            r'\bif\s+',
-            r'\belif\s+',
-            r'\bfor\s+',
-            r'\bwhile\s+',
-            r'\bexcept\s*:',
-            r'\bexcept\s+\w',
-            r'\band\b',
-            r'\bor\b',
-            r'\bif\s+\S+\s+else\s+',  # ternaire Python
-        ]
-    else:
-        # Patterns génériques
-        patterns = [
-            r'\bif\b', r'\bfor\b', r'\bwhile\b', r'\bcase\b',
-            r'&&', r'\|\|',
-        ]
+    if content is None:
+        try:
+            content = Path(file_path).read_text(encoding="utf-8", errors="replace")
+        except Exception as e:
+            logger.warning(f"Cannot read {file_path}: {e}")
+            return {"sum": 0, "avg": 0.0, "max": 0}
 
-    total_complexity = 1  # Base complexity
+    # Python : compter sur l'AST, repli sur les regex si le fichier ne parse pas
+    if language == "python":
+        if tree is None:
+            try:
+                tree = ast.parse(content, filename=file_path)
+            except (SyntaxError, ValueError):
+                tree = None
+        if tree is not None:
+            functions: list[int] = []
+            try:
+                total_complexity = 1 + _python_decision_points(tree, functions)
+            except RecursionError:
+                total_complexity = _python_complexity(tree)
+                functions = [
+                    _python_complexity(node) for node in ast.walk(tree)
+                    if isinstance(node, _PY_FUNCTION_NODES)
+                ]
+            func_count = max(len(functions), 1)
+            return {
+                "sum": total_complexity,
+                "avg": round(total_complexity / func_count, 2),
+                "max": max(functions, default=total_complexity),
+            }
 
-    for pattern in patterns:
-        matches = re.findall(pattern, content)
-        total_complexity += len(matches)
+    patterns = _COMPLEXITY_PATTERNS.get(language, _GENERIC_COMPLEXITY_PATTERNS)
+    total_complexity = 1 + _count_decision_points(patterns, content)  # 1 = base
 
     # Estimer le nombre de fonctions pour la moyenne
-    if language in ("c", "cpp"):
-        func_pattern = r'\b\w+\s+\*?\s*\w+\s*\([^)]*\)\s*\{'
-    elif language == "python":
-        func_pattern = r'\bdef\s+\w+'
-    else:
-        func_pattern = r'\bfunction\b|\bdef\b|\bfunc\b'
-
-    functions = re.findall(func_pattern, content)
+    func_pattern = _FUNCTION_COUNT_PATTERNS.get(language, _GENERIC_FUNCTION_COUNT_PATTERN)
+    functions = func_pattern.findall(content)
     func_count = max(len(functions), 1)
 
     return {
@@ -670,13 +1380,44 @@ def calculate_complexity(file_path: str, language: Optional[str] = None) -> dict
 # RELATION EXTRACTION
 # =============================================================================
 
-def extract_includes(file_path: str, language: Optional[str] = None) -> list[dict[str, Any]]:
+def _iter_line_matches(
+    pattern: re.Pattern,
+    content: str,
+    at_line_start: bool = True,
+) -> Iterator[tuple[int, re.Match]]:
     """
-    Extrait les directives #include ou import d'un fichier.
+    Matches d'un motif sur le texte entier, avec leur numéro de ligne.
 
-    Args:
+    Évite de découper le contenu en liste de lignes : les numéros sont
+    calculés en comptant les retours à la ligne entre deux matches. Avec
+    at_line_start, seuls les matches précédés d'espaces sur leur ligne
+    sont retenus (équivalent d'un `^\\s*` appliqué ligne à ligne).
+    """
+    line_num = 1
+    pos = 0
+    for match in pattern.finditer(content):
+        start = match.start()
+        if at_line_start:
+            line_start = content.rfind("\n", 0, start) + 1
+            if content[line_start:start].strip():
+                continue
+        line_num += content.count("\n", pos, start)
+        pos = start
+        yield line_num, match
+
+
+def extract_includes(
+    file_path: str,
+    language: Optional[str] = None,
+    content: Optional[str] = None,
+) -> list[dict[str, Any]]:
+    """
+    Extrait les directives #include ou import d'un fichier.
+
+    Args:
         file_path: Chemin du fichier
         language: Langage du fichier
+        content: Contenu déjà lu (évite une relecture du fichier)
 
     Returns:
         Liste de dict avec: included_file, line_number, is_system
@@ -686,85 +1427,84 @@ def extract_includes(file_path: str, language: Optional[str] = None) -> list[dic
         >>> for inc in includes:
         ...     print(f"Line {inc['line']}: {inc['path']}")
     """
-    try:
-        content = Path(file_path).read_text(encoding="utf-8", errors="replace")
-    except Exception as e:
-        logger.warning(f"Cannot read {file_path}: {e}")
-        return []
+    if content is None:
+        try:
+            content = Path(file_path).read_text(encoding="utf-8", errors="replace")
+        except Exception as e:
+            logger.warning(f"Cannot read {file_path}: {e}")
+            return []
 
     includes = []
-    lines = content.split("\n")
 
     if language in ("c", "cpp"):
-        # Pattern pour #include
-        include_pattern = re.compile(r'^\s*#\s*include\s*([<"])([^>"]+)[>"]')
-
-        for i, line in enumerate(lines, 1):
-            match = include_pattern.match(line)
-            if match:
-                bracket = match.group(1)
-                path = match.group(2)
-                includes.append({
-                    "path": path,
-                    "line": i,
-                    "is_system": bracket == "<",
-                })
+        for line_num, match in _iter_line_matches(_C_INCLUDE_RE, content):
+            includes.append({
+                "path": match.group(2),
+                "line": line_num,
+                "is_system": match.group(1) == "<",
+            })
 
     elif language == "python":
-        # Pattern pour import et from ... import
-        import_pattern = re.compile(r'^\s*import\s+([\w.]+)')
-        from_pattern = re.compile(r'^\s*from\s+([\w.]+)\s+import')
-
-        for i, line in enumerate(lines, 1):
-            match = import_pattern.match(line)
-            if match:
-                includes.append({
-                    "path": match.group(1),
-                    "line": i,
-                    "is_system": not match.group(1).startswith("."),
-                })
-                continue
-
-            match = from_pattern.match(line)
-            if match:
-                includes.append({
-                    "path": match.group(1),
-                    "line": i,
-                    "is_system": not match.group(1).startswith("."),
-                })
+        for line_num, match in _iter_line_matches(_PY_IMPORT_RE, content):
+            # import x | from x import ...
+            path = match.group(1) or match.group(2)
+            includes.append({
+                "path": path,
+                "line": line_num,
+                "is_system": not path.startswith("."),
+            })
 
     elif language == "javascript":
-        # Pattern pour import et require
-        import_pattern = re.compile(r'''^\s*import\s+.*?from\s+['"]([\w./@-]+)['"]''')
-        require_pattern = re.compile(r'''require\s*\(\s*['"]([\w./@-]+)['"]\s*\)''')
-
-        for i, line in enumerate(lines, 1):
-            match = import_pattern.match(line)
-            if match:
-                path = match.group(1)
-                includes.append({
-                    "path": path,
-                    "line": i,
-                    "is_system": not path.startswith("."),
-                })
-                continue
-
-            match = require_pattern.search(line)
-            if match:
-                path = match.group(1)
-                includes.append({
-                    "path": path,
-                    "line": i,
-                    "is_system": not path.startswith("."),
-                })
+        # Un seul import par ligne : `import ... from` en début de ligne,
+        # sinon le premier require() de la ligne
+        by_line: dict[int, str] = {}
+        for line_num, match in _iter_line_matches(_JS_IMPORT_RE, content):
+            by_line[line_num] = match.group(1)
+        for line_num, match in _iter_line_matches(
+            _JS_REQUIRE_RE, content, at_line_start=False
+        ):
+            by_line.setdefault(line_num, match.group(1))
+        for line_num in sorted(by_line):
+            path = by_line[line_num]
+            includes.append({
+                "path": path,
+                "line": line_num,
+                "is_system": not path.startswith("."),
+            })
 
     return includes
 
 
+def _local_functions(symbols: list, default_span: int) -> dict[str, dict[str, int]]:
+    """
+    Fonctions et méthodes définies dans le fichier : {nom: {"start", "end"}}.
+
+    Accepte des Symbol comme des dicts. Sans line_end, la plage couvre
+    `default_span` lignes après la déclaration.
+    """
+    local_functions = {}
+    for sym in symbols:
+        if isinstance(sym, dict):
+            kind = sym.get("kind", "")
+            line_start = sym.get("line_start")
+            if kind in ("function", "method") and line_start:
+                local_functions[sym.get("name", "")] = {
+                    "start": line_start,
+                    "end": sym.get("line_end") or line_start + default_span,
+                }
+        elif sym.kind in ("function", "method") and sym.line_start:
+            local_functions[sym.name] = {
+                "start": sym.line_start,
+                "end": sym.line_end or sym.line_start + default_span,
+            }
+    return local_functions
+
+
 def extract_python_calls(
     file_path: str,
     symbols: list,
-    all_symbols: dict[str, int]
+    all_symbols: dict[str, int],
+    tree: Optional[ast.Module] = None,
 ) -> list[dict[str, Any]]:
     """
     Extrait les appels de fonction depuis un fichier Python en utilisant l'AST.
@@ -775,40 +1515,23 @@ def extract_python_calls(
         file_path: Chemin du fichier Python
         symbols: Symboles définis dans ce fichier (avec line_start, line_end)
         all_symbols: Dict {symbol_name: symbol_id} de tous les symboles connus
+        tree: AST déjà parsé du fichier (évite un second ast.parse)
 
     Returns:
         Liste de dict avec: caller, callee, line
     """
-    import ast
-
-    try:
-        content = Path(file_path).read_text(encoding="utf-8")
-        tree = ast.parse(content, filename=file_path)
-    except Exception as e:
-        logger.warning(f"Cannot parse {file_path} for call extraction: {e}")
-        return []
+    if tree is None:
+        try:
+            content = Path(file_path).read_text(encoding="utf-8")
+            tree = ast.parse(content, filename=file_path)
+        except Exception as e:
+            logger.warning(f"Cannot parse {file_path} for call extraction: {e}")
+            return []
 
     calls = []
 
     # Construire un index des fonctions/méthodes locales avec leurs plages de lignes
-    local_functions = {}
-    for sym in symbols:
-        if hasattr(sym, 'kind'):
-            kind = sym.kind
-            name = sym.name
-            line_start = sym.line_start
-            line_end = sym.line_end
-        else:
-            kind = sym.get('kind', '')
-            name = sym.get('name', '')
-            line_start = sym.get('line_start')
-            line_end = sym.get('line_end')
-
-        if kind in ("function", "method") and line_start:
-            local_functions[name] = {
-                "start": line_start,
-                "end": line_end or line_start + 500,
-            }
+    local_functions = _local_functions(symbols, default_span=500)
 
     class CallVisitor(ast.NodeVisitor):
         """Visiteur AST pour extraire les appels de fonction."""
@@ -866,7 +1589,9 @@ def extract_calls(
     file_path: str,
     symbols: list,
     all_symbols: dict[str, int],
-    language: str = None
+    language: str = None,
+    tree: Optional[ast.Module] = None,
+    content: Optional[str] = None,
 ) -> list[dict[str, Any]]:
     """
     Extrait les appels de fonction depuis un fichier source.
@@ -878,6 +1603,8 @@ def extract_calls(
         symbols: Symboles définis dans ce fichier
         all_symbols: Dict {symbol_name: symbol_id} de tous les symboles connus
         language: Langage du fichier (python, c, cpp, javascript)
+        tree: AST Python déjà parsé (ignoré pour les autres langages)
+        content: Contenu déjà lu (C/C++/JS, évite une relecture du fichier)
 
     Returns:
         Liste de dict avec: caller, callee, line
@@ -901,16 +1628,38 @@ def extract_calls(
 
     # Pour Python, utiliser l'AST
     if language == "python":
-        return extract_python_calls(file_path, symbols, all_symbols)
+        return extract_python_calls(file_path, symbols, all_symbols, tree=tree)
 
     # Pour C/C++/JS, utiliser regex
-    return extract_calls_regex(file_path, symbols, all_symbols)
+    return extract_calls_regex(file_path, symbols, all_symbols, content=content)
+
+
+def _callers_by_line(
+    local_functions: dict[str, dict[str, int]],
+    line_count: int,
+) -> list[Optional[str]]:
+    """
+    Table ligne -> fonction englobante (index 0 inutilisé).
+
+    Les plages sont peintes dans l'ordre inverse d'insertion : en cas de
+    chevauchement, la première fonction déclarée l'emporte, comme avec un
+    parcours linéaire de local_functions. Chaque recherche devient O(1)
+    au lieu de O(nombre de fonctions).
+    """
+    callers: list[Optional[str]] = [None] * (line_count + 1)
+    for name, info in reversed(local_functions.items()):
+        start = max(info["start"], 1)
+        end = min(info["end"], line_count)
+        if start <= end:
+            callers[start:end + 1] = [name] * (end - start + 1)
+    return callers
 
 
 def extract_calls_regex(
     file_path: str,
     symbols: list,
-    all_symbols: dict[str, int]
+    all_symbols: dict[str, int],
+    content: Optional[str] = None,
 ) -> list[dict[str, Any]]:
     """
     Extrait les appels de fonction avec regex (pour C/C++/JS).
@@ -919,54 +1668,26 @@ def extract_calls_regex(
         file_path: Chemin du fichier source
         symbols: Symboles définis dans ce fichier
         all_symbols: Dict {symbol_name: symbol_id} de tous les symboles connus
+        content: Contenu déjà lu (évite une relecture du fichier)
 
     Returns:
         Liste de dict avec: caller, callee, line
     """
-    try:
-        content = Path(file_path).read_text(encoding="utf-8", errors="replace")
-    except Exception as e:
-        logger.warning(f"Cannot read {file_path}: {e}")
-        return []
+    if content is None:
+        try:
+            content = Path(file_path).read_text(encoding="utf-8", errors="replace")
+        except Exception as e:
+            logger.warning(f"Cannot read {file_path}: {e}")
+            return []
 
     calls = []
     lines = content.split("\n")
 
-    # Pattern pour détecter les appels de fonction : name(
-    call_pattern = re.compile(r'\b([a-zA-Z_]\w*)\s*\(')
-
-    # Mots-clés à ignorer (pas des appels de fonction)
-    keywords = {
-        # C/C++
-        "if", "for", "while", "switch", "catch", "sizeof", "typeof", "alignof",
-        "return", "else", "do", "case", "default", "break", "continue", "goto",
-        "struct", "class", "enum", "union", "typedef", "define", "ifdef", "ifndef",
-        "include", "pragma", "static_cast", "dynamic_cast", "const_cast", "reinterpret_cast",
-        # Python (au cas où)
-        "elif", "except", "with", "assert", "print", "lambda", "yield", "async", "await",
-        # JS
-        "function", "const", "let", "var", "new", "delete", "instanceof", "typeof",
-    }
-
     # Construire l'index des fonctions locales avec leurs plages
-    local_functions = {}
-    for sym in symbols:
-        if hasattr(sym, 'kind'):
-            kind = sym.kind
-            name = sym.name
-            line_start = sym.line_start
-            line_end = sym.line_end
-        else:
-            kind = sym.get('kind', '')
-            name = sym.get('name', '')
-            line_start = sym.get('line_start')
-            line_end = sym.get('line_end')
-
-        if kind in ("function", "method") and line_start:
-            local_functions[name] = {
-                "start": line_start,
-                "end": line_end or line_start + 200,
-            }
+    local_functions = _local_functions(symbols, default_span=200)
+
+    # Fonction englobante par ligne, construite au premier appel trouvé
+    callers: Optional[list[Optional[str]]] = None
 
     # État pour ignorer les commentaires multi-lignes
     in_block_comment = False
@@ -989,12 +1710,17 @@ def extract_calls_regex(
         if stripped.startswith("#") and not stripped.startswith("#include"):
             continue
 
+        # Préfiltre : sans parenthèse, aucun appel possible (évite la regex
+        # sur environ deux tiers des lignes d'un fichier C typique)
+        if "(" not in line:
+            continue
+
         # Chercher les appels dans la ligne
-        for match in call_pattern.finditer(line):
+        for match in _CALL_RE.finditer(line):
             callee_name = match.group(1)
 
             # Ignorer les mots-clés
-            if callee_name in keywords:
+            if callee_name in _CALL_KEYWORDS:
                 continue
 
             # Vérifier que le callee est un symbole connu
@@ -1002,11 +1728,9 @@ def extract_calls_regex(
                 continue
 
             # Trouver le caller (fonction qui contient cette ligne)
-            caller_name = None
-            for func_name, func_info in local_functions.items():
-                if func_info["start"] <= line_num <= func_info["end"]:
-                    caller_name = func_name
-                    break
+            if callers is None:
+                callers = _callers_by_line(local_functions, len(lines))
+            caller_name = callers[line_num]
 
             # Si on a un caller et ce n'est pas un auto-appel
             if caller_name and caller_name != callee_name:
@@ -1019,6 +1743,356 @@ def extract_calls_regex(
     return calls
 
 
+# =============================================================================
+# PYTHON SYMBOLS
+# =============================================================================
+
+def extract_python_symbols(
+    file_path: Path,
+    file_id: int,
+    tree: Optional[ast.Module] = None,
+    content: Optional[str] = None
+) -> list[Symbol]:
+    """
+    Extrait les symboles d'un fichier Python avec ast.
+
+    Détecte :
+    - Fonctions (def) avec signature, visibilité, complexité
+    - Classes avec bases d'héritage
+    - Méthodes dans les classes (kind="method")
+    - Propriétés (@property)
+
+    tree : AST déjà construit ; à défaut, content (source déjà lue) est
+    parsé, sinon le fichier est lu.
+    """
+    if tree is None:
+        try:
+            if content is None:
+                content = file_path.read_text(encoding="utf-8")
+            tree = ast.parse(content, filename=str(file_path))
+        except SyntaxError as e:
+            logger.warning(f"Python syntax error in {file_path}: {e}")
+            return []
+        except Exception as e:
+            logger.warning(f"Cannot parse {file_path}: {e}")
+            return []
+
+    symbols = []
+
+    def get_visibility(name: str, decorators: list) -> str:
+        """Détermine la visibilité d'un symbole Python."""
+        # Convention Python: _name = private, __name = very private
+        if name.startswith("__") and not name.endswith("__"):
+            return "private"
+        elif name.startswith("_"):
+            return "protected"
+        return "public"
+
+    def has_decorator(decorators: list, name: str) -> bool:
+        """Vérifie si un décorateur est présent."""
+        for d in decorators:
+            if isinstance(d, ast.Name) and d.id == name:
+                return True
+            elif isinstance(d, ast.Attribute) and d.attr == name:
+                return True
+        return False
+
+    def extract_return_type(node) -> Optional[str]:
+        """Extrait le type de retour d'une fonction."""
+        if node.returns:
+            try:
+                return _expr_source(node.returns)
+            except Exception:
+                return None
+        return None
+
+    # Parcourir l'AST de manière structurée
+    for node in ast.iter_child_nodes(tree):
+        # Fonctions de niveau module
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            is_async = isinstance(node, ast.AsyncFunctionDef)
+            visibility = get_visibility(node.name, node.decorator_list)
+            is_static = has_decorator(node.decorator_list, "staticmethod")
+
+            sym = Symbol(
+                file_id=file_id,
+                name=node.name,
+                kind="function",
+                line_start=node.lineno,
+                line_end=node.end_lineno,
+                signature=_python_signature(node),
+                return_type=extract_return_type(node),
+                visibility=visibility,
+                is_static=is_static,
+                is_exported=visibility == "public",
+                complexity=_python_complexity(node),
+                doc_comment=ast.get_docstring(node),
+                has_doc=ast.get_docstring(node) is not None,
+            )
+            symbols.append(sym)
+
+        # Classes
+        elif isinstance(node, ast.ClassDef):
+            bases = []
+            for base in node.bases:
+                try:
+                    bases.append(_expr_source(base))
+                except Exception:
+                    if isinstance(base, ast.Name):
+                        bases.append(base.id)
+
+            class_visibility = get_visibility(node.name, node.decorator_list)
+
+            class_sym = Symbol(
+                file_id=file_id,
+                name=node.name,
+                kind="class",
+                line_start=node.lineno,
+                line_end=node.end_lineno,
+                visibility=class_visibility,
+                is_exported=class_visibility == "public",
+                base_classes_json=json.dumps(bases) if bases else None,
+                doc_comment=ast.get_docstring(node),
+                has_doc=ast.get_docstring(node) is not None,
+            )
+            symbols.append(class_sym)
+
+            # Extraire les méthodes de la classe
+            for class_node in ast.iter_child_nodes(node):
+                if isinstance(class_node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    method_name = class_node.name
+                    method_visibility = get_visibility(method_name, class_node.decorator_list)
+
+                    # Déterminer le type de méthode
+                    is_static = has_decorator(class_node.decorator_list, "staticmethod")
+                    is_classmethod = has_decorator(class_node.decorator_list, "classmethod")
+                    is_property = has_decorator(class_node.decorator_list, "property")
+
+                    kind = "method"
+                    if is_property:
+                        kind = "property"
+
+                    method_sym = Symbol(
+                        file_id=file_id,
+                        name=method_name,
+                        qualified_name=f"{node.name}.{method_name}",
+                        kind=kind,
+                        line_start=class_node.lineno,
+                        line_end=class_node.end_lineno,
+                        signature=_python_signature(class_node),
+                        return_type=extract_return_type(class_node),
+                        visibility=method_visibility,
+                        is_static=is_static,
+                        is_exported=method_visibility == "public" and class_visibility == "public",
+                        complexity=_python_complexity(class_node),
+                        doc_comment=ast.get_docstring(class_node),
+                        has_doc=ast.get_docstring(class_node) is not None,
+                    )
+                    symbols.append(method_sym)
+
+    return symbols
+
+
+def _expr_source(node: ast.expr) -> str:
+    """
+    Source d'une annotation, d'une valeur par défaut ou d'une base de classe.
+
+    Les formes courantes (nom, attribut, constante simple, générique) sont
+    rendues directement ; ast.unparse, beaucoup plus coûteux, ne sert que
+    pour le reste. Le résultat est identique à ast.unparse.
+    """
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Constant):
+        value = node.value
+        if value is None or isinstance(value, (bool, int)):
+            return repr(value)
+        if (isinstance(value, str) and node.kind is None and value.isprintable()
+                and "'" not in value and "\\" not in value):
+            return f"'{value}'"
+    elif isinstance(node, ast.Attribute):
+        if isinstance(node.value, ast.Name):
+            return f"{node.value.id}.{node.attr}"
+    elif isinstance(node, ast.Subscript):
+        inner = node.slice
+        # Un seul élément ou un élément étoilé : ast.unparse garde la
+        # virgule finale (tuple[int,], X[*Ts,])
+        if (isinstance(inner, ast.Tuple) and len(inner.elts) > 1
+                and not any(isinstance(e, ast.Starred) for e in inner.elts)):
+            args = ", ".join(_expr_source(e) for e in inner.elts)
+            return f"{_expr_source(node.value)}[{args}]"
+        if not isinstance(inner, (ast.Tuple, ast.Slice)):
+            return f"{_expr_source(node.value)}[{_expr_source(inner)}]"
+    return ast.unparse(node)
+
+
+def _python_signature(node) -> Optional[str]:
+    """Construit la signature complète d'une fonction Python."""
+    try:
+        args_parts = []
+
+        # Arguments positionnels normaux
+        defaults_offset = len(node.args.args) - len(node.args.defaults)
+        for i, arg in enumerate(node.args.args):
+            arg_str = arg.arg
+            if arg.annotation:
+                arg_str += f": {_expr_source(arg.annotation)}"
+            # Ajouter la valeur par défaut si présente
+            default_idx = i - defaults_offset
+            if default_idx >= 0 and default_idx < len(node.args.defaults):
+                try:
+                    arg_str += f" = {_expr_source(node.args.defaults[default_idx])}"
+                except Exception:
+                    arg_str += " = ..."
+            args_parts.append(arg_str)
+
+        # *args
+        if node.args.vararg:
+            vararg = f"*{node.args.vararg.arg}"
+            if node.args.vararg.annotation:
+                vararg += f": {_expr_source(node.args.vararg.annotation)}"
+            args_parts.append(vararg)
+
+        # keyword-only args
+        for i, arg in enumerate(node.args.kwonlyargs):
+            arg_str = arg.arg
+            if arg.annotation:
+                arg_str += f": {_expr_source(arg.annotation)}"
+            if i < len(node.args.kw_defaults) and node.args.kw_defaults[i]:
+                try:
+                    arg_str += f" = {_expr_source(node.args.kw_defaults[i])}"
+                except Exception:
+                    arg_str += " = ..."
+            args_parts.append(arg_str)
+
+        # **kwargs
+        if node.args.kwarg:
+            kwarg = f"**{node.args.kwarg.arg}"
+            if node.args.kwarg.annotation:
+                kwarg += f": {_expr_source(node.args.kwarg.annotation)}"
+            args_parts.append(kwarg)
+
+        # Construire la signature
+        prefix = "async def" if isinstance(node, ast.AsyncFunctionDef) else "def"
+        sig = f"{prefix} {node.name}({', '.join(args_parts)})"
+        if node.returns:
+            sig += f" -> {_expr_source(node.returns)}"
+        return sig
+    except Exception as e:
+        logger.debug(f"Could not build signature for {node.name}: {e}")
+        return f"def {node.name}(...)"
+
+
+# =============================================================================
+# FILE ANALYSIS
+# =============================================================================
+
+@dataclass(slots=True)
+class FileAnalysis:
+    """
+    Analyse d'un fichier indépendante de la base de données.
+
+    Tout ce qui peut être calculé sans connaître les autres fichiers :
+    l'objet est picklable et peut donc être produit dans un processus
+    worker (voir CodeIndexer.index_directory).
+
+    Attributes:
+        content: Contenu texte du fichier
+        content_hash: Empreinte du contenu
+        line_counts: Résultat de count_lines
+        complexity: Résultat de calculate_complexity
+        includes: Résultat de extract_includes
+        symbols: Symboles Python (file_id à renseigner), None sinon
+        calls: Appels candidats Python, à filtrer sur les symboles connus
+    """
+    content: str
+    content_hash: str
+    line_counts: dict[str, int]
+    complexity: dict[str, Any]
+    includes: list[dict[str, Any]] = field(default_factory=list)
+    symbols: Optional[list[Symbol]] = None
+    calls: Optional[list[dict[str, Any]]] = None
+
+
+class _AnySymbol:
+    """Ensemble contenant tous les noms : laisse passer tous les appels candidats."""
+
+    def __contains__(self, name: object) -> bool:
+        return True
+
+
+def analyze_file(
+    file_path: str,
+    language: Optional[str] = None,
+    parse_python: Optional[Callable[[Path, str, str], Optional[ast.Module]]] = None,
+    data: Optional[bytes] = None,
+    content_hash: Optional[str] = None,
+) -> FileAnalysis:
+    """
+    Calcule tout ce qui ne dépend que du fichier lui-même.
+
+    Les appels Python sont extraits sans filtre sur les symboles connus :
+    l'appelant les résout ensuite contre la base, ce qui donne le même
+    résultat qu'un filtrage en amont.
+
+    Args:
+        file_path: Chemin complet du fichier
+        language: Langage du fichier
+        parse_python: Parser AST à utiliser (ex: avec cache), ast.parse sinon
+        data: Contenu brut déjà lu (évite une relecture du fichier)
+        content_hash: Empreinte de `data` si déjà calculée
+
+    Returns:
+        FileAnalysis
+
+    Raises:
+        OSError: Si le fichier ne peut pas être lu
+    """
+    path = Path(file_path)
+    raw = data if data is not None else path.read_bytes()
+    content = raw.decode("utf-8", errors="replace")
+    if content_hash is None or data is None:
+        content_hash = compute_content_hash(raw)
+
+    tree = None
+    if language == "python":
+        if parse_python is not None:
+            tree = parse_python(path, content, content_hash)
+        else:
+            try:
+                tree = ast.parse(content, filename=file_path)
+            except Exception as e:
+                logger.warning(f"Cannot parse {file_path}: {e}")
+
+    analysis = FileAnalysis(
+        content=content,
+        content_hash=content_hash,
+        line_counts=count_lines(file_path, language, content=content, tree=tree),
+        complexity=calculate_complexity(file_path, language, content=content, tree=tree),
+        includes=extract_includes(file_path, language, content=content),
+    )
+
+    if language == "python":
+        if tree is not None:
+            analysis.symbols = extract_python_symbols(path, 0, tree=tree)
+            analysis.calls = extract_python_calls(
+                file_path, analysis.symbols, _AnySymbol(), tree=tree
+            )
+        else:
+            analysis.symbols = []
+            analysis.calls = []
+
+    return analysis
+
+
+def _analyze_file_worker(file_path: str, language: Optional[str]) -> Optional[FileAnalysis]:
+    """Point d'entrée des workers : None en cas d'erreur (réessayé en local)."""
+    try:
+        return analyze_file(file_path, language)
+    except Exception:
+        return None
+
+
 # =============================================================================
 # MAIN INDEXER CLASS
 # =============================================================================
@@ -1074,24 +2148,86 @@ class CodeIndexer:
         else:
             logger.info(f"Using ctags at: {self.ctags_path}")
 
-        # Cache des symboles pour les relations
+        # Cache des symboles pour les relations (nom -> id le plus récent),
+        # chargé une fois puis tenu à jour fichier par fichier
         self._symbol_cache: dict[str, int] = {}
+        self._symbol_cache_loaded = False
+
+        # Module déduit par répertoire parent (partagé par les fichiers voisins)
+        self._module_by_dir: dict[str, Optional[str]] = {}
+
+        # Lots ctags lancés en arrière-plan (chemin complet -> lot {chemin: tags})
+        self._ctags_prefetch: dict[str, Future] = {}
+        self._ctags_pool: Optional[ThreadPoolExecutor] = None
+        # Hash des fichiers lancés en lot, pour n'en cacher les tags que si
+        # le contenu analysé est bien celui passé à ctags
+        self._ctags_hashes: dict[str, str] = {}
+        self._ctags_cache_writes = 0
+        # Sous-répertoire du cache propre à la version et aux options de ctags
+        self._ctags_cache_subdir: Optional[Path] = None
+        # Processus ctags interactif pour les fichiers hors lot (démarré au besoin)
+        self._ctags_daemon: Optional[CtagsDaemon] = None
+        self._ctags_interactive = True
+
+        # Includes et appels en attente de liaison pendant un lot (None hors lot)
+        self._pending_links: Optional[list[tuple[Any, ...]]] = None
+
+        # AST Python par fichier (chemin -> (hash du contenu, arbre)), LRU
+        self._ast_cache: OrderedDict[str, tuple[str, ast.Module]] = OrderedDict()
 
     def _refresh_symbol_cache(self) -> None:
-        """Rafraîchit le cache des symboles."""
-        rows = self.db.fetch_all("SELECT id, name FROM symbols")
+        """Recharge entièrement le cache des symboles (le plus grand id l'emporte)."""
+        rows = self.db.fetch_all("SELECT id, name FROM symbols ORDER BY id")
         self._symbol_cache = {r["name"]: r["id"] for r in rows}
+        self._symbol_cache_loaded = True
+
+    def _cache_file_symbols(self, symbols: list[Symbol]) -> None:
+        """Ajoute au cache les symboles qui viennent d'être insérés pour un fichier."""
+        if not self._symbol_cache_loaded:
+            self._refresh_symbol_cache()
+            return
+        # Les ids insérés (reportés par insert_many) sont les plus grands
+        # de la table : ils l'emportent
+        cache = self._symbol_cache
+        for sym in symbols:
+            cache[sym.name] = sym.id
+
+    def _uncache_symbol_names(self, names: list[str]) -> None:
+        """Retire des noms du cache et les rattache au symbole restant le plus récent."""
+        cache = self._symbol_cache
+        for name in names:
+            cache.pop(name, None)
+        for i in range(0, len(names), 500):
+            chunk = names[i:i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self.db.fetch_all(
+                f"SELECT name, MAX(id) AS id FROM symbols "
+                f"WHERE name IN ({placeholders}) GROUP BY name",
+                tuple(chunk),
+            )
+            for r in rows:
+                cache[r["name"]] = r["id"]
 
     # -------------------------------------------------------------------------
     # PUBLIC API
     # -------------------------------------------------------------------------
 
-    def index_file(self, file_path: str) -> IndexResult:
+    def index_file(
+        self,
+        file_path: str,
+        analysis: Optional[FileAnalysis] = None,
+        force: bool = False
+    ) -> IndexResult:
         """
         Indexe un seul fichier.
 
+        Un fichier dont le hash de contenu n'a pas changé depuis la dernière
+        indexation est ignoré (résultat marqué `skipped`), sauf si `force`.
+
         Args:
             file_path: Chemin du fichier (relatif à project_root)
+            analysis: Analyse déjà calculée (ex: par un worker), sinon calculée ici
+            force: Réindexer même si le contenu est inchangé
 
         Returns:
             IndexResult avec les détails de l'indexation
@@ -1120,128 +2256,41 @@ class CodeIndexer:
                 result.warnings.append(f"File excluded by patterns: {file_path}")
                 return result
 
-            # Lire le contenu
-            try:
-                content = full_path.read_text(encoding="utf-8", errors="replace")
-            except Exception as e:
-                result.errors.append(f"Cannot read file: {e}")
-                return result
-
             # Détecter le langage
             language = self._detect_language(full_path)
             if not language:
                 result.warnings.append(f"Unknown language for {file_path}")
 
-            # Calculer les métriques de lignes
-            line_counts = count_lines(str(full_path), language)
-
-            # Calculer la complexité
-            complexity = calculate_complexity(str(full_path), language)
-
-            # Calculer le hash
-            content_hash = hashlib.sha256(content.encode()).hexdigest()
-
-            # Créer ou mettre à jour l'entrée fichier
-            existing = self.files.find_by_path(file_path)
-
-            file_obj = File(
-                id=existing.id if existing else None,
-                path=file_path,
-                filename=full_path.name,
-                extension=full_path.suffix,
-                module=self._detect_module(full_path),
-                file_type=self._detect_file_type(full_path),
-                language=language,
-                is_critical=self._is_critical_path(file_path),
-                security_sensitive=self._is_security_sensitive(file_path, content),
-                lines_total=line_counts["total"],
-                lines_code=line_counts["code"],
-                lines_comment=line_counts["comment"],
-                lines_blank=line_counts["blank"],
-                complexity_sum=complexity["sum"],
-                complexity_avg=complexity["avg"],
-                complexity_max=complexity["max"],
-                content_hash=content_hash,
-                indexed_at=datetime.now().isoformat(),
-            )
-
-            if existing:
-                # Supprimer les anciens symboles et relations
-                self._delete_file_symbols(existing.id)
-                file_id = self.files.update(file_obj)
-            else:
-                file_id = self.files.create(file_obj)
-
-            result.file_id = file_id
-
-            # Extraire les symboles avec ctags (pour C/C++) ou AST (pour Python)
-            symbols = []
-            if language in ("c", "cpp") and self.ctags_available:
-                try:
-                    tags = run_ctags(str(full_path), self.ctags_path, language=language)
-                    symbols = ctags_to_symbols(tags, file_id, file_content=content)
-                except Exception as e:
-                    result.warnings.append(f"ctags failed: {e}")
-                    logger.warning(f"ctags failed for {file_path}: {e}")
-            elif language == "python":
-                symbols = self._extract_python_symbols(full_path, file_id)
-            elif language == "javascript" and self.ctags_available:
-                # Fallback ctags pour JavaScript/TypeScript
+            # Lire le fichier et calculer métriques, includes, symboles Python
+            if analysis is None:
                 try:
-                    tags = run_ctags(str(full_path), self.ctags_path, language=language)
-                    symbols = ctags_to_symbols(tags, file_id, file_content=content)
+                    data = full_path.read_bytes()
                 except Exception as e:
-                    result.warnings.append(f"ctags failed for JS: {e}")
-
-            # Insérer les symboles
-            for sym in symbols:
-                sym.file_id = file_id
-                sym_id = self.symbols.create(sym)
-                sym.id = sym_id
-
-            result.symbols_count = len(symbols)
-
-            # Extraire les includes/imports
-            includes = extract_includes(str(full_path), language)
-            file_relations = []
-
-            for inc in includes:
-                # Essayer de résoudre le fichier inclus
-                target_file = self.files.find_by_path(inc["path"])
-                if target_file:
-                    fr = FileRelation(
-                        source_file_id=file_id,
-                        target_file_id=target_file.id,
-                        relation_type="includes" if language in ("c", "cpp") else "imports",
-                        line_number=inc["line"],
-                    )
-                    file_relations.append(fr)
+                    result.errors.append(f"Cannot read file: {e}")
+                    return result
 
-            # Insérer les relations de fichiers
-            for fr in file_relations:
-                self.file_relations.create(fr)
+                # Hash calculé une fois : test d'inchangé puis FileAnalysis
+                content_hash = compute_content_hash(data)
+                if not force and self._is_unchanged(result, file_path, content_hash):
+                    result.duration_ms = round((time.perf_counter() - start_time) * 1000, 2)
+                    return result
 
-            # Extraire les appels (après refresh du cache)
-            self._refresh_symbol_cache()
-            calls = extract_calls(str(full_path), symbols, self._symbol_cache)
-
-            relations_count = 0
-            for call in calls:
-                caller_id = self._symbol_cache.get(call["caller"])
-                callee_id = self._symbol_cache.get(call["callee"])
-
-                if caller_id and callee_id:
-                    rel = Relation(
-                        source_id=caller_id,
-                        target_id=callee_id,
-                        relation_type="calls",
-                        location_file_id=file_id,
-                        location_line=call["line"],
+                try:
+                    analysis = analyze_file(
+                        str(full_path), language, parse_python=self._parse_python,
+                        data=data, content_hash=content_hash,
                     )
-                    self.relations.create(rel)
-                    relations_count += 1
+                except Exception as e:
+                    result.errors.append(f"Cannot read file: {e}")
+                    return result
+            elif not force and self._is_unchanged(result, file_path, analysis.content_hash):
+                result.duration_ms = round((time.perf_counter() - start_time) * 1000, 2)
+                return result
 
-            result.relations_count = relations_count + len(file_relations)
+            # Toutes les écritures du fichier dans une seule transaction :
+            # un seul commit (et un seul fsync) au lieu d'un par ligne
+            with self.db.transaction():
+                self._store_file(result, file_path, full_path, analysis, language)
 
             # Log le temps
             duration = (time.perf_counter() - start_time) * 1000
@@ -1267,6 +2316,12 @@ class CodeIndexer:
         """
         Indexe tous les fichiers d'un répertoire.
 
+        Les fichiers dont le contenu n'a pas changé depuis la dernière
+        indexation sont ignorés ; ceux qui ont des relations vers un fichier
+        modifié, ou qui mentionnent un symbole apparu, voient seulement leurs
+        relations recréées. Includes et appels sont résolus une fois tous
+        les fichiers enregistrés.
+
         Args:
             dir_path: Chemin du répertoire (relatif à project_root)
             recursive: Inclure les sous-répertoires
@@ -1286,26 +2341,56 @@ class CodeIndexer:
             logger.error(f"Directory not found: {dir_path}")
             return results
 
-        # Collecter les fichiers
-        if recursive:
-            files = list(full_dir.rglob("*"))
-        else:
-            files = list(full_dir.glob("*"))
+        # Collecter les fichiers indexables (répertoires exclus non parcourus)
+        paths = list(self._iter_indexable_files(full_dir, recursive))
 
-        # Filtrer les fichiers
-        files = [f for f in files if f.is_file() and self._should_index(f)]
+        logger.info(f"Indexing {len(paths)} files from {dir_path}")
 
-        logger.info(f"Indexing {len(files)} files from {dir_path}")
+        # Ne réanalyser que les fichiers modifiés ; ceux qui en dépendent
+        # sont seulement reliés à nouveau
+        files, relink, unchanged = self._plan_incremental(paths)
+        results.extend(unchanged)
+        results.extend(relink)
+        if unchanged:
+            logger.info(f"Skipping {len(unchanged)} unchanged files")
 
-        for file_path in files:
-            # Convertir en chemin relatif
-            try:
-                rel_path = file_path.relative_to(self.config.project_root)
-            except ValueError:
-                rel_path = file_path
+        # Noms et chemins déjà connus : ceux qui apparaîtront pourront résoudre
+        # des appels ou includes jusque-là sans cible dans les fichiers inchangés
+        known = self._known_names_and_paths() if files and unchanged else None
 
-            result = self.index_file(str(rel_path))
-            results.append(result)
+        # Un seul processus ctags pour tous les fichiers concernés
+        self._prefetch_ctags(files)
+
+        # Base vide : rien à supprimer ni à relire par index pendant le chargement
+        bulk_load = len(files) >= BULK_LOAD_MIN_FILES and not self.db.fetch_scalar(
+            "SELECT EXISTS (SELECT 1 FROM symbols) OR EXISTS (SELECT 1 FROM file_relations)"
+        )
+
+        try:
+            # Une transaction pour tout le répertoire (un SAVEPOINT par fichier)
+            with self.db.transaction(), ExitStack() as stack:
+                if bulk_load:
+                    stack.enter_context(self.db.deferred_indexes(*_BULK_TABLES))
+                self._pending_links = []
+                indexed_ids = []
+                for file_path, analysis in self._iter_analyses(files):
+                    result = self.index_file(
+                        self._relative_path(file_path), analysis=analysis, force=True
+                    )
+                    results.append(result)
+                    if result.file_id:
+                        indexed_ids.append(result.file_id)
+
+                if known is not None:
+                    relink.extend(self._files_referencing_new(unchanged, *known, indexed_ids))
+                for result in relink:
+                    self._relink_file(result)
+
+                # Relations liées après coup : indépendant de l'ordre des fichiers
+                self._link_pending()
+        finally:
+            self._pending_links = None
+            self._clear_ctags_prefetch()
 
         # Résumé
         success = sum(1 for r in results if r.success)
@@ -1317,13 +2402,21 @@ class CodeIndexer:
             f"{total_symbols} symbols, {total_relations} relations"
         )
 
+        # Projet complet indexé : point de départ pour reindex_since()
+        if recursive and full_dir.resolve() == self.config.project_root.resolve():
+            head = self._git("rev-parse", "HEAD")
+            if head:
+                self.db.set_meta(LAST_INDEXED_COMMIT_KEY, head.strip())
+
         return results
 
     def reindex_files(self, file_paths: list[str]) -> list[IndexResult]:
         """
         Réindexe une liste de fichiers (mise à jour incrémentale).
 
-        Supprime les anciens symboles/relations et réindexe.
+        Supprime les anciens symboles/relations et réindexe, dans une seule
+        transaction. Includes et appels sont résolus une fois tous les
+        fichiers enregistrés.
 
         Args:
             file_paths: Liste des chemins de fichiers
@@ -1340,33 +2433,782 @@ class CodeIndexer:
 
         logger.info(f"Reindexing {len(file_paths)} files")
 
-        for file_path in file_paths:
-            # Supprimer l'ancien index
-            existing = self.files.find_by_path(file_path)
-            if existing:
-                self._delete_file_symbols(existing.id)
+        # La base a pu changer depuis le dernier lot : cache rechargé au besoin
+        self._symbol_cache_loaded = False
 
-            # Réindexer
-            result = self.index_file(file_path)
-            results.append(result)
+        indexable = [
+            full_path
+            for full_path in dict.fromkeys(self.config.project_root / fp for fp in file_paths)
+            if full_path.is_file() and self._should_index(full_path)
+        ]
+        self._prefetch_ctags(indexable)
+
+        # Analyses produites dans l'ordre de `indexable` (pool si lot assez gros)
+        analyses = self._iter_analyses(indexable)
+        pending = set(indexable)
+
+        try:
+            # Comme index_directory() : un seul commit pour tout le lot
+            # (un SAVEPOINT par fichier), relations liées à la fin
+            with self.db.transaction():
+                self._pending_links = []
+                for file_path in file_paths:
+                    full_path = self.config.project_root / file_path
+                    analysis = None
+                    if full_path in pending:
+                        pending.discard(full_path)
+                        _, analysis = next(analyses)
+
+                    # Supprimer l'ancien index
+                    existing = self.files.get_by_path(file_path)
+                    if existing:
+                        self._delete_file_symbols(existing.id)
+
+                    # Réindexer
+                    result = self.index_file(file_path, analysis=analysis, force=True)
+                    results.append(result)
+
+                self._link_pending()
+        finally:
+            self._pending_links = None
+            analyses.close()
+            self._clear_ctags_prefetch()
 
         return results
 
+    def reindex_since(self, commit_sha: Optional[str] = None) -> list[IndexResult]:
+        """
+        Réindexe les fichiers modifiés depuis un commit, d'après Git.
+
+        Combine `git diff --name-only <sha>..HEAD` (ajoutés, modifiés,
+        renommés) et `git status --porcelain` (fichiers non commités), sans
+        parcourir l'arborescence ni hasher les fichiers inchangés. Les
+        fichiers supprimés, et l'ancien chemin des fichiers renommés, sont
+        retirés de l'index. Le commit HEAD est
+        ensuite mémorisé comme nouveau point de départ.
+
+        Args:
+            commit_sha: Commit de référence (défaut : dernier commit indexé)
+
+        Returns:
+            Liste de IndexResult (vide si Git est indisponible ou sans
+            commit de référence)
+
+        Example:
+            >>> results = indexer.reindex_since()  # depuis le dernier run
+        """
+        commit_sha = commit_sha or self.db.get_meta(LAST_INDEXED_COMMIT_KEY)
+        head = self._git("rev-parse", "HEAD")
+        if not commit_sha or head is None:
+            logger.warning("No reference commit, run index_directory() first")
+            return []
+        head = head.strip()
+
+        # --relative : chemins relatifs à project_root même dans un sous-dossier du dépôt
+        # --no-renames : un renommage donne l'ancien chemin en D, le nouveau en A
+        # -z : chemins bruts, sans guillemets ni échappements octaux
+        diff = ("diff", "--name-only", "--relative", "--no-renames", "-z", f"{commit_sha}..HEAD")
+        changed = self._git(*diff, "--diff-filter=AM")
+        deleted = self._git(*diff, "--diff-filter=D")
+        status = self._git("status", "--porcelain", "-z", "--untracked-files=all", "--", ".")
+        prefix = self._git("rev-parse", "--show-prefix")
+        if changed is None or deleted is None or status is None or prefix is None:
+            return []
+        prefix = prefix.strip()
+
+        paths = dict.fromkeys(changed.split("\0"))
+        removed = set(deleted.split("\0"))
+        entries = iter(status.split("\0"))
+        for entry in entries:
+            # "XY chemin" (relatif à la racine du dépôt) ; un renommage ou une
+            # copie est suivi de l'ancien chemin dans l'entrée suivante
+            code, path = entry[:2], entry[3:][len(prefix):]
+            if "R" in code or "C" in code:
+                source = next(entries, "")
+                if "R" in code and source.startswith(prefix):
+                    removed.add(source[len(prefix):])
+            if "D" in code:
+                removed.add(path)
+            else:
+                paths[path] = None
+
+        for path in removed - paths.keys():
+            if self.files.delete_by_path(path):
+                logger.debug(f"Removed deleted file: {path}")
+
+        files = [
+            path for path in paths
+            if path and self._should_index(self.config.project_root / path)
+        ]
+        logger.info(f"{len(files)} files changed since {commit_sha[:12]}")
+
+        results = self.reindex_files(files) if files else []
+        self.db.set_meta(LAST_INDEXED_COMMIT_KEY, head)
+        return results
+
     # -------------------------------------------------------------------------
     # PRIVATE HELPERS
     # -------------------------------------------------------------------------
 
+    def _store_file(
+        self,
+        result: IndexResult,
+        file_path: str,
+        full_path: Path,
+        analysis: FileAnalysis,
+        language: Optional[str],
+    ) -> None:
+        """
+        Enregistre un fichier, ses symboles et ses relations.
+
+        Appelé dans la transaction ouverte par index_file().
+        """
+        content = analysis.content
+        line_counts = analysis.line_counts
+        complexity = analysis.complexity
+
+        # Créer ou mettre à jour l'entrée fichier
+        existing = self.files.get_by_path(file_path)
+
+        file_obj = File(
+            id=existing.id if existing else None,
+            path=file_path,
+            filename=full_path.name,
+            extension=full_path.suffix,
+            module=self._detect_module(full_path),
+            file_type=self._detect_file_type(full_path),
+            language=language,
+            is_critical=self._is_critical_path(file_path),
+            security_sensitive=self._is_security_sensitive(file_path, content),
+            lines_total=line_counts["total"],
+            lines_code=line_counts["code"],
+            lines_comment=line_counts["comment"],
+            lines_blank=line_counts["blank"],
+            complexity_sum=complexity["sum"],
+            complexity_avg=complexity["avg"],
+            complexity_max=complexity["max"],
+            content_hash=analysis.content_hash,
+            indexed_at=datetime.now().isoformat(),
+        )
+
+        if existing:
+            # Supprimer les anciens symboles et relations
+            self._delete_file_symbols(existing.id)
+            self.files.update(existing.id, **file_obj.to_dict(exclude_id=True))
+            file_id = existing.id
+        else:
+            file_id = self.files.insert(file_obj)
+
+        result.file_id = file_id
+
+        # Extraire les symboles avec ctags (pour C/C++) ou AST (pour Python)
+        symbols = []
+        if analysis.symbols is not None:
+            symbols = analysis.symbols
+        elif language in ("c", "cpp") and self.ctags_available:
+            try:
+                tags = self._get_ctags(full_path, language, analysis.content_hash)
+                symbols = ctags_to_symbols(tags, file_id, file_content=content)
+            except Exception as e:
+                result.warnings.append(f"ctags failed: {e}")
+                logger.warning(f"ctags failed for {file_path}: {e}")
+        elif language == "javascript" and self.ctags_available:
+            # Fallback ctags pour JavaScript/TypeScript
+            try:
+                tags = self._get_ctags(full_path, language, analysis.content_hash)
+                symbols = ctags_to_symbols(tags, file_id, file_content=content)
+            except Exception as e:
+                result.warnings.append(f"ctags failed for JS: {e}")
+
+        # Insérer les symboles (executemany)
+        for sym in symbols:
+            sym.file_id = file_id
+        self.symbols.insert_many(symbols)
+
+        result.symbols_count = len(symbols)
+
+        # Extraire les appels (résolus ensuite contre les symboles connus)
+        if analysis.calls is not None:
+            calls = analysis.calls
+        else:
+            calls = extract_calls(
+                str(full_path), symbols, _AnySymbol(), language,
+                content=analysis.content,
+            )
+
+        if self._pending_links is not None:
+            # Indexation par lot : liés une fois tous les fichiers enregistrés
+            self._pending_links.append((result, file_id, language, analysis.includes, calls))
+        else:
+            self._cache_file_symbols(symbols)
+            self._link_relations(result, file_id, language, analysis.includes, calls)
+
+    def _link_relations(
+        self,
+        result: IndexResult,
+        file_id: int,
+        language: Optional[str],
+        includes: list[dict[str, Any]],
+        calls: list[dict[str, Any]],
+        file_ids: Optional[dict[str, int]] = None,
+    ) -> None:
+        """
+        Crée les relations vers les fichiers inclus et les symboles appelés connus.
+
+        `file_ids` ({path: id}) évite de résoudre à nouveau les includes
+        quand l'appelant l'a fait pour tout un lot.
+        """
+        if file_ids is None:
+            file_ids = self.files.get_ids_by_paths(inc["path"] for inc in includes)
+
+        file_relations = []
+        for inc in includes:
+            # Essayer de résoudre le fichier inclus
+            target_id = file_ids.get(inc["path"])
+            if target_id:
+                fr = FileRelation(
+                    source_file_id=file_id,
+                    target_file_id=target_id,
+                    relation_type="includes" if language in ("c", "cpp") else "imports",
+                    line_number=inc["line"],
+                )
+                file_relations.append(fr)
+
+        # Insérer les relations de fichiers
+        self.file_relations.insert_many(file_relations)
+
+        relations = []
+        for call in calls:
+            caller_id = self._symbol_cache.get(call["caller"])
+            callee_id = self._symbol_cache.get(call["callee"])
+
+            if caller_id and callee_id:
+                rel = Relation(
+                    source_id=caller_id,
+                    target_id=callee_id,
+                    relation_type="calls",
+                    location_file_id=file_id,
+                    location_line=call["line"],
+                )
+                relations.append(rel)
+        self.relations.insert_many(relations)
+
+        result.relations_count = len(relations) + len(file_relations)
+
+    def _link_pending(self) -> None:
+        """Crée les relations mises en attente par un lot, une fois tous les fichiers en base."""
+        pending, self._pending_links = self._pending_links, None
+        if not pending:
+            return
+        self._refresh_symbol_cache()
+        # Une résolution groupée des includes pour tout le lot
+        file_ids = self.files.get_ids_by_paths(
+            inc["path"] for _, _, _, includes, _ in pending for inc in includes
+        )
+        for result, file_id, language, includes, calls in pending:
+            self._link_relations(result, file_id, language, includes, calls, file_ids)
+
+    def _git(self, *args: str) -> Optional[str]:
+        """Sortie d'une commande git à la racine du projet (None si échec)."""
+        try:
+            proc = subprocess.run(
+                ["git", *args],
+                capture_output=True,
+                text=True,
+                cwd=str(self.config.project_root),
+                timeout=30,
+            )
+        except (OSError, subprocess.TimeoutExpired) as e:
+            logger.debug(f"git {args[0]} failed: {e}")
+            return None
+        if proc.returncode != 0:
+            logger.debug(f"git {args[0]} failed: {proc.stderr.strip()}")
+            return None
+        return proc.stdout
+
+    def _relative_path(self, file_path: Path) -> str:
+        """Chemin relatif à project_root (tel que stocké dans files.path)."""
+        try:
+            return str(file_path.relative_to(self.config.project_root))
+        except ValueError:
+            return str(file_path)
+
+    def _stored_counts(self, file_id: Optional[int] = None) -> dict[int, tuple[int, int]]:
+        """Nombre de symboles et de relations en base par fichier (ou pour un seul)."""
+        where = "WHERE {col} = ?" if file_id is not None else ""
+        params = (file_id,) if file_id is not None else ()
+        # (requête, colonne filtrée, 0 = symboles / 1 = relations)
+        queries = (
+            ("SELECT file_id AS id, COUNT(*) AS n FROM symbols {where} GROUP BY file_id",
+             "file_id", 0),
+            ("SELECT location_file_id AS id, COUNT(*) AS n FROM relations {where} "
+             "GROUP BY location_file_id", "location_file_id", 1),
+            ("SELECT source_file_id AS id, COUNT(*) AS n FROM file_relations {where} "
+             "GROUP BY source_file_id", "source_file_id", 1),
+        )
+
+        counts: dict[int, list[int]] = {}
+        for sql, col, slot in queries:
+            for row in self.db.fetch_all(sql.format(where=where.format(col=col)), params):
+                counts.setdefault(row["id"], [0, 0])[slot] += row["n"]
+        return {fid: (n_symbols, n_relations) for fid, (n_symbols, n_relations) in counts.items()}
+
+    def _is_unchanged(self, result: IndexResult, file_path: str, content_hash: str) -> bool:
+        """
+        Vérifie si le fichier est déjà indexé avec ce contenu.
+
+        Si oui, remplit `result` depuis la base et le marque `skipped`.
+        """
+        existing = self.files.get_by_path(file_path)
+        if existing is None or existing.content_hash != content_hash:
+            return False
+
+        result.file_id = existing.id
+        result.symbols_count, result.relations_count = (
+            self._stored_counts(existing.id).get(existing.id, (0, 0))
+        )
+        result.skipped = True
+        logger.debug(f"Unchanged, skipped: {file_path}")
+        return True
+
+    def _plan_incremental(
+        self, files: list[str]
+    ) -> tuple[list[Path], list[IndexResult], list[IndexResult]]:
+        """
+        Sépare les fichiers à réindexer de ceux dont l'index est à jour.
+
+        Un fichier est réindexé si son hash de contenu diffère de celui en
+        base. Un fichier inchangé ayant des relations vers un fichier modifié
+        est à relier (_relink_file) : réindexer ce dernier supprime ses
+        symboles, et donc les relations qui y pointent.
+
+        Les chemins restent des chaînes : seuls les fichiers à réindexer
+        deviennent des Path, pas les (souvent nombreux) fichiers inchangés.
+
+        Returns:
+            (fichiers à indexer, résultats des fichiers à relier, résultats
+            des fichiers ignorés)
+        """
+        stored = {
+            row["path"]: (row["id"], row["content_hash"])
+            for row in self.db.fetch_all("SELECT id, path, content_hash FROM files")
+        }
+        if not stored:
+            return [Path(f) for f in files], [], []
+
+        # Même résultat que _relative_path(), par simple découpage de chaîne
+        root_prefix = os.path.join(str(self.config.project_root), "")
+        to_index: list[str] = []
+        unchanged: dict[int, tuple[str, str]] = {}
+        changed_ids: list[int] = []
+
+        for f in files:
+            rel_path = f[len(root_prefix):] if f.startswith(root_prefix) else f
+            file_id, stored_hash = stored.get(rel_path, (None, None))
+            if file_id is not None:
+                try:
+                    if stored_hash and hash_file(f) == stored_hash:
+                        unchanged[file_id] = (f, rel_path)
+                        continue
+                except OSError:
+                    pass  # index_file rapportera l'erreur
+                changed_ids.append(file_id)
+            to_index.append(f)
+
+        dependents = self._dependent_file_ids(changed_ids) & unchanged.keys()
+
+        counts = self._stored_counts() if unchanged else {}
+        relink = []
+        skipped = []
+        for file_id, (f, rel_path) in unchanged.items():
+            n_symbols, n_relations = counts.get(file_id, (0, 0))
+            result = IndexResult(
+                file_path=rel_path,
+                file_id=file_id,
+                symbols_count=n_symbols,
+                relations_count=n_relations,
+                skipped=file_id not in dependents,
+            )
+            (skipped if result.skipped else relink).append(result)
+
+        return [Path(f) for f in to_index], relink, skipped
+
+    def _known_names_and_paths(self) -> tuple[set[str], set[str]]:
+        """Noms de symboles et chemins de fichiers actuellement en base."""
+        names = {
+            r["name"] for r in self.db.fetch_all("SELECT DISTINCT name FROM symbols")
+        }
+        paths = {r["path"] for r in self.db.fetch_all("SELECT path FROM files")}
+        return names, paths
+
+    def _files_referencing_new(
+        self,
+        skipped: list[IndexResult],
+        known_names: set[str],
+        known_paths: set[str],
+        indexed_ids: list[int],
+    ) -> list[IndexResult]:
+        """
+        Fichiers inchangés qui mentionnent un symbole ou un fichier apparu.
+
+        Leurs appels (ou includes) vers ces noms n'avaient pas de cible :
+        ils sont à relier pour obtenir le même graphe qu'une indexation
+        complète. Simple recherche textuelle, lancée seulement si des noms
+        ou des fichiers nouveaux existent.
+        """
+        new_names: set[str] = set()
+        new_paths: set[str] = set()
+        for i in range(0, len(indexed_ids), 500):
+            chunk = indexed_ids[i:i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            new_names.update(r["name"] for r in self.db.fetch_all(
+                f"SELECT DISTINCT name FROM symbols WHERE file_id IN ({placeholders})", chunk
+            ))
+            new_paths.update(r["path"] for r in self.db.fetch_all(
+                f"SELECT path FROM files WHERE id IN ({placeholders})", chunk
+            ))
+        new_names -= known_names
+        new_paths -= known_paths
+        if not new_names and not new_paths:
+            return []
+
+        referencing = []
+        for result in skipped:
+            try:
+                content = (self.config.project_root / result.file_path).read_text(
+                    encoding="utf-8", errors="replace"
+                )
+            except OSError:
+                continue
+            if any(path in content for path in new_paths) or not new_names.isdisjoint(
+                _IDENTIFIER_RE.findall(content)
+            ):
+                referencing.append(result)
+        if referencing:
+            logger.info(f"Relinking {len(referencing)} files referencing new symbols")
+        return referencing
+
+    def _relink_file(self, result: IndexResult) -> None:
+        """
+        Recrée les relations sortantes d'un fichier inchangé, sans toucher à
+        ses symboles : les relations qui pointent vers lui sont conservées.
+
+        Les relations sont mises en attente dans _pending_links.
+        """
+        file_id = result.file_id
+        full_path = self.config.project_root / result.file_path
+        language = self._detect_language(full_path)
+        try:
+            raw = full_path.read_bytes()
+        except OSError as e:
+            result.errors.append(f"Cannot read file: {e}")
+            return
+        content = raw.decode("utf-8", errors="replace")
+
+        tree = None
+        if language == "python":
+            tree = self._parse_python(full_path, content, compute_content_hash(raw))
+        symbols = self.symbols.get_by_file(file_id)
+        calls = []
+        if language != "python" or tree is not None:
+            calls = extract_calls(
+                str(full_path), symbols, _AnySymbol(), language, tree=tree, content=content
+            )
+        includes = extract_includes(str(full_path), language, content=content)
+
+        self.db.execute("DELETE FROM relations WHERE location_file_id = ?", (file_id,))
+        self.db.execute("DELETE FROM file_relations WHERE source_file_id = ?", (file_id,))
+        result.skipped = False
+        self._pending_links.append((result, file_id, language, includes, calls))
+
+    def _dependent_file_ids(self, file_ids: list[int]) -> set[int]:
+        """IDs des fichiers ayant des relations (appels, includes) vers ces fichiers."""
+        dependents: set[int] = set()
+        for i in range(0, len(file_ids), 500):
+            chunk = file_ids[i:i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self.db.fetch_all(
+                f"""
+                SELECT r.location_file_id AS file_id
+                FROM relations r
+                JOIN symbols t ON r.target_id = t.id
+                WHERE t.file_id IN ({placeholders})
+                UNION
+                SELECT source_file_id FROM file_relations
+                WHERE target_file_id IN ({placeholders})
+                """,
+                (*chunk, *chunk),
+            )
+            dependents.update(row["file_id"] for row in rows if row["file_id"] is not None)
+        return dependents
+
+    def _iter_analyses(
+        self,
+        files: list[Path]
+    ) -> Iterator[tuple[Path, Optional[FileAnalysis]]]:
+        """
+        Analyse les fichiers dans un pool de processus, dans l'ordre.
+
+        Le parsing (CPU) se fait dans les workers, les écritures en base
+        restent dans le processus principal. Produit None pour un fichier
+        à analyser localement (lot trop petit, erreur de worker, pool
+        indisponible).
+        """
+        if len(files) < PARALLEL_MIN_FILES or INDEXER_MAX_WORKERS <= 1:
+            for f in files:
+                yield f, None
+            return
+
+        # ~4 lots par worker : peu d'allers-retours IPC sans déséquilibrer la fin
+        chunksize = max(1, min(
+            PARALLEL_MAX_CHUNKSIZE, len(files) // (INDEXER_MAX_WORKERS * 4)
+        ))
+        done = 0
+        try:
+            with ProcessPoolExecutor(max_workers=INDEXER_MAX_WORKERS) as pool:
+                analyses = pool.map(
+                    _analyze_file_worker,
+                    [str(f) for f in files],
+                    [self._detect_language(f) for f in files],
+                    chunksize=chunksize,
+                )
+                for f, analysis in zip(files, analyses):
+                    done += 1
+                    yield f, analysis
+        except (OSError, BrokenProcessPool) as e:
+            logger.warning(f"Process pool unavailable, analyzing serially: {e}")
+            for f in files[done:]:
+                yield f, None
+
+    def _prefetch_ctags(self, files: list[Path]) -> None:
+        """
+        Lance ctags par lots parallèles sur les fichiers C/C++/JS.
+
+        Les lots tournent en arrière-plan pendant l'analyse des autres
+        fichiers ; _get_ctags n'attend que le lot du fichier demandé.
+        """
+        if not self.ctags_available:
+            return
+        self._clear_ctags_prefetch()
+
+        ctags_files = [
+            str(f) for f in files
+            if self._detect_language(f) in ("c", "cpp", "javascript")
+        ]
+        if self.config.ctags_cache_dir is not None:
+            # Contenus déjà passés à ctags : tags relus depuis le cache
+            hashes = {}
+            for path in ctags_files:
+                try:
+                    hashes[path] = hash_file(Path(path))
+                except OSError:
+                    continue
+            ctags_files = [
+                path for path in ctags_files
+                if path not in hashes or not self._ctags_cache_path(path, hashes[path]).exists()
+            ]
+            self._ctags_hashes = {path: hashes[path] for path in ctags_files if path in hashes}
+        if len(ctags_files) < 2:
+            return
+
+        # Au moins un lot par worker pour occuper tous les cœurs
+        batch_size = max(1, min(
+            CTAGS_BATCH_SIZE, -(-len(ctags_files) // INDEXER_MAX_WORKERS)
+        ))
+        batches = [
+            ctags_files[i:i + batch_size]
+            for i in range(0, len(ctags_files), batch_size)
+        ]
+
+        def run_batch(batch: list[str]) -> dict[str, list[dict[str, Any]]]:
+            try:
+                # language="c" active les kinds C/C++ (sans effet sur JS)
+                return run_ctags_batch(batch, self.ctags_path, language="c")
+            except Exception as e:
+                # Repli sur un appel ctags par fichier dans index_file
+                logger.warning(
+                    f"Batch ctags failed for {len(batch)} files, "
+                    f"falling back to per-file runs: {e}"
+                )
+                return {}
+
+        # Des threads suffisent : chacun attend son propre processus ctags
+        self._ctags_pool = ThreadPoolExecutor(
+            max_workers=min(INDEXER_MAX_WORKERS, len(batches))
+        )
+        for batch in batches:
+            future = self._ctags_pool.submit(run_batch, batch)
+            self._ctags_prefetch.update(dict.fromkeys(batch, future))
+
+    def _get_ctags(
+        self,
+        full_path: Path,
+        language: str,
+        content_hash: Optional[str] = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Retourne les tags du fichier : lot pré-calculé, cache disque, ou ctags.
+
+        `content_hash` est le hash du contenu analysé ; il sert de clé au
+        cache disque (si configuré).
+        """
+        path = str(full_path)
+        prefetch_hash = self._ctags_hashes.pop(path, None)
+        future = self._ctags_prefetch.pop(path, None)
+        tags = future.result().pop(path, None) if future is not None else None
+        if tags is not None:
+            if content_hash is not None and prefetch_hash == content_hash:
+                self._write_ctags_cache(path, content_hash, tags)
+            return tags
+
+        if content_hash is not None:
+            tags = self._read_ctags_cache(path, content_hash)
+            if tags is not None:
+                return tags
+
+        tags = self._run_ctags(path, language)
+        if content_hash is not None:
+            self._write_ctags_cache(path, content_hash, tags)
+        return tags
+
+    def _run_ctags(self, path: str, language: str) -> list[dict[str, Any]]:
+        """ctags sur un fichier : processus interactif partagé, sinon un processus dédié."""
+        if self._ctags_daemon is None and self._ctags_interactive:
+            daemon = CtagsDaemon(self.ctags_path)
+            if daemon.start():
+                self._ctags_daemon = daemon
+            else:
+                self._ctags_interactive = False
+
+        if self._ctags_daemon is not None:
+            try:
+                return self._ctags_daemon.tags_for(path)
+            except RuntimeError as e:
+                logger.warning(f"Interactive ctags failed for {path}: {e}")
+                if not self._ctags_daemon.is_running:
+                    self._ctags_daemon = None  # relancé au prochain fichier
+
+        return run_ctags(path, self.ctags_path, language=language)
+
+    def close(self) -> None:
+        """Arrête le processus ctags interactif (relancé au besoin si l'indexeur resert)."""
+        if self._ctags_daemon is not None:
+            self._ctags_daemon.close()
+            self._ctags_daemon = None
+
+    def _ctags_cache_path(self, path: str, content_hash: str) -> Path:
+        """
+        Entrée du cache : hash du contenu + extension (ctags en déduit le langage).
+
+        Les entrées sont rangées sous une empreinte de `ctags --version` et
+        des options de _ctags_command : une mise à jour de ctags ou un
+        changement d'options ne relit pas d'anciens tags.
+        """
+        if self._ctags_cache_subdir is None:
+            version = _ctags_version(self.ctags_path) if self.ctags_available else ""
+            options = "\0".join(_ctags_command("", "c")[1:])
+            digest = hashlib.sha1(f"{version}\0{options}".encode()).hexdigest()[:12]
+            self._ctags_cache_subdir = self.config.ctags_cache_dir / digest
+        return self._ctags_cache_subdir / f"{content_hash}{os.path.splitext(path)[1].lower()}.json"
+
+    def _read_ctags_cache(self, path: str, content_hash: str) -> Optional[list[dict[str, Any]]]:
+        """Tags mis en cache pour ce contenu, None si absents ou illisibles."""
+        if self.config.ctags_cache_dir is None:
+            return None
+        cache_path = self._ctags_cache_path(path, content_hash)
+        try:
+            data = cache_path.read_bytes()
+            tags = orjson.loads(data) if orjson is not None else json.loads(data)
+            os.utime(cache_path)  # récemment utilisé : épargné par l'éviction
+        except (OSError, ValueError):
+            return None
+        return tags
+
+    def _write_ctags_cache(self, path: str, content_hash: str, tags: list[dict[str, Any]]) -> None:
+        """Enregistre les tags d'un contenu (écriture atomique, erreurs ignorées)."""
+        if self.config.ctags_cache_dir is None:
+            return
+        cache_path = self._ctags_cache_path(path, content_hash)
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            data = orjson.dumps(tags) if orjson is not None else json.dumps(tags).encode()
+            fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, cache_path)
+            self._ctags_cache_writes += 1
+        except OSError as e:
+            logger.debug(f"Cannot write ctags cache for {path}: {e}")
+
+    def _trim_ctags_cache(self) -> None:
+        """
+        Supprime les entrées les moins récemment utilisées au-delà de CTAGS_CACHE_MAX_FILES.
+
+        Toutes les versions de ctags sont comptées ensemble : les entrées
+        d'une ancienne version, jamais relues, partent les premières.
+        """
+        cache_dir = self.config.ctags_cache_dir
+        if cache_dir is None or not self._ctags_cache_writes:
+            return
+        self._ctags_cache_writes = 0
+        try:
+            entries = []
+            for entry in os.scandir(cache_dir):
+                if entry.is_dir():
+                    entries.extend(e for e in os.scandir(entry.path) if e.name.endswith(".json"))
+                elif entry.name.endswith(".json"):
+                    entries.append(entry)  # ancien cache à plat
+            excess = len(entries) - CTAGS_CACHE_MAX_FILES
+            if excess <= 0:
+                return
+            entries.sort(key=lambda e: e.stat().st_mtime)
+            for entry in entries[:excess]:
+                os.unlink(entry.path)
+        except OSError as e:
+            logger.debug(f"Cannot trim ctags cache: {e}")
+
+    def _clear_ctags_prefetch(self) -> None:
+        """Abandonne les lots ctags non consommés, arrête leur pool et borne le cache."""
+        self._ctags_prefetch.clear()
+        self._ctags_hashes.clear()
+        if self._ctags_pool is not None:
+            self._ctags_pool.shutdown(wait=True, cancel_futures=True)
+            self._ctags_pool = None
+        self._trim_ctags_cache()
+
+    def _iter_indexable_files(self, full_dir: Path, recursive: bool) -> Iterator[str]:
+        """
+        Parcourt un répertoire et produit les chemins des fichiers à indexer.
+
+        Même résultat (et même ordre) que rglob/glob suivi de _should_index,
+        mais sur des chaînes, sans objet Path par entrée, et sans descendre
+        dans les répertoires entièrement exclus (.git, node_modules...).
+        """
+        root_prefix = os.path.join(str(self.config.project_root), "")
+
+        def relative(path: str) -> str:
+            return path[len(root_prefix):] if path.startswith(root_prefix) else path
+
+        for dirpath, dirnames, filenames in os.walk(full_dir):
+            if recursive:
+                dirnames[:] = [
+                    d for d in dirnames
+                    if not self.config.is_excluded_dir(relative(os.path.join(dirpath, d)))
+                ]
+            else:
+                dirnames.clear()
+
+            for name in filenames:
+                if self.config.language_for(os.path.splitext(name)[1].lower()) is None:
+                    continue
+                path = os.path.join(dirpath, name)
+                if not self.config.is_excluded(relative(path)) and os.path.isfile(path):
+                    yield path
+
     def _should_index(self, file_path: Path) -> bool:
         """Vérifie si un fichier doit être indexé."""
         # Vérifier l'extension
-        ext = file_path.suffix.lower()
-        valid_ext = False
-        for exts in self.config.extensions.values():
-            if ext in exts:
-                valid_ext = True
-                break
-
-        if not valid_ext:
+        if self.config.language_for(file_path.suffix.lower()) is None:
             return False
 
         # Vérifier les exclusions
@@ -1376,79 +3218,62 @@ class CodeIndexer:
         except ValueError:
             pass
 
-        for pattern in self.config.exclude_patterns:
-            if fnmatch.fnmatch(rel_path, pattern):
-                return False
-
-        return True
+        return not self.config.is_excluded(rel_path)
 
     def _detect_language(self, file_path: Path) -> Optional[str]:
         """Détecte le langage depuis l'extension."""
-        ext = file_path.suffix.lower()
-        for lang, exts in self.config.extensions.items():
-            if ext in exts:
-                return lang
-        return None
+        return self.config.language_for(file_path.suffix.lower())
 
     def _detect_module(self, file_path: Path) -> Optional[str]:
-        """Déduit le module depuis le chemin."""
+        """Déduit le module depuis le chemin (mis en cache par répertoire)."""
+        parent = os.path.dirname(str(file_path))
+        if parent in self._module_by_dir:
+            return self._module_by_dir[parent]
+
         try:
-            rel = file_path.relative_to(self.config.project_root)
+            dir_parts = file_path.parent.relative_to(self.config.project_root).parts
         except ValueError:
-            rel = file_path
+            dir_parts = file_path.parent.parts
 
-        parts = rel.parts
         # Ignorer "src" et le fichier lui-même
-        if len(parts) >= 2:
-            if parts[0] in ("src", "lib", "source"):
-                if len(parts) >= 3:
-                    return parts[1]
-            return parts[0]
-        return None
+        module = None
+        if dir_parts:
+            module = dir_parts[0]
+            if module in ("src", "lib", "source") and len(dir_parts) >= 2:
+                module = dir_parts[1]
+        self._module_by_dir[parent] = module
+        return module
 
     def _detect_file_type(self, file_path: Path) -> str:
         """Détermine le type de fichier."""
-        name = file_path.name.lower()
-        ext = file_path.suffix.lower()
-
-        # Headers
-        if ext in (".h", ".hpp", ".hh", ".hxx"):
-            return "header"
-
-        # Tests
-        if "test" in name or "_test" in name or "spec" in name:
-            return "test"
+        file_type = _FILE_TYPE_BY_EXT.get(file_path.suffix.lower(), "source")
 
-        # Config
-        if ext in (".json", ".yaml", ".yml", ".toml", ".ini", ".cfg"):
-            return "config"
-
-        # Documentation
-        if ext in (".md", ".rst", ".txt"):
-            return "doc"
-
-        return "source"
+        # Headers avant tests, tests avant config/doc
+        if file_type != "header":
+            name = file_path.name.lower()
+            if "test" in name or "spec" in name:
+                return "test"
+        return file_type
 
     def _is_critical_path(self, file_path: str) -> bool:
         """Vérifie si le fichier est dans un chemin critique."""
-        for pattern in self.config.critical_paths:
-            if fnmatch.fnmatch(file_path, pattern):
-                return True
-        return False
+        return self.config.is_critical(file_path)
 
     def _is_security_sensitive(self, file_path: str, content: str) -> bool:
         """Vérifie si le fichier est sensible (sécurité)."""
         # Patterns dans le nom
-        sensitive_patterns = ["password", "secret", "token", "key", "crypt", "auth"]
         name_lower = file_path.lower()
-        for pattern in sensitive_patterns:
+        for pattern in _SENSITIVE_NAME_PATTERNS:
             if pattern in name_lower:
                 return True
 
-        # Patterns dans le contenu (simplifié)
-        sensitive_content = ["private_key", "api_key", "secret_key", "password"]
+        # Patterns dans le contenu (simplifié) : une seule mise en minuscules
         content_lower = content.lower()
-        for pattern in sensitive_content:
+        if "password" in content_lower:
+            return True
+        if "_key" not in content_lower:
+            return False
+        for pattern in _SENSITIVE_KEY_PATTERNS:
             if pattern in content_lower:
                 return True
 
@@ -1456,238 +3281,56 @@ class CodeIndexer:
 
     def _delete_file_symbols(self, file_id: int) -> None:
         """Supprime tous les symboles et relations d'un fichier."""
+        names: list[str] = []
+        if self._symbol_cache_loaded:
+            rows = self.db.fetch_all(
+                "SELECT DISTINCT name FROM symbols WHERE file_id = ?", (file_id,)
+            )
+            names = [r["name"] for r in rows]
         # Les relations seront supprimées en cascade grâce aux FK
         self.db.execute(
             "DELETE FROM symbols WHERE file_id = ?",
             (file_id,)
         )
+        if names:
+            self._uncache_symbol_names(names)
         self.db.execute(
             "DELETE FROM file_relations WHERE source_file_id = ? OR target_file_id = ?",
             (file_id, file_id)
         )
 
-    def _extract_python_symbols(self, file_path: Path, file_id: int) -> list[Symbol]:
+    def _parse_python(
+        self,
+        file_path: Path,
+        content: str,
+        content_hash: str
+    ) -> Optional[ast.Module]:
         """
-        Extrait les symboles d'un fichier Python avec ast.
+        Parse un fichier Python, en réutilisant l'AST si le contenu n'a pas changé.
 
-        Détecte :
-        - Fonctions (def) avec signature, visibilité, complexité
-        - Classes avec bases d'héritage
-        - Méthodes dans les classes (kind="method")
-        - Propriétés (@property)
+        Returns:
+            L'AST du module, ou None si le fichier ne parse pas
         """
-        import ast
+        key = str(file_path)
+        cached = self._ast_cache.get(key)
+        if cached is not None and cached[0] == content_hash:
+            self._ast_cache.move_to_end(key)
+            return cached[1]
 
         try:
-            content = file_path.read_text(encoding="utf-8")
-            tree = ast.parse(content, filename=str(file_path))
+            tree = ast.parse(content, filename=key)
         except SyntaxError as e:
             logger.warning(f"Python syntax error in {file_path}: {e}")
-            return []
+            return None
         except Exception as e:
             logger.warning(f"Cannot parse {file_path}: {e}")
-            return []
-
-        symbols = []
-        lines = content.split("\n")
-
-        def get_visibility(name: str, decorators: list) -> str:
-            """Détermine la visibilité d'un symbole Python."""
-            # Convention Python: _name = private, __name = very private
-            if name.startswith("__") and not name.endswith("__"):
-                return "private"
-            elif name.startswith("_"):
-                return "protected"
-            return "public"
-
-        def has_decorator(decorators: list, name: str) -> bool:
-            """Vérifie si un décorateur est présent."""
-            for d in decorators:
-                if isinstance(d, ast.Name) and d.id == name:
-                    return True
-                elif isinstance(d, ast.Attribute) and d.attr == name:
-                    return True
-            return False
-
-        def calculate_python_complexity(node) -> int:
-            """Calcule la complexité cyclomatique d'une fonction Python."""
-            complexity = 1
-
-            for child in ast.walk(node):
-                if isinstance(child, ast.If):
-                    complexity += 1
-                elif isinstance(child, ast.For):
-                    complexity += 1
-                elif isinstance(child, ast.While):
-                    complexity += 1
-                elif isinstance(child, ast.ExceptHandler):
-                    complexity += 1
-                elif isinstance(child, ast.With):
-                    complexity += 1
-                elif isinstance(child, ast.Assert):
-                    complexity += 1
-                elif isinstance(child, ast.comprehension):
-                    complexity += 1
-                elif isinstance(child, ast.BoolOp):
-                    # and/or ajoutent de la complexité
-                    complexity += len(child.values) - 1
-                elif isinstance(child, ast.IfExp):  # ternaire
-                    complexity += 1
-
-            return complexity
-
-        def extract_return_type(node) -> Optional[str]:
-            """Extrait le type de retour d'une fonction."""
-            if node.returns:
-                try:
-                    return ast.unparse(node.returns)
-                except Exception:
-                    return None
             return None
 
-        # Parcourir l'AST de manière structurée
-        for node in ast.iter_child_nodes(tree):
-            # Fonctions de niveau module
-            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                is_async = isinstance(node, ast.AsyncFunctionDef)
-                visibility = get_visibility(node.name, node.decorator_list)
-                is_static = has_decorator(node.decorator_list, "staticmethod")
-
-                sym = Symbol(
-                    file_id=file_id,
-                    name=node.name,
-                    kind="function",
-                    line_start=node.lineno,
-                    line_end=node.end_lineno,
-                    signature=self._get_python_signature(node),
-                    return_type=extract_return_type(node),
-                    visibility=visibility,
-                    is_static=is_static,
-                    is_exported=visibility == "public",
-                    complexity=calculate_python_complexity(node),
-                    doc_comment=ast.get_docstring(node),
-                    has_doc=ast.get_docstring(node) is not None,
-                )
-                symbols.append(sym)
-
-            # Classes
-            elif isinstance(node, ast.ClassDef):
-                bases = []
-                for base in node.bases:
-                    try:
-                        bases.append(ast.unparse(base))
-                    except Exception:
-                        if isinstance(base, ast.Name):
-                            bases.append(base.id)
-
-                class_visibility = get_visibility(node.name, node.decorator_list)
-
-                class_sym = Symbol(
-                    file_id=file_id,
-                    name=node.name,
-                    kind="class",
-                    line_start=node.lineno,
-                    line_end=node.end_lineno,
-                    visibility=class_visibility,
-                    is_exported=class_visibility == "public",
-                    base_classes_json=json.dumps(bases) if bases else None,
-                    doc_comment=ast.get_docstring(node),
-                    has_doc=ast.get_docstring(node) is not None,
-                )
-                symbols.append(class_sym)
-
-                # Extraire les méthodes de la classe
-                for class_node in ast.iter_child_nodes(node):
-                    if isinstance(class_node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                        method_name = class_node.name
-                        method_visibility = get_visibility(method_name, class_node.decorator_list)
-
-                        # Déterminer le type de méthode
-                        is_static = has_decorator(class_node.decorator_list, "staticmethod")
-                        is_classmethod = has_decorator(class_node.decorator_list, "classmethod")
-                        is_property = has_decorator(class_node.decorator_list, "property")
-
-                        kind = "method"
-                        if is_property:
-                            kind = "property"
-
-                        method_sym = Symbol(
-                            file_id=file_id,
-                            name=method_name,
-                            qualified_name=f"{node.name}.{method_name}",
-                            kind=kind,
-                            line_start=class_node.lineno,
-                            line_end=class_node.end_lineno,
-                            signature=self._get_python_signature(class_node),
-                            return_type=extract_return_type(class_node),
-                            visibility=method_visibility,
-                            is_static=is_static,
-                            is_exported=method_visibility == "public" and class_visibility == "public",
-                            complexity=calculate_python_complexity(class_node),
-                            doc_comment=ast.get_docstring(class_node),
-                            has_doc=ast.get_docstring(class_node) is not None,
-                        )
-                        symbols.append(method_sym)
-
-        return symbols
-
-    def _get_python_signature(self, node) -> Optional[str]:
-        """Construit la signature complète d'une fonction Python."""
-        import ast
-
-        try:
-            args_parts = []
-
-            # Arguments positionnels normaux
-            defaults_offset = len(node.args.args) - len(node.args.defaults)
-            for i, arg in enumerate(node.args.args):
-                arg_str = arg.arg
-                if arg.annotation:
-                    arg_str += f": {ast.unparse(arg.annotation)}"
-                # Ajouter la valeur par défaut si présente
-                default_idx = i - defaults_offset
-                if default_idx >= 0 and default_idx < len(node.args.defaults):
-                    try:
-                        arg_str += f" = {ast.unparse(node.args.defaults[default_idx])}"
-                    except Exception:
-                        arg_str += " = ..."
-                args_parts.append(arg_str)
-
-            # *args
-            if node.args.vararg:
-                vararg = f"*{node.args.vararg.arg}"
-                if node.args.vararg.annotation:
-                    vararg += f": {ast.unparse(node.args.vararg.annotation)}"
-                args_parts.append(vararg)
-
-            # keyword-only args
-            for i, arg in enumerate(node.args.kwonlyargs):
-                arg_str = arg.arg
-                if arg.annotation:
-                    arg_str += f": {ast.unparse(arg.annotation)}"
-                if i < len(node.args.kw_defaults) and node.args.kw_defaults[i]:
-                    try:
-                        arg_str += f" = {ast.unparse(node.args.kw_defaults[i])}"
-                    except Exception:
-                        arg_str += " = ..."
-                args_parts.append(arg_str)
-
-            # **kwargs
-            if node.args.kwarg:
-                kwarg = f"**{node.args.kwarg.arg}"
-                if node.args.kwarg.annotation:
-                    kwarg += f": {ast.unparse(node.args.kwarg.annotation)}"
-                args_parts.append(kwarg)
-
-            # Construire la signature
-            prefix = "async def" if isinstance(node, ast.AsyncFunctionDef) else "def"
-            sig = f"{prefix} {node.name}({', '.join(args_parts)})"
-            if node.returns:
-                sig += f" -> {ast.unparse(node.returns)}"
-            return sig
-        except Exception as e:
-            logger.debug(f"Could not build signature for {node.name}: {e}")
-            return f"def {node.name}(...)"
+        self._ast_cache[key] = (content_hash, tree)
+        self._ast_cache.move_to_end(key)
+        if len(self._ast_cache) > PYTHON_AST_CACHE_SIZE:
+            self._ast_cache.popitem(last=False)
+        return tree
 
 
 # =============================================================================
@@ -1697,15 +3340,22 @@ class CodeIndexer:
 __all__ = [
     # Classes
     "CodeIndexer",
+    "CtagsDaemon",
     "IndexerConfig",
     "IndexResult",
+    "FileAnalysis",
     # Functions
     "run_ctags",
+    "run_ctags_batch",
     "parse_ctags_output",
     "ctags_to_symbols",
     "count_lines",
     "calculate_complexity",
     "extract_includes",
     "extract_calls",
+    "extract_python_symbols",
+    "analyze_file",
     "check_ctags_available",
+    "compute_content_hash",
+    "hash_file",
 ]
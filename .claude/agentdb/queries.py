@@ -36,7 +36,9 @@ Usage:
 from __future__ import annotations
 
 import logging
+import threading
 import time
+import weakref
 from functools import wraps
 from typing import Any, Optional
 
@@ -81,28 +83,28 @@ def _timed_query(func):
 # SQL TEMPLATES
 # =============================================================================
 
-# Requête récursive pour trouver les appelants
+# Requête récursive pour trouver les appelants.
+# Le cas de base (depth 0) est le symbole cible lui-même : sa résolution et
+# la traversée se font en une seule instruction SQL.
 SQL_GET_CALLERS = """
 WITH RECURSIVE callers AS (
-    -- Cas de base : appelants directs
+    -- Cas de base : le symbole cible
     SELECT
         s.id,
         s.name,
         s.kind,
         f.path as file_path,
         f.is_critical,
-        r.location_line,
-        r.is_direct,
-        1 as depth
+        NULL as location_line,
+        NULL as is_direct,
+        0 as depth
     FROM symbols s
-    JOIN relations r ON r.source_id = s.id
     JOIN files f ON s.file_id = f.id
-    WHERE r.target_id = :symbol_id
-    AND r.relation_type = 'calls'
+    WHERE s.id = :symbol_id
 
     UNION ALL
 
-    -- Cas récursif : appelants des appelants
+    -- Cas récursif : appelants (directs au niveau 1, puis leurs appelants)
     SELECT
         s.id,
         s.name,
@@ -124,7 +126,7 @@ FROM callers
 ORDER BY depth, name;
 """
 
-# Requête récursive pour trouver les appelés
+# Requête récursive pour trouver les appelés (depth 0 = symbole source)
 SQL_GET_CALLEES = """
 WITH RECURSIVE callees AS (
     SELECT
@@ -133,13 +135,11 @@ WITH RECURSIVE callees AS (
         s.kind,
         f.path as file_path,
         f.is_critical,
-        r.location_line,
-        1 as depth
+        NULL as location_line,
+        0 as depth
     FROM symbols s
-    JOIN relations r ON r.target_id = s.id
     JOIN files f ON s.file_id = f.id
-    WHERE r.source_id = :symbol_id
-    AND r.relation_type = 'calls'
+    WHERE s.id = :symbol_id
 
     UNION ALL
 
@@ -214,6 +214,34 @@ AND r.relation_type = 'calls'
 AND f2.id != f1.id;
 """
 
+# Toutes les arêtes d'appel inter-fichiers (graphe inverse pour l'impact transitif)
+SQL_ALL_FILE_CALL_EDGES = """
+SELECT DISTINCT
+    f1.path as target_path,
+    f2.id,
+    f2.path,
+    f2.is_critical,
+    s2.name as symbol_name,
+    s1.name as called_symbol,
+    r.location_line,
+    'calls' as reason
+FROM relations r
+JOIN symbols s1 ON r.target_id = s1.id
+JOIN files f1 ON s1.file_id = f1.id
+JOIN symbols s2 ON r.source_id = s2.id
+JOIN files f2 ON s2.file_id = f2.id
+WHERE r.relation_type = 'calls'
+AND f2.id != f1.id;
+"""
+
+# Empreinte de l'index : change à chaque (ré)indexation ou ajout de relation
+SQL_CALL_GRAPH_STAMP = """
+SELECT
+    (SELECT MAX(indexed_at) FROM files) as last_indexed,
+    (SELECT MAX(id) FROM relations) as last_relation,
+    (SELECT COUNT(*) FROM files) as file_count;
+"""
+
 # Requête récursive pour l'arbre d'includes
 SQL_INCLUDE_TREE = """
 WITH RECURSIVE include_tree AS (
@@ -289,6 +317,60 @@ WHERE s.id = :symbol_id;
 """
 
 
+# =============================================================================
+# REVERSE CALL GRAPH CACHE
+# =============================================================================
+
+class _ReverseCallGraph:
+    """
+    Index inverse des appels entre fichiers : target_path -> appelants.
+
+    Chargé paresseusement en une seule requête, puis conservé en mémoire
+    tant que l'empreinte de l'index (dernier indexed_at, dernière relation,
+    nombre de fichiers) ne change pas. Évite une jointure par fichier lors
+    du calcul de l'impact transitif.
+    """
+
+    def __init__(self) -> None:
+        self._callers: dict[str, list[dict[str, Any]]] = {}
+        self._stamp: Optional[tuple] = None
+        self._lock = threading.Lock()
+
+    def load(self, db: Database) -> dict[str, list[dict[str, Any]]]:
+        """
+        Retourne le graphe {target_path: [lignes d'appel]}, rechargé
+        uniquement si l'index a changé depuis le dernier chargement.
+        """
+        row = db.fetch_one(SQL_CALL_GRAPH_STAMP) or {}
+        stamp = (row.get("last_indexed"), row.get("last_relation"), row.get("file_count"))
+
+        with self._lock:
+            if stamp != self._stamp:
+                callers: dict[str, list[dict[str, Any]]] = {}
+                for r in db.fetch_iter(SQL_ALL_FILE_CALL_EDGES):
+                    callers.setdefault(r["target_path"], []).append(r)
+
+                self._callers = callers
+                self._stamp = stamp
+                logger.debug(f"Reverse call graph loaded: {len(callers)} target files")
+
+            return self._callers
+
+
+# Un graphe par instance de Database (libéré avec elle)
+_reverse_call_graphs: "weakref.WeakKeyDictionary[Database, _ReverseCallGraph]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_reverse_call_graph(db: Database) -> _ReverseCallGraph:
+    """Retourne le graphe inverse associé à une connexion."""
+    graph = _reverse_call_graphs.get(db)
+    if graph is None:
+        graph = _reverse_call_graphs.setdefault(db, _ReverseCallGraph())
+    return graph
+
+
 # =============================================================================
 # MAIN FUNCTIONS
 # =============================================================================
@@ -347,20 +429,19 @@ def get_symbol_callers(
     if max_depth < 1 or max_depth > 10:
         raise ValueError(f"max_depth must be between 1 and 10, got {max_depth}")
 
-    # Récupérer le symbole cible
-    symbol_row = db.fetch_one(SQL_GET_SYMBOL_BY_ID, {"symbol_id": symbol_id})
-    if not symbol_row:
+    # Une seule requête : la première ligne (depth 0) est le symbole cible
+    rows = db.fetch_all(SQL_GET_CALLERS, {"symbol_id": symbol_id, "max_depth": max_depth})
+    if not rows or rows[0]["depth"] != 0:
         raise ValueError(f"Symbol with id {symbol_id} not found")
 
+    symbol_row = rows[0]
     symbol_info = {
         "id": symbol_row["id"],
         "name": symbol_row["name"],
         "file": symbol_row["file_path"],
         "kind": symbol_row["kind"],
     }
-
-    # Exécuter la requête récursive
-    rows = db.fetch_all(SQL_GET_CALLERS, {"symbol_id": symbol_id, "max_depth": max_depth})
+    rows = rows[1:]
 
     # Filtrer les appels indirects si demandé
     if not include_indirect:
@@ -452,20 +533,19 @@ def get_symbol_callees(
     if max_depth < 1 or max_depth > 10:
         raise ValueError(f"max_depth must be between 1 and 10, got {max_depth}")
 
-    # Récupérer le symbole source
-    symbol_row = db.fetch_one(SQL_GET_SYMBOL_BY_ID, {"symbol_id": symbol_id})
-    if not symbol_row:
+    # Une seule requête : la première ligne (depth 0) est le symbole source
+    rows = db.fetch_all(SQL_GET_CALLEES, {"symbol_id": symbol_id, "max_depth": max_depth})
+    if not rows or rows[0]["depth"] != 0:
         raise ValueError(f"Symbol with id {symbol_id} not found")
 
+    symbol_row = rows[0]
     symbol_info = {
         "id": symbol_row["id"],
         "name": symbol_row["name"],
         "file": symbol_row["file_path"],
         "kind": symbol_row["kind"],
     }
-
-    # Exécuter la requête récursive pour les callees
-    rows = db.fetch_all(SQL_GET_CALLEES, {"symbol_id": symbol_id, "max_depth": max_depth})
+    rows = rows[1:]
 
     # Organiser par niveau
     callees_by_level: dict[str, list[dict[str, Any]]] = {}
@@ -591,41 +671,57 @@ def get_file_impact(
 
     file_id = file_row["id"]
 
+    # Le résumé est accumulé pendant la construction des listes,
+    # sans repasser sur les éléments une fois construits
+    all_files: set[str] = set()
+    critical_count = 0
+
     # 1. Impact par includes/imports
-    include_rows = db.fetch_all(SQL_FILE_IMPACT_BY_INCLUDES, {"file_path": file_path})
-    include_impact = [
-        {
+    include_impact: list[dict[str, Any]] = []
+    for r in db.fetch_iter(SQL_FILE_IMPACT_BY_INCLUDES, {"file_path": file_path}):
+        is_critical = bool(r.get("is_critical", False))
+        include_impact.append({
             "file": r["path"],
             "reason": f"includes {file_path}",
             "line": r["line_number"],
-            "is_critical": bool(r.get("is_critical", False)),
-        }
-        for r in include_rows
-    ]
+            "is_critical": is_critical,
+        })
+        all_files.add(r["path"])
+        critical_count += is_critical
 
     # 2. Impact par calls (direct)
-    call_rows = db.fetch_all(SQL_FILE_IMPACT_BY_CALLS, {"file_path": file_path})
+    call_rows = db.fetch_iter(SQL_FILE_IMPACT_BY_CALLS, {"file_path": file_path})
 
-    # Grouper par fichier et agréger les symboles
+    # Grouper par fichier et agréger les symboles (dict ordonné = set ordonné)
     direct_by_file: dict[str, dict[str, Any]] = {}
+    symbols_by_file: dict[str, dict[str, None]] = {}
     for r in call_rows:
         path = r["path"]
         if path not in direct_by_file:
+            is_critical = bool(r.get("is_critical", False))
             direct_by_file[path] = {
                 "file": path,
                 "reason": f"calls {r['called_symbol']}",
                 "symbols": [],
-                "is_critical": bool(r.get("is_critical", False)),
+                "is_critical": is_critical,
             }
-        if r["symbol_name"] not in direct_by_file[path]["symbols"]:
-            direct_by_file[path]["symbols"].append(r["symbol_name"])
+            symbols_by_file[path] = {}
+            all_files.add(path)
+            critical_count += is_critical
+        symbols_by_file[path][r["symbol_name"]] = None
+
+    for path, item in direct_by_file.items():
+        item["symbols"] = list(symbols_by_file[path])
 
     direct_impact = list(direct_by_file.values())
 
     # 3. Impact transitif (si demandé)
     transitive_impact: list[dict[str, Any]] = []
+    max_depth_reached = 1
     if include_transitive and max_depth > 1:
         # Pour chaque fichier directement impacté, chercher ses appelants
+        # dans le graphe inverse en mémoire (pas de requête par fichier)
+        callers_by_file = _get_reverse_call_graph(db).load(db)
         processed_files = {file_path}
         files_to_process = [d["file"] for d in direct_impact]
 
@@ -637,35 +733,26 @@ def get_file_impact(
                 processed_files.add(f)
 
                 # Trouver les appelants des symboles de ce fichier
-                trans_rows = db.fetch_all(SQL_FILE_IMPACT_BY_CALLS, {"file_path": f})
+                trans_rows = callers_by_file.get(f, ())
                 for r in trans_rows:
                     path = r["path"]
                     if path not in processed_files:
+                        is_critical = bool(r.get("is_critical", False))
                         transitive_impact.append({
                             "file": path,
                             "reason": f"calls {r['called_symbol']} in {f}",
                             "depth": depth,
-                            "is_critical": bool(r.get("is_critical", False)),
+                            "is_critical": is_critical,
                         })
                         next_files.append(path)
+                        all_files.add(path)
+                        critical_count += is_critical
+                        max_depth_reached = depth
 
             files_to_process = list(set(next_files))
             if not files_to_process:
                 break
 
-    # Calculer le résumé
-    all_files = set()
-    critical_count = 0
-
-    for item in direct_impact + transitive_impact + include_impact:
-        all_files.add(item["file"])
-        if item.get("is_critical"):
-            critical_count += 1
-
-    max_depth_reached = 1
-    if transitive_impact:
-        max_depth_reached = max(t.get("depth", 1) for t in transitive_impact)
-
     return {
         "file": file_path,
         "direct_impact": direct_impact,
@@ -398,6 +398,7 @@ CREATE INDEX IF NOT EXISTS idx_files_module ON files(module);
 CREATE INDEX IF NOT EXISTS idx_files_is_critical ON files(is_critical);
 CREATE INDEX IF NOT EXISTS idx_files_language ON files(language);
 CREATE INDEX IF NOT EXISTS idx_files_path_pattern ON files(path);
+CREATE INDEX IF NOT EXISTS idx_files_filename ON files(filename);
 
 -- Index sur symbols
 CREATE INDEX IF NOT EXISTS idx_symbols_file_id ON symbols(file_id);
@@ -0,0 +1,36 @@
+-- ============================================================================
+-- AGENTDB - RECHERCHE PLEIN TEXTE (OPTIONNEL)
+-- Description: Index trigram FTS5 sur les noms de symboles
+-- ============================================================================
+--
+-- Exécuté après schema.sql. Nécessite SQLite >= 3.34 (tokenizer trigram) :
+-- en cas d'échec la base reste utilisable et search_symbols se rabat sur
+-- un LIKE classique sur la table symbols.
+--
+-- Le tokenizer trigram permet à SQLite d'accélérer `name LIKE '%abc%'`
+-- via l'index inversé (au moins 3 caractères littéraux consécutifs).
+
+-- Table FTS5 à contenu externe (pas de duplication des données)
+CREATE VIRTUAL TABLE IF NOT EXISTS symbols_fts USING fts5(
+    name,
+    content='symbols',
+    content_rowid='id',
+    tokenize='trigram'
+);
+
+-- Synchronisation avec la table symbols
+CREATE TRIGGER IF NOT EXISTS symbols_fts_ai AFTER INSERT ON symbols BEGIN
+    INSERT INTO symbols_fts(rowid, name) VALUES (new.id, new.name);
+END;
+
+CREATE TRIGGER IF NOT EXISTS symbols_fts_ad AFTER DELETE ON symbols BEGIN
+    INSERT INTO symbols_fts(symbols_fts, rowid, name) VALUES ('delete', old.id, old.name);
+END;
+
+CREATE TRIGGER IF NOT EXISTS symbols_fts_au AFTER UPDATE OF name ON symbols BEGIN
+    INSERT INTO symbols_fts(symbols_fts, rowid, name) VALUES ('delete', old.id, old.name);
+    INSERT INTO symbols_fts(rowid, name) VALUES (new.id, new.name);
+END;
+
+-- Indexer les symboles déjà présents (base existante)
+INSERT INTO symbols_fts(symbols_fts) VALUES ('rebuild');
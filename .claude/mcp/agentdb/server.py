@@ -36,11 +36,20 @@ import json
 import logging
 import os
 import sys
+import threading
+import time
 import traceback
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Callable, Optional, Union
 
+try:
+    import orjson
+except ImportError:  # orjson est optionnel, fallback sur json
+    orjson = None
+
 # Ajouter le path pour les imports locaux
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
@@ -68,6 +77,32 @@ METHOD_NOT_FOUND = -32601
 INVALID_PARAMS = -32602
 INTERNAL_ERROR = -32603
 
+
+def _encode_message(message: dict[str, Any]) -> bytes:
+    """
+    Sérialise un message JSON-RPC en une ligne UTF-8 prête à écrire.
+
+    Utilise orjson si disponible (encodage direct en bytes, nettement plus
+    rapide sur les gros résultats d'outils), sinon json de la stdlib.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(message) + b"\n"
+        except TypeError:
+            # Types non supportés par orjson (clés non-str, entiers > 64 bits)
+            pass
+    return (json.dumps(message, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def _format_tool_result(result: Any) -> str:
+    """Formate le résultat d'un outil en JSON indenté (contenu texte MCP)."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(result, option=orjson.OPT_INDENT_2).decode("utf-8")
+        except TypeError:
+            pass
+    return json.dumps(result, indent=2, ensure_ascii=False)
+
 # Erreurs spécifiques AgentDB
 TOOL_NOT_FOUND = -32000
 DATABASE_ERROR = -32001
@@ -604,6 +639,76 @@ Exemple:
 ]
 
 
+# =============================================================================
+# RESULT CACHE
+# =============================================================================
+
+# Paramètres du cache des résultats d'outils
+TOOL_CACHE_MAX_ENTRIES = 256
+TOOL_CACHE_TTL_SECONDS = 60.0
+
+# Threads dédiés aux requêtes SQLite des outils (hors boucle asyncio),
+# chacun avec sa propre connexion en lecture seule (lecteurs WAL concurrents)
+DB_POOL_MAX_WORKERS = 4
+
+
+class ToolResultCache:
+    """
+    Cache LRU borné avec TTL pour les résultats des outils MCP.
+
+    Les agents rappellent souvent le même outil avec les mêmes arguments
+    (get_file_context sur le fichier en cours, etc.). Les résultats sont
+    stockés déjà sérialisés, clé = (outil, arguments canoniques).
+
+    L'invalidation se fait par TTL, et globalement via `PRAGMA data_version`
+    qui change dès qu'une autre connexion (bootstrap, indexeur incrémental)
+    a commité dans la base.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = TOOL_CACHE_MAX_ENTRIES,
+        ttl: float = TOOL_CACHE_TTL_SECONDS,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._data_version: Any = None
+
+    @staticmethod
+    def make_key(tool_name: str, arguments: dict[str, Any]) -> str:
+        """Construit une clé stable à partir du nom d'outil et des arguments."""
+        return tool_name + "\x00" + json.dumps(arguments, sort_keys=True, default=str)
+
+    def check_version(self, data_version: Any) -> None:
+        """Vide le cache si la base a été modifiée depuis le dernier appel."""
+        if data_version != self._data_version:
+            self._entries.clear()
+            self._data_version = data_version
+
+    def get(self, key: str) -> Optional[str]:
+        """Retourne le résultat en cache ou None (absent ou expiré)."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, value = entry
+        if time.monotonic() - stored_at > self.ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: str, value: str) -> None:
+        """Stocke un résultat, en évinçant l'entrée la moins récente si plein."""
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
 # =============================================================================
 # MCP SERVER CLASS
 # =============================================================================
@@ -650,6 +755,21 @@ class AgentDBServer:
         # Mapping des outils vers leurs handlers
         self.tool_handlers: dict[str, Callable] = {}
 
+        # Cache des résultats d'outils (tous les outils sont en lecture seule)
+        self.result_cache = ToolResultCache()
+
+        # Pool pour exécuter les outils (SQLite bloquant) hors de la boucle
+        self._db_pool: Optional[ThreadPoolExecutor] = None
+
+        # Connexion propre à chaque thread du pool (self.db ne sert plus
+        # qu'à PRAGMA data_version depuis la boucle)
+        self._worker_local = threading.local()
+        self._worker_dbs: list[Any] = []
+        self._worker_dbs_lock = threading.Lock()
+
+        # Appels identiques en cours : les suivants attendent le même résultat
+        self._inflight: dict[tuple[str, Any], asyncio.Future] = {}
+
         logger.debug(f"AgentDBServer created with db_path={self.db_path}")
 
     def initialize(self) -> None:
@@ -687,9 +807,44 @@ class AgentDBServer:
         # Enregistrer les handlers
         self._register_handlers()
 
+        self._db_pool = ThreadPoolExecutor(
+            max_workers=DB_POOL_MAX_WORKERS,
+            thread_name_prefix="agentdb",
+            initializer=self._open_worker_db,
+        )
+
         self._initialized = True
         logger.info("AgentDB server initialized successfully")
 
+    def _open_worker_db(self) -> None:
+        """
+        Ouvre la connexion en lecture seule du thread courant du pool et
+        préchauffe ses index en mémoire (un jeu par connexion).
+
+        Une base en mémoire n'est pas partageable entre connexions : les
+        threads utilisent alors self.db.
+        """
+        if str(self.db_path) == ":memory:":
+            return
+        from agentdb.db import DatabaseManager
+        try:
+            db = DatabaseManager(self.db_path)
+            db.connect()
+            db.execute("PRAGMA query_only = ON")
+        except Exception as e:
+            logger.warning(f"Worker connection failed, using shared connection: {e}")
+            return
+        self._worker_local.db = db
+        with self._worker_dbs_lock:
+            self._worker_dbs.append(db)
+
+        from . import tools
+        tools.warm_caches(db)
+
+    def _worker_db(self) -> Any:
+        """Connexion du thread courant du pool (self.db à défaut)."""
+        return getattr(self._worker_local, "db", None) or self.db
+
     def _register_handlers(self) -> None:
         """Enregistre les handlers pour chaque outil."""
         self.tool_handlers = {
@@ -709,11 +864,26 @@ class AgentDBServer:
     # TOOL HANDLERS
     # =========================================================================
 
+    async def _run_tool(self, func: Callable, **kwargs: Any) -> dict[str, Any]:
+        """
+        Exécute un outil (appels SQLite synchrones) dans le pool de threads.
+
+        La boucle asyncio reste libre de lire et traiter d'autres requêtes
+        pendant la requête SQL. Chaque thread du pool interroge la base
+        avec sa propre connexion : les outils s'exécutent en parallèle.
+        """
+        if self._db_pool is None:
+            return func(self.db, **kwargs)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._db_pool, lambda: func(self._worker_db(), **kwargs)
+        )
+
     async def _handle_get_file_context(self, arguments: dict[str, Any]) -> dict[str, Any]:
         """Handler pour get_file_context."""
         from . import tools
-        return tools.get_file_context(
-            self.db,
+        return await self._run_tool(
+            tools.get_file_context,
             path=arguments["path"],
             include_symbols=arguments.get("include_symbols", True),
             include_dependencies=arguments.get("include_dependencies", True),
@@ -724,8 +894,8 @@ class AgentDBServer:
     async def _handle_get_symbol_callers(self, arguments: dict[str, Any]) -> dict[str, Any]:
         """Handler pour get_symbol_callers."""
         from . import tools
-        return tools.get_symbol_callers(
-            self.db,
+        return await self._run_tool(
+            tools.get_symbol_callers,
             symbol_name=arguments["symbol_name"],
             file_path=arguments.get("file_path"),
             max_depth=arguments.get("max_depth", 3),
@@ -735,8 +905,8 @@ class AgentDBServer:
     async def _handle_get_symbol_callees(self, arguments: dict[str, Any]) -> dict[str, Any]:
         """Handler pour get_symbol_callees."""
         from . import tools
-        return tools.get_symbol_callees(
-            self.db,
+        return await self._run_tool(
+            tools.get_symbol_callees,
             symbol_name=arguments["symbol_name"],
             file_path=arguments.get("file_path"),
             max_depth=arguments.get("max_depth", 2),
@@ -745,8 +915,8 @@ class AgentDBServer:
     async def _handle_get_file_impact(self, arguments: dict[str, Any]) -> dict[str, Any]:
         """Handler pour get_file_impact."""
         from . import tools
-        return tools.get_file_impact(
-            self.db,
+        return await self._run_tool(
+            tools.get_file_impact,
             path=arguments["path"],
             include_transitive=arguments.get("include_transitive", True),
             max_depth=arguments.get("max_depth", 3),
@@ -755,8 +925,8 @@ class AgentDBServer:
     async def _handle_get_error_history(self, arguments: dict[str, Any]) -> dict[str, Any]:
         """Handler pour get_error_history."""
         from . import tools
-        return tools.get_error_history(
-            self.db,
+        return await self._run_tool(
+            tools.get_error_history,
             file_path=arguments.get("file_path"),
             symbol_name=arguments.get("symbol_name"),
             module=arguments.get("module"),
@@ -769,8 +939,8 @@ class AgentDBServer:
     async def _handle_get_patterns(self, arguments: dict[str, Any]) -> dict[str, Any]:
         """Handler pour get_patterns."""
         from . import tools
-        return tools.get_patterns(
-            self.db,
+        return await self._run_tool(
+            tools.get_patterns,
             file_path=arguments.get("file_path"),
             module=arguments.get("module"),
             category=arguments.get("category"),
@@ -780,8 +950,8 @@ class AgentDBServer:
     async def _handle_get_architecture_decisions(self, arguments: dict[str, Any]) -> dict[str, Any]:
         """Handler pour get_architecture_decisions."""
         from . import tools
-        return tools.get_architecture_decisions(
-            self.db,
+        return await self._run_tool(
+            tools.get_architecture_decisions,
             module=arguments.get("module"),
             file_path=arguments.get("file_path"),
             status=arguments.get("status", "accepted"),
@@ -791,8 +961,8 @@ class AgentDBServer:
     async def _handle_search_symbols(self, arguments: dict[str, Any]) -> dict[str, Any]:
         """Handler pour search_symbols."""
         from . import tools
-        return tools.search_symbols(
-            self.db,
+        return await self._run_tool(
+            tools.search_symbols,
             query=arguments["query"],
             kind=arguments.get("kind"),
             module=arguments.get("module"),
@@ -803,8 +973,8 @@ class AgentDBServer:
     async def _handle_get_file_metrics(self, arguments: dict[str, Any]) -> dict[str, Any]:
         """Handler pour get_file_metrics."""
         from . import tools
-        return tools.get_file_metrics(
-            self.db,
+        return await self._run_tool(
+            tools.get_file_metrics,
             path=arguments["path"],
             include_per_function=arguments.get("include_per_function", False),
         )
@@ -812,8 +982,8 @@ class AgentDBServer:
     async def _handle_get_module_summary(self, arguments: dict[str, Any]) -> dict[str, Any]:
         """Handler pour get_module_summary."""
         from . import tools
-        return tools.get_module_summary(
-            self.db,
+        return await self._run_tool(
+            tools.get_module_summary,
             module=arguments["module"],
             include_private=arguments.get("include_private", False),
         )
@@ -888,23 +1058,79 @@ class AgentDBServer:
         if tool_name not in self.tool_handlers:
             raise ValueError(f"Unknown tool: {tool_name}")
 
-        handler = self.tool_handlers[tool_name]
-        result = await handler(arguments)
+        cache_key = ToolResultCache.make_key(tool_name, arguments)
+        data_version = self._get_data_version()
+        self.result_cache.check_version(data_version)
+
+        text = self.result_cache.get(cache_key)
+        if text is not None:
+            logger.debug(f"Cache hit for {tool_name}")
+        elif (cache_key, data_version) in self._inflight:
+            # Rafale d'appels identiques : un seul calcul pour tous
+            logger.debug(f"Joining in-flight call for {tool_name}")
+            text = await asyncio.shield(self._inflight[(cache_key, data_version)])
+        else:
+            text = await self._call_tool_once(tool_name, arguments, (cache_key, data_version))
 
         return {
             "content": [
                 {
                     "type": "text",
-                    "text": json.dumps(result, indent=2, ensure_ascii=False)
+                    "text": text
                 }
             ]
         }
 
+    async def _call_tool_once(
+        self,
+        tool_name: str,
+        arguments: dict[str, Any],
+        inflight_key: tuple[str, Any]
+    ) -> str:
+        """Exécute un outil en publiant son résultat aux appels identiques concurrents."""
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[inflight_key] = future
+        try:
+            result = await self.tool_handlers[tool_name](arguments)
+            text = _format_tool_result(result)
+            # Ne pas mettre en cache les erreurs (fichier pas encore indexé...)
+            if not (isinstance(result, dict) and "error" in result):
+                self.result_cache.put(inflight_key[0], text)
+            future.set_result(text)
+            return text
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Marquer comme lue s'il n'y a aucun autre appelant
+            raise
+        finally:
+            self._inflight.pop(inflight_key, None)
+
+    def _get_data_version(self) -> Any:
+        """
+        Retourne PRAGMA data_version (change à chaque commit externe).
+
+        Lu sur self.db, que les outils n'utilisent pas (connexions propres
+        aux threads du pool) : l'appel ne bloque pas la boucle derrière une
+        requête en cours.
+        """
+        try:
+            return self.db.fetch_scalar("PRAGMA data_version")
+        except Exception:
+            # Sans version fiable, forcer l'invalidation à chaque appel
+            return object()
+
     async def _handle_shutdown(self, params: dict[str, Any]) -> dict[str, Any]:
         """Handle shutdown request."""
-        self.shutdown()
+        await self._shutdown_off_loop()
         return {}
 
+    async def _shutdown_off_loop(self) -> None:
+        """Appelle shutdown() dans un thread : l'attente du pool ne bloque pas la boucle."""
+        await asyncio.get_running_loop().run_in_executor(None, self.shutdown)
+
     def _success_response(self, request_id: Any, result: Any) -> dict[str, Any]:
         """Build a success response."""
         return {
@@ -954,6 +1180,11 @@ class AgentDBServer:
 
         logger.info("Server ready, waiting for requests...")
 
+        # Requêtes en cours : chacune est une tâche, les réponses JSON-RPC
+        # sont identifiées par leur id et peuvent sortir dans le désordre
+        pending: set[asyncio.Task] = set()
+        write_lock = asyncio.Lock()
+
         try:
             while True:
                 # Lire une ligne (requête JSON-RPC)
@@ -968,20 +1199,13 @@ class AgentDBServer:
 
                 logger.debug(f"Received: {line[:200]}...")
 
-                try:
-                    request = json.loads(line)
-                    response = await self.handle_request(request)
-
-                    if response:  # Certaines notifications n'ont pas de réponse
-                        response_str = json.dumps(response, ensure_ascii=False) + "\n"
-                        writer.write(response_str.encode("utf-8"))
-                        await writer.drain()
-                        logger.debug(f"Sent: {response_str[:200]}...")
+                task = asyncio.create_task(self._process_line(line, writer, write_lock))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
 
-                except json.JSONDecodeError as e:
-                    error_response = self._error_response(None, PARSE_ERROR, f"Invalid JSON: {e}")
-                    writer.write((json.dumps(error_response) + "\n").encode("utf-8"))
-                    await writer.drain()
+            # Terminer les requêtes encore en cours avant de fermer
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
 
         except KeyboardInterrupt:
             logger.info("Server stopped by user")
@@ -989,11 +1213,45 @@ class AgentDBServer:
             logger.error(f"Server error: {e}", exc_info=True)
             raise
         finally:
-            self.shutdown()
+            await self._shutdown_off_loop()
+
+    async def _process_line(
+        self,
+        line: str,
+        writer: asyncio.StreamWriter,
+        write_lock: asyncio.Lock,
+    ) -> None:
+        """Traite une ligne JSON-RPC et écrit la réponse éventuelle."""
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as e:
+            response = self._error_response(None, PARSE_ERROR, f"Invalid JSON: {e}")
+        else:
+            response = await self.handle_request(request)
+
+        if not response:  # Certaines notifications n'ont pas de réponse
+            return
+
+        response_bytes = _encode_message(response)
+        async with write_lock:
+            writer.write(response_bytes)
+            await writer.drain()
+        logger.debug(f"Sent: {response_bytes[:200]!r}...")
 
     def shutdown(self) -> None:
         """Arrête proprement le serveur."""
         logger.info("Shutting down AgentDB server...")
+        if self._db_pool is not None:
+            self._db_pool.shutdown(wait=True)
+            self._db_pool = None
+        # Threads du pool terminés : leurs connexions peuvent être fermées
+        with self._worker_dbs_lock:
+            worker_dbs, self._worker_dbs = self._worker_dbs, []
+        for db in worker_dbs:
+            try:
+                db.close()
+            except Exception as e:
+                logger.error(f"Error closing worker connection: {e}")
         if self.db:
             try:
                 self.db.close()
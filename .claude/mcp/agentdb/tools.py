@@ -19,6 +19,9 @@ from __future__ import annotations
 
 import fnmatch
 import logging
+import re
+import threading
+import weakref
 from datetime import datetime, timedelta
 from typing import Any, Optional
 
@@ -181,8 +184,6 @@ def _get_file_contributors(db, file_id: int) -> list[str]:
 
 def _get_file_dependencies(db, file_obj) -> dict[str, Any]:
     """Extrait les dépendances d'un fichier."""
-    from agentdb.crud import FileRelationRepository, SymbolRepository, RelationRepository
-
     deps: dict[str, Any] = {
         "includes": [],
         "included_by": [],
@@ -191,56 +192,53 @@ def _get_file_dependencies(db, file_obj) -> dict[str, Any]:
     }
 
     try:
-        file_rel_repo = FileRelationRepository(db)
-
-        # Fichiers inclus par ce fichier
-        includes = file_rel_repo.get_includes(file_obj.id)
-        for rel in includes:
-            target_file = db.fetch_one(
-                "SELECT path FROM files WHERE id = ?",
-                (rel.target_file_id,),
-            )
-            if target_file:
-                deps["includes"].append(target_file["path"])
-
-        # Fichiers qui incluent ce fichier
-        included_by = file_rel_repo.get_included_by(file_obj.id)
-        for rel in included_by:
-            source_file = db.fetch_one(
-                "SELECT path FROM files WHERE id = ?",
-                (rel.source_file_id,),
-            )
-            if source_file:
-                deps["included_by"].append(source_file["path"])
-
-        # Fonctions appelées par les symboles de ce fichier
-        symbols_repo = SymbolRepository(db)
-        rel_repo = RelationRepository(db)
-        symbols = symbols_repo.get_by_file(file_obj.id)
+        # Includes dans les deux sens en une seule requête : la jointure
+        # résout les chemins directement (pas de lookup par relation)
+        rows = db.fetch_all(
+            """
+            SELECT
+                CASE WHEN fr.source_file_id = ? THEN 'includes' ELSE 'included_by' END AS direction,
+                f.path
+            FROM file_relations fr
+            JOIN files f ON f.id = CASE
+                WHEN fr.source_file_id = ? THEN fr.target_file_id
+                ELSE fr.source_file_id
+            END
+            WHERE fr.relation_type = 'includes'
+              AND (fr.source_file_id = ? OR fr.target_file_id = ?)
+            ORDER BY fr.id
+            """,
+            (file_obj.id, file_obj.id, file_obj.id, file_obj.id),
+        )
+        for row in rows:
+            deps[row["direction"]].append(row["path"])
+
+        # Appels sortants et entrants de tous les symboles du fichier en une
+        # seule requête (au lieu de 2 requêtes + 1 lookup de nom par relation)
+        rows = db.fetch_all(
+            """
+            SELECT 'calls_to' AS direction, t.name
+            FROM relations r
+            JOIN symbols s ON s.id = r.source_id
+            JOIN symbols t ON t.id = r.target_id
+            WHERE s.file_id = ? AND r.relation_type = 'calls'
+            UNION
+            SELECT 'called_by' AS direction, s.name
+            FROM relations r
+            JOIN symbols t ON t.id = r.target_id
+            JOIN symbols s ON s.id = r.source_id
+            WHERE t.file_id = ? AND r.relation_type = 'calls'
+            """,
+            (file_obj.id, file_obj.id),
+        )
 
         called_symbols = set()
         caller_symbols = set()
-
-        for sym in symbols:
-            # Callees: symboles appelés par ce symbole
-            callees = rel_repo.get_callees(sym.id)
-            for rel in callees:
-                target = db.fetch_one(
-                    "SELECT name FROM symbols WHERE id = ?",
-                    (rel.target_id,),
-                )
-                if target:
-                    called_symbols.add(target["name"])
-
-            # Callers: symboles qui appellent ce symbole
-            callers = rel_repo.get_callers(sym.id)
-            for rel in callers:
-                source = db.fetch_one(
-                    "SELECT name FROM symbols WHERE id = ?",
-                    (rel.source_id,),
-                )
-                if source:
-                    caller_symbols.add(source["name"])
+        for row in rows:
+            if row["direction"] == "calls_to":
+                called_symbols.add(row["name"])
+            else:
+                caller_symbols.add(row["name"])
 
         deps["calls_to"] = sorted(called_symbols)
         deps["called_by"] = sorted(caller_symbols)
@@ -591,11 +589,18 @@ def get_error_history(
     sql = " ".join(query_parts + from_parts + where_parts + [order_by, limit_clause])
 
     try:
-        rows = db.fetch_all(sql, tuple(params))
+        errors: list[dict[str, Any]] = []
+        by_type: dict[str, int] = {}
+        by_severity: dict[str, int] = {}
+        regression_count = 0
 
-        # Format exact de la spec pour errors
-        errors = [
-            {
+        # Lecture par batch : formatage et statistiques en un seul passage,
+        # sans matérialiser la liste complète des lignes brutes
+        for r in db.fetch_iter(sql, tuple(params), batch_size=100):
+            is_regression = bool(r.get("is_regression", False))
+
+            # Format exact de la spec pour errors
+            errors.append({
                 "id": r.get("id"),
                 "type": r.get("error_type"),
                 "severity": r.get("severity"),
@@ -605,25 +610,17 @@ def get_error_history(
                 "resolved_at": r.get("resolved_at"),
                 "resolution": r.get("resolution"),
                 "prevention": r.get("prevention"),
-                "is_regression": bool(r.get("is_regression", False)),
+                "is_regression": is_regression,
                 "jira_ticket": r.get("jira_ticket") or r.get("ticket_id"),
-            }
-            for r in rows
-        ]
-
-        # Calculer les statistiques
-        by_type: dict[str, int] = {}
-        by_severity: dict[str, int] = {}
-        regression_count = 0
+            })
 
-        for e in errors:
-            et = e.get("type") or "unknown"
+            et = r.get("error_type") or "unknown"
             by_type[et] = by_type.get(et, 0) + 1
 
-            es = e.get("severity") or "unknown"
+            es = r.get("severity") or "unknown"
             by_severity[es] = by_severity.get(es, 0) + 1
 
-            if e.get("is_regression"):
+            if is_regression:
                 regression_count += 1
 
         total_errors = len(errors)
@@ -883,33 +880,30 @@ def search_symbols(
     # Convertir le pattern glob en LIKE SQL
     sql_pattern = query.replace("*", "%").replace("?", "_")
 
-    # D'abord compter le total sans limite
-    count_sql = """
-        SELECT COUNT(*) as total
-        FROM symbols s
-        JOIN files f ON s.file_id = f.id
-        WHERE s.name LIKE ?
-    """
-    count_params: list[Any] = [sql_pattern]
-
-    if kind:
-        count_sql += " AND s.kind = ?"
-        count_params.append(kind)
-
-    if module:
-        count_sql += " AND f.module = ?"
-        count_params.append(module)
-
-    if file_path:
-        count_sql += " AND f.path = ?"
-        count_params.append(file_path)
+    # Aucun nom indexé ne peut correspondre : pas de requête SQL
+    if not _get_trigram_filter(db).may_match(db, sql_pattern):
+        return {
+            "query": query,
+            "results": [],
+            "total": 0,
+            "returned": 0,
+        }
 
-    # Requête principale avec limite
-    sql = """
-        SELECT s.*, f.path as file_path, f.module
+    # Filtre sur le nom : via l'index trigram FTS5 si disponible et si le
+    # pattern contient au moins 3 caractères littéraux consécutifs (sinon
+    # l'index n'aide pas et un LIKE direct est plus rapide)
+    if _TRIGRAM_LITERAL.search(sql_pattern) and _has_symbols_fts(db):
+        name_filter = "s.id IN (SELECT rowid FROM symbols_fts WHERE name LIKE ?)"
+    else:
+        name_filter = "s.name LIKE ?"
+
+    # Requête unique : le total (avant LIMIT) est calculé par une fonction
+    # fenêtre, sans seconde requête COUNT(*) sur les mêmes filtres
+    sql = f"""
+        SELECT s.*, f.path as file_path, f.module, COUNT(*) OVER () as total_count
         FROM symbols s
         JOIN files f ON s.file_id = f.id
-        WHERE s.name LIKE ?
+        WHERE {name_filter}
     """
     params: list[Any] = [sql_pattern]
 
@@ -929,13 +923,11 @@ def search_symbols(
     params.append(limit)
 
     try:
-        # Compter le total
-        count_row = db.fetch_one(count_sql, tuple(count_params))
-        total = count_row.get("total", 0) if count_row else 0
-
-        # Récupérer les résultats
         rows = db.fetch_all(sql, tuple(params))
 
+        # limit >= 1 (schéma de l'outil) : sans ligne, le total est 0
+        total = rows[0].get("total_count", 0) if rows else 0
+
         # Format exact de la spec PARTIE 7.2
         results = [
             {
@@ -966,6 +958,83 @@ def search_symbols(
         }
 
 
+# Au moins 3 caractères littéraux consécutifs (hors wildcards LIKE)
+_TRIGRAM_LITERAL = re.compile(r"[^%_]{3,}")
+
+
+class _SymbolTrigramFilter:
+    """
+    Ensemble des trigrammes (en minuscules) présents dans les noms de symboles.
+
+    Si un trigramme littéral du pattern n'apparaît dans aucun nom, la
+    recherche ne peut rien trouver et la requête SQL est évitée. Le filtre
+    est exact (pas de faux négatif) et borné par le nombre de trigrammes
+    distincts, pas par le nombre de symboles. Reconstruit uniquement quand
+    la base a changé (écriture locale ou d'une autre connexion).
+    """
+
+    def __init__(self) -> None:
+        self._trigrams: frozenset[str] = frozenset()
+        self._stamp: Optional[tuple] = None
+        self._lock = threading.Lock()
+
+    def may_match(self, db, sql_pattern: str) -> bool:
+        """False si aucun nom de symbole ne peut correspondre au pattern LIKE."""
+        needed = {
+            run[i:i + 3]
+            for run in _TRIGRAM_LITERAL.findall(sql_pattern.lower())
+            for i in range(len(run) - 2)
+        }
+        if not needed:
+            return True
+
+        try:
+            trigrams = self._load(db)
+        except Exception as e:
+            logger.debug(f"Symbol trigram filter unavailable: {e}")
+            return True
+        return needed <= trigrams
+
+    def _load(self, db) -> frozenset[str]:
+        row = db.fetch_one("PRAGMA data_version") or {}
+        stamp = (row.get("data_version"), db.connection.total_changes)
+
+        with self._lock:
+            if stamp != self._stamp:
+                trigrams: set[str] = set()
+                for r in db.fetch_iter("SELECT DISTINCT name FROM symbols", batch_size=1000):
+                    name = (r.get("name") or "").lower()
+                    trigrams.update(name[i:i + 3] for i in range(len(name) - 2))
+                self._trigrams = frozenset(trigrams)
+                self._stamp = stamp
+                logger.debug(f"Symbol trigram filter loaded: {len(trigrams)} trigrams")
+            return self._trigrams
+
+
+# Un filtre par instance de base (libéré avec elle)
+_trigram_filters: "weakref.WeakKeyDictionary[Any, _SymbolTrigramFilter]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_trigram_filter(db) -> _SymbolTrigramFilter:
+    """Retourne le filtre de trigrammes associé à une base."""
+    filt = _trigram_filters.get(db)
+    if filt is None:
+        filt = _trigram_filters.setdefault(db, _SymbolTrigramFilter())
+    return filt
+
+
+def _has_symbols_fts(db) -> bool:
+    """Vérifie si l'index plein texte des symboles existe (schema_fts.sql)."""
+    try:
+        return db.fetch_one(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'symbols_fts'"
+        ) is not None
+    except Exception:
+        return False
+
+
 # =============================================================================
 # OUTIL 9 : GET_FILE_METRICS
 # =============================================================================
@@ -998,10 +1067,26 @@ def get_file_metrics(
     symbols_repo = SymbolRepository(db)
     symbols = symbols_repo.get_by_file(file_obj.id)
 
-    functions_count = sum(1 for s in symbols if s.kind in ("function", "method"))
-    types_count = sum(1 for s in symbols if s.kind in ("struct", "class", "enum", "typedef", "union"))
-    macros_count = sum(1 for s in symbols if s.kind == "macro")
-    variables_count = sum(1 for s in symbols if s.kind in ("variable", "constant"))
+    # Un seul passage sur les symboles pour tous les compteurs
+    functions_count = 0
+    types_count = 0
+    macros_count = 0
+    variables_count = 0
+    documented_symbols = 0
+
+    for s in symbols:
+        kind = s.kind
+        if kind in ("function", "method"):
+            functions_count += 1
+        elif kind in ("struct", "class", "enum", "typedef", "union"):
+            types_count += 1
+        elif kind == "macro":
+            macros_count += 1
+        elif kind in ("variable", "constant"):
+            variables_count += 1
+
+        if getattr(s, 'doc_comment', None):
+            documented_symbols += 1
 
     # Calculer l'âge du fichier
     age_days = None
@@ -1016,7 +1101,6 @@ def get_file_metrics(
     contributors = _get_file_contributors(db, file_obj.id)
 
     # Calculer le score de documentation
-    documented_symbols = sum(1 for s in symbols if getattr(s, 'doc_comment', None))
     doc_score = round((documented_symbols / len(symbols) * 100) if symbols else 0)
 
     # Vérifier s'il y a des tests
@@ -1066,23 +1150,28 @@ def get_file_metrics(
 def _file_has_tests(db, file_obj) -> bool:
     """Vérifie si le fichier a des tests associés."""
     try:
-        # Chercher un fichier de test correspondant
-        test_patterns = [
-            f"test_{file_obj.filename}",
-            f"{file_obj.filename.replace('.c', '_test.c')}",
-            f"{file_obj.filename.replace('.py', '_test.py')}",
-            f"test_{file_obj.path}",
-        ]
-
-        for pattern in test_patterns:
-            row = db.fetch_one(
-                "SELECT id FROM files WHERE path LIKE ?",
-                (f"%{pattern}%",),
-            )
-            if row:
-                return True
-
-        return False
+        # Noms de fichiers de test candidats (test_x.c, x_test.c, ...)
+        filename = file_obj.filename or ""
+        stem, dot, ext = filename.rpartition(".")
+        if not dot:
+            stem, ext = filename, ""
+        suffix = f".{ext}" if dot else ""
+
+        test_filenames = {f"test_{filename}", f"{stem}_test{suffix}"}
+        test_filenames.discard(filename)
+
+        # Égalité sur des colonnes indexées (filename, path) au lieu de
+        # LIKE '%...%' qui force un scan complet de la table files
+        placeholders = ",".join("?" * len(test_filenames))
+        row = db.fetch_one(
+            f"""
+            SELECT id FROM files
+            WHERE filename IN ({placeholders}) OR path = ?
+            LIMIT 1
+            """,
+            (*sorted(test_filenames), f"test_{file_obj.path}"),
+        )
+        return row is not None
     except Exception:
         return False
 
@@ -1103,19 +1192,28 @@ def _calculate_tech_debt_score(file_obj, symbols) -> int:
     elif file_obj.lines_code and file_obj.lines_code > 300:
         score += 10
 
+    # Un seul passage sur les symboles pour les deux compteurs
+    functions_count = 0
+    documented = 0
+    for s in symbols:
+        if s.kind in ("function", "method"):
+            functions_count += 1
+        if getattr(s, 'doc_comment', None):
+            documented += 1
+
     # Trop de fonctions
-    functions = [s for s in symbols if s.kind in ("function", "method")]
-    if len(functions) > 20:
+    if functions_count > 20:
         score += 15
-    elif len(functions) > 10:
+    elif functions_count > 10:
         score += 5
 
     # Manque de documentation
-    documented = sum(1 for s in symbols if getattr(s, 'doc_comment', None))
-    if symbols and documented / len(symbols) < 0.3:
-        score += 20
-    elif symbols and documented / len(symbols) < 0.5:
-        score += 10
+    if symbols:
+        doc_ratio = documented / len(symbols)
+        if doc_ratio < 0.3:
+            score += 20
+        elif doc_ratio < 0.5:
+            score += 10
 
     # Changements fréquents (instabilité)
     if file_obj.commits_30d and file_obj.commits_30d > 10:
@@ -1151,14 +1249,17 @@ def get_module_summary(
     if not files_rows:
         return {"error": f"Module not found: {module}"}
 
-    file_ids = [r.get("id") for r in files_rows]
-
     # Catégoriser les fichiers
     sources_count = 0
     headers_count = 0
     tests_count = 0
     critical_count = 0
 
+    # Métriques agrégées, calculées dans la même boucle
+    total_lines = 0
+    total_complexity = 0
+    documented_files = 0
+
     for r in files_rows:
         ext = r.get("extension", "")
         path = r.get("path", "")
@@ -1174,54 +1275,53 @@ def get_module_summary(
         if r.get("is_critical"):
             critical_count += 1
 
+        total_lines += r.get("lines_code", 0) or 0
+        total_complexity += r.get("complexity_sum", 0) or 0
+        if r.get("documentation_score", 0) > 50:
+            documented_files += 1
+
     # Compter les symboles par type
     functions_count = 0
     types_count = 0
     macros_count = 0
 
-    if file_ids:
-        placeholders = ",".join("?" * len(file_ids))
-        symbols_query = f"""
-            SELECT kind, COUNT(*) as cnt
-            FROM symbols
-            WHERE file_id IN ({placeholders})
-        """
-        if not include_private:
-            symbols_query += " AND name NOT LIKE '\\_%' ESCAPE '\\'"
-        symbols_query += " GROUP BY kind"
-        symbol_counts = db.fetch_all(symbols_query, tuple(file_ids))
-
-        for row in symbol_counts:
-            kind = row.get("kind", "")
-            cnt = row.get("cnt", 0)
-
-            if kind in ("function", "method"):
-                functions_count += cnt
-            elif kind in ("struct", "class", "enum", "typedef", "union", "interface"):
-                types_count += cnt
-            elif kind == "macro":
-                macros_count += cnt
+    # Sous-requête sur le module plutôt qu'une liste IN (?, ?, ...) :
+    # texte SQL constant, donc réutilisé par le cache de statements
+    symbols_query = """
+        SELECT kind, COUNT(*) as cnt
+        FROM symbols
+        WHERE file_id IN (SELECT id FROM files WHERE module = ?)
+    """
+    if not include_private:
+        symbols_query += " AND name NOT LIKE '\\_%' ESCAPE '\\'"
+    symbols_query += " GROUP BY kind"
+    symbol_counts = db.fetch_all(symbols_query, (module,))
+
+    for row in symbol_counts:
+        kind = row.get("kind", "")
+        cnt = row.get("cnt", 0)
+
+        if kind in ("function", "method"):
+            functions_count += cnt
+        elif kind in ("struct", "class", "enum", "typedef", "union", "interface"):
+            types_count += cnt
+        elif kind == "macro":
+            macros_count += cnt
 
     # Métriques agrégées
-    total_lines = sum(r.get("lines_code", 0) or 0 for r in files_rows)
-    total_complexity = sum(r.get("complexity_sum", 0) or 0 for r in files_rows)
     avg_complexity = round(total_complexity / len(files_rows), 1) if files_rows else 0
 
     # Score de documentation agrégé
-    documented_files = sum(1 for r in files_rows if r.get("documentation_score", 0) > 50)
     doc_score = round((documented_files / len(files_rows) * 100) if files_rows else 0)
 
     # Santé du module
-    error_count = 0
-    if file_ids:
-        placeholders = ",".join("?" * len(file_ids))
-        cutoff = (datetime.now() - timedelta(days=90)).isoformat()
-        error_query = f"""
-            SELECT COUNT(*) as cnt FROM error_history
-            WHERE file_id IN ({placeholders}) AND discovered_at >= ?
-        """
-        error_row = db.fetch_one(error_query, tuple(file_ids) + (cutoff,))
-        error_count = error_row.get("cnt", 0) if error_row else 0
+    cutoff = (datetime.now() - timedelta(days=90)).isoformat()
+    error_query = """
+        SELECT COUNT(*) as cnt FROM error_history
+        WHERE file_id IN (SELECT id FROM files WHERE module = ?) AND discovered_at >= ?
+    """
+    error_row = db.fetch_one(error_query, (module, cutoff))
+    error_count = error_row.get("cnt", 0) if error_row else 0
 
     # Déterminer la couverture de tests et la dette technique
     test_coverage = "none"
@@ -1307,6 +1407,33 @@ def get_module_summary(
     }
 
 
+# =============================================================================
+# PRÉCHARGEMENT DES CACHES
+# =============================================================================
+
+def warm_caches(db) -> None:
+    """
+    Construit les index en mémoire utilisés par les outils.
+
+    Graphe inverse des appels (get_file_impact) et trigrammes des noms de
+    symboles (search_symbols). Sans cela, la première requête après un
+    démarrage paie leur construction. Les deux restent validés contre la
+    base à chaque utilisation : les précharger ne change aucun résultat.
+    """
+    from agentdb.queries import _get_reverse_call_graph
+
+    start = datetime.now()
+    try:
+        _get_reverse_call_graph(db).load(db)
+        _get_trigram_filter(db)._load(db)
+    except Exception as e:
+        logger.warning(f"Cache warmup failed: {e}")
+        return
+
+    elapsed_ms = (datetime.now() - start).total_seconds() * 1000
+    logger.info(f"Tool caches warmed in {elapsed_ms:.0f}ms")
+
+
 # =============================================================================
 # EXPORTS
 # =============================================================================
@@ -1322,4 +1449,5 @@ __all__ = [
     "search_symbols",
     "get_file_metrics",
     "get_module_summary",
+    "warm_caches",
 ]
@@ -21,6 +21,7 @@ Usage:
 from __future__ import annotations
 
 import argparse
+import ast
 import fnmatch
 import hashlib
 import json
@@ -31,13 +32,34 @@ import shutil
 import sqlite3
 import subprocess
 import sys
+import threading
 import time
 import warnings
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
+from functools import lru_cache
+from itertools import repeat
 from pathlib import Path
 from typing import Any, Optional
 
+try:
+    import xxhash
+except ImportError:  # xxhash est optionnel, fallback sur blake3/hashlib
+    xxhash = None
+
+try:
+    import blake3
+except ImportError:  # blake3 est optionnel, fallback sur hashlib
+    blake3 = None
+
+try:
+    import orjson
+except ImportError:  # orjson est optionnel, fallback sur json
+    orjson = None
+
 # =============================================================================
 # CONFIGURATION
 # =============================================================================
@@ -233,6 +255,29 @@ def setup_logging(logs_dir: Path) -> logging.Logger:
     return logger
 
 
+# =============================================================================
+# DATABASE
+# =============================================================================
+
+# PRAGMAs par connexion (mêmes réglages que agentdb.db) : journal_mode=WAL est
+# persistant dans le fichier, mais synchronous vaut FULL à chaque nouvelle
+# connexion et ferait un fsync par commit.
+SQLITE_PRAGMAS = (
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA cache_size = -64000",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA mmap_size = 268435456",
+)
+
+
+def connect_db(db_path: Path) -> sqlite3.Connection:
+    """Ouvre la base avec les PRAGMAs de performance."""
+    conn = sqlite3.connect(str(db_path))
+    for pragma in SQLITE_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
 # =============================================================================
 # STEP 1: CREATE STRUCTURE
 # =============================================================================
@@ -293,11 +338,20 @@ def step_2_init_schema(config: BootstrapConfig, logger: logging.Logger) -> bool:
 
     # Créer la nouvelle base
     try:
-        conn = sqlite3.connect(str(config.db_path))
+        conn = connect_db(config.db_path)
         schema_sql = config.schema_path.read_text(encoding="utf-8")
         conn.executescript(schema_sql)
         conn.commit()
 
+        # Index plein texte optionnel (FTS5 trigram, SQLite >= 3.34)
+        fts_schema_path = config.schema_path.with_name("schema_fts.sql")
+        if fts_schema_path.exists():
+            try:
+                conn.executescript(fts_schema_path.read_text(encoding="utf-8"))
+                conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"FTS5 symbol index unavailable, using LIKE search: {e}")
+
         # Vérifier les tables créées
         cursor = conn.execute(
             "SELECT name FROM sqlite_master WHERE type='table' ORDER BY name"
@@ -368,33 +422,44 @@ def get_language(ext: str, extensions: dict[str, list[str]]) -> Optional[str]:
     return None
 
 
-def count_lines(file_path: Path) -> dict[str, int]:
-    """Compte les lignes d'un fichier."""
+# Préfixes des lignes de commentaire (hors blocs /* */)
+LINE_COMMENT_PREFIXES = ("//", "#")
+
+
+def count_lines(file_path: Path, content: Optional[str] = None) -> dict[str, int]:
+    """
+    Compte les lignes d'un fichier (content : texte déjà lu).
+
+    Les lignes sont strippées une seule fois ; sans bloc /* */ dans le
+    fichier, blanches et commentaires se comptent sans boucle Python.
+    """
     try:
-        content = file_path.read_text(encoding="utf-8", errors="replace")
-        lines = content.split("\n")
+        if content is None:
+            content = file_path.read_text(encoding="utf-8", errors="replace")
+        lines = list(map(str.strip, content.split("\n")))
 
         total = len(lines)
-        blank = sum(1 for line in lines if not line.strip())
+        blank = lines.count("")
 
         # Estimation simple des commentaires
-        comment = 0
-        in_block = False
-        for line in lines:
-            stripped = line.strip()
-            if stripped.startswith("/*"):
-                in_block = True
-            if in_block:
-                comment += 1
-                if "*/" in stripped:
-                    in_block = False
-            elif stripped.startswith("//") or stripped.startswith("#"):
-                comment += 1
-
-        code = total - blank - comment
+        if "/*" not in content:
+            comment = sum(map(str.startswith, lines, repeat(LINE_COMMENT_PREFIXES)))
+        else:
+            comment = 0
+            in_block = False
+            for stripped in lines:
+                if stripped.startswith("/*"):
+                    in_block = True
+                if in_block:
+                    comment += 1
+                    if "*/" in stripped:
+                        in_block = False
+                elif stripped.startswith(LINE_COMMENT_PREFIXES):
+                    comment += 1
+
         return {
             "total": total,
-            "code": max(0, code),
+            "code": max(0, total - blank - comment),
             "comment": comment,
             "blank": blank,
         }
@@ -402,13 +467,54 @@ def count_lines(file_path: Path) -> dict[str, int]:
         return {"total": 0, "code": 0, "comment": 0, "blank": 0}
 
 
-def get_content_hash(file_path: Path) -> str:
-    """Calcule le hash MD5 du contenu."""
+# Taille des blocs lus pour hacher un fichier
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def get_content_hash(file_path: Path, content: Optional[bytes] = None) -> str:
+    """
+    Calcule l'empreinte du contenu (même algorithme que l'indexeur AgentDB).
+
+    xxh3_128, sinon BLAKE3, sinon blake2b : pas besoin de MD5 pour de la
+    détection de changements, et des empreintes identiques permettent à
+    l'indexeur de sauter les fichiers inchangés depuis le bootstrap.
+    """
+    if xxhash is not None:
+        hasher = xxhash.xxh3_128()
+    elif blake3 is not None:
+        hasher = blake3.blake3()
+    else:
+        hasher = hashlib.blake2b(digest_size=16)
+
+    if content is not None:
+        hasher.update(content)
+    else:
+        # Haché par blocs : mémoire bornée quelle que soit la taille du fichier
+        try:
+            with open(file_path, "rb") as f:
+                for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                    hasher.update(chunk)
+        except Exception:
+            return ""
+
+    if xxhash is None and blake3 is not None:
+        return hasher.hexdigest(length=16)
+    return hasher.hexdigest()
+
+
+def read_file_metrics(file_path: Path) -> tuple[dict[str, int], str]:
+    """
+    Lit un fichier une seule fois : (comptage des lignes, empreinte).
+
+    L'empreinte porte sur les octets bruts, le comptage sur le texte décodé,
+    sans relire le fichier ni ré-encoder le texte.
+    """
     try:
-        content = file_path.read_bytes()
-        return hashlib.md5(content).hexdigest()
+        data = file_path.read_bytes()
     except Exception:
-        return ""
+        return {"total": 0, "code": 0, "comment": 0, "blank": 0}, ""
+    content = data.decode("utf-8", errors="replace")
+    return count_lines(file_path, content=content), get_content_hash(file_path, content=data)
 
 
 def get_module_from_path(path: str, project_root: Path) -> str:
@@ -470,8 +576,7 @@ def step_3_scan_files(
 
         # Récupérer les infos du fichier
         language = get_language(ext, config.extensions)
-        line_counts = count_lines(file_path)
-        content_hash = get_content_hash(file_path)
+        line_counts, content_hash = read_file_metrics(file_path)
         module = get_module_from_path(rel_path_str, config.project_root)
 
         file_info = {
@@ -497,7 +602,7 @@ def step_3_scan_files(
 
     # Insérer dans la base
     if files_to_index:
-        conn = sqlite3.connect(str(config.db_path))
+        conn = connect_db(config.db_path)
         cursor = conn.cursor()
 
         for f in files_to_index:
@@ -525,43 +630,183 @@ def step_3_scan_files(
 # STEP 4: INDEX SYMBOLS AND RELATIONS
 # =============================================================================
 
-def run_ctags(file_path: Path) -> list[dict[str, Any]]:
-    """Exécute ctags sur un fichier et retourne les symboles."""
+# Fichiers par processus ctags (limite la taille d'un lot en échec)
+CTAGS_BATCH_SIZE = 500
+
+# Processus ctags lancés en parallèle
+CTAGS_MAX_WORKERS = os.cpu_count() or 1
+
+
+def _ctags_symbol(tag: dict[str, Any]) -> dict[str, Any]:
+    """Convertit un tag JSON de ctags en symbole."""
+    return {
+        "name": tag.get("name", ""),
+        "kind": tag.get("kind", "unknown"),
+        "line_start": tag.get("line", 0),
+        "signature": tag.get("signature", ""),
+        "scope": tag.get("scope", ""),
+        "scopeKind": tag.get("scopeKind", ""),
+    }
+
+
+@lru_cache(maxsize=None)
+def ctags_available() -> bool:
+    """ctags est-il dans le PATH ? (recherché une fois par processus)"""
+    return shutil.which("ctags") is not None
+
+
+def parse_ctags_line(line: bytes) -> Optional[dict[str, Any]]:
+    """Parse une ligne JSON de ctags (None si vide ou invalide)."""
+    line = line.strip()
+    if not line:
+        return None
     try:
-        result = subprocess.run(
-            [
-                "ctags", "--output-format=json", "--fields=*",
-                "-o", "-", str(file_path)
-            ],
-            capture_output=True,
-            text=True,
-            timeout=30,
+        if orjson is not None:
+            return orjson.loads(line)
+        return json.loads(line)
+    except ValueError:  # json/orjson.JSONDecodeError
+        return None
+
+
+def run_ctags_json(
+    cmd: list[str],
+    input_data: Optional[bytes] = None,
+    timeout: float = 30,
+) -> Optional[list[dict[str, Any]]]:
+    """
+    Lance ctags et parse sa sortie JSON au fil de l'eau.
+
+    La sortie est lue ligne à ligne (ni copie complète de stdout ni
+    splitlines) ; les pseudo-tags sont ignorés. `input_data` est écrit sur
+    stdin depuis un thread pour que ctags ne bloque jamais sur un pipe plein.
+
+    Returns:
+        Liste des tags, ou None si ctags est introuvable ou a expiré
+    """
+    try:
+        proc = subprocess.Popen(
+            cmd,
+            stdin=subprocess.DEVNULL if input_data is None else subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
         )
+    except FileNotFoundError:
+        return None
 
-        symbols = []
-        for line in result.stdout.strip().split("\n"):
-            if line:
-                try:
-                    tag = json.loads(line)
-                    symbols.append({
-                        "name": tag.get("name", ""),
-                        "kind": tag.get("kind", "unknown"),
-                        "line_start": tag.get("line", 0),
-                        "signature": tag.get("signature", ""),
-                        "scope": tag.get("scope", ""),
-                        "scopeKind": tag.get("scopeKind", ""),
-                    })
-                except json.JSONDecodeError:
-                    pass
+    timed_out = threading.Event()
 
-        return symbols
-    except (subprocess.TimeoutExpired, FileNotFoundError):
-        return []
+    def on_timeout() -> None:
+        timed_out.set()
+        proc.kill()
 
+    def feed_stdin() -> None:
+        try:
+            with proc.stdin:
+                proc.stdin.write(input_data)
+        except OSError:  # ctags tué ou terminé avant la fin de la liste
+            pass
+
+    timer = threading.Timer(timeout, on_timeout)
+    timer.start()
+    try:
+        if input_data is not None:
+            threading.Thread(target=feed_stdin, daemon=True).start()
+        tags = []
+        with proc.stdout:
+            for line in proc.stdout:
+                tag = parse_ctags_line(line)
+                if tag is not None and tag.get("_type") != "ptag":
+                    tags.append(tag)
+        proc.wait()
+    finally:
+        timer.cancel()
 
-def parse_python_file(file_path: Path) -> list[dict[str, Any]]:
+    return None if timed_out.is_set() else tags
+
+
+def run_ctags(file_path: Path) -> list[dict[str, Any]]:
+    """Exécute ctags sur un fichier et retourne les symboles."""
+    return run_ctags_batch([file_path], timeout=30).get(str(file_path), [])
+
+
+def run_ctags_batch(
+    file_paths: list[Path],
+    timeout: float = 600,
+) -> dict[str, list[dict[str, Any]]]:
     """
-    Parse un fichier Python avec ast.
+    Exécute ctags par lots d'au plus CTAGS_BATCH_SIZE fichiers.
+
+    Les chemins sont passés sur stdin (`-L -`) : un seul fork/exec par lot
+    au lieu d'un par fichier. Les lots (au moins un par worker) tournent en
+    parallèle, chacun dans son processus ctags ; des threads suffisent, ils
+    ne font qu'attendre. Les tags sont répartis via leur champ `path`.
+
+    Returns:
+        Dict {str(chemin): symboles} (liste vide pour un lot en échec)
+    """
+    symbols_by_path: dict[str, list[dict[str, Any]]] = {str(fp): [] for fp in file_paths}
+    paths = list(symbols_by_path)
+    if not paths:
+        return symbols_by_path
+
+    batch_size = max(1, min(CTAGS_BATCH_SIZE, -(-len(paths) // CTAGS_MAX_WORKERS)))
+    batches = [paths[i:i + batch_size] for i in range(0, len(paths), batch_size)]
+
+    def run_batch(batch: list[str]) -> Optional[list[dict[str, Any]]]:
+        return run_ctags_json(
+            ["ctags", "--output-format=json", "--fields=*", "-L", "-", "-o", "-"],
+            input_data=os.fsencode("\n".join(batch) + "\n"),
+            timeout=timeout,
+        )
+
+    if len(batches) == 1:
+        results = [run_batch(batches[0])]
+    else:
+        with ThreadPoolExecutor(max_workers=min(CTAGS_MAX_WORKERS, len(batches))) as pool:
+            results = list(pool.map(run_batch, batches))
+
+    for tags in results:
+        if tags is None:
+            continue
+
+        for tag in tags:
+            symbols = symbols_by_path.get(tag.get("path", ""))
+            if symbols is not None:
+                symbols.append(_ctags_symbol(tag))
+
+    return symbols_by_path
+
+
+def expr_source(node: ast.expr) -> str:
+    """Source d'une annotation : formes courantes sans ast.unparse (même résultat)."""
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Constant):
+        value = node.value
+        if value is None or isinstance(value, (bool, int)):
+            return repr(value)
+        if (isinstance(value, str) and node.kind is None and value.isprintable()
+                and "'" not in value and "\\" not in value):
+            return f"'{value}'"
+    elif isinstance(node, ast.Attribute):
+        if isinstance(node.value, ast.Name):
+            return f"{node.value.id}.{node.attr}"
+    elif isinstance(node, ast.Subscript):
+        inner = node.slice
+        # Un seul élément ou un élément étoilé : ast.unparse garde la
+        # virgule finale (tuple[int,], X[*Ts,])
+        if (isinstance(inner, ast.Tuple) and len(inner.elts) > 1
+                and not any(isinstance(e, ast.Starred) for e in inner.elts)):
+            args = ", ".join(expr_source(e) for e in inner.elts)
+            return f"{expr_source(node.value)}[{args}]"
+        if not isinstance(inner, (ast.Tuple, ast.Slice)):
+            return f"{expr_source(node.value)}[{expr_source(inner)}]"
+    return ast.unparse(node)
+
+
+def parse_python_file(file_path: Path, content: Optional[bytes] = None) -> list[dict[str, Any]]:
+    """
+    Parse un fichier Python avec ast (content : octets déjà lus).
 
     Extrait :
     - Fonctions de niveau module
@@ -570,7 +815,6 @@ def parse_python_file(file_path: Path) -> list[dict[str, Any]]:
     - Visibilité (public/protected/private)
     - Complexité cyclomatique
     """
-    import ast
 
     def get_visibility(name: str) -> str:
         """Détermine la visibilité selon les conventions Python."""
@@ -618,18 +862,20 @@ def parse_python_file(file_path: Path) -> list[dict[str, Any]]:
             for arg in node.args.args:
                 arg_str = arg.arg
                 if arg.annotation:
-                    arg_str += f": {ast.unparse(arg.annotation)}"
+                    arg_str += f": {expr_source(arg.annotation)}"
                 args.append(arg_str)
 
             sig = f"({', '.join(args)})"
             if node.returns:
-                sig += f" -> {ast.unparse(node.returns)}"
+                sig += f" -> {expr_source(node.returns)}"
             return sig
         except Exception:
             return "()"
 
     try:
-        content = file_path.read_text(encoding="utf-8")
+        if content is None:
+            content = file_path.read_bytes()
+        # ast.parse décode lui-même les octets (UTF-8 strict ou déclaration PEP 263)
         with warnings.catch_warnings():
             warnings.filterwarnings("ignore", category=SyntaxWarning)
             tree = ast.parse(content)
@@ -660,7 +906,7 @@ def parse_python_file(file_path: Path) -> list[dict[str, Any]]:
                 bases = []
                 for base in node.bases:
                     try:
-                        bases.append(ast.unparse(base))
+                        bases.append(expr_source(base))
                     except Exception:
                         if isinstance(base, ast.Name):
                             bases.append(base.id)
@@ -705,43 +951,84 @@ def parse_python_file(file_path: Path) -> list[dict[str, Any]]:
         return []
 
 
-def extract_includes(file_path: Path, language: str) -> list[dict[str, str]]:
-    """Extrait les includes/imports d'un fichier."""
+# Includes/imports cherchés en une passe sur tout le contenu (re.M) plutôt
+# que ligne à ligne : [^\S\n] remplace \s pour ne pas changer de ligne, et
+# l'import capturé commence sur un caractère non blanc (ligne « strippée »)
+INCLUDE_C_PATTERN = re.compile(r'^[^\S\n]*#include[^\S\n]*[<"]([^>"\n]+)[>"]', re.M)
+IMPORT_PY_PATTERN = re.compile(
+    r'^[^\S\n]*(?:from[^\S\n]+(\S+)[^\S\n]+)?import[^\S\n]+(\S.*)', re.M
+)
+
+
+def extract_includes(
+    file_path: Path,
+    language: str,
+    content: Optional[str] = None
+) -> list[dict[str, str]]:
+    """Extrait les includes/imports d'un fichier (content : texte déjà lu)."""
     includes = []
 
     try:
-        content = file_path.read_text(encoding="utf-8", errors="replace")
-        lines = content.split("\n")
-
-        for i, line in enumerate(lines, 1):
-            line = line.strip()
-
-            if language in ("c", "cpp"):
-                # #include <...> ou #include "..."
-                match = re.match(r'#include\s*[<"]([^>"]+)[>"]', line)
-                if match:
-                    includes.append({
-                        "target": match.group(1),
-                        "line": i,
-                        "type": "include",
-                    })
-
-            elif language == "python":
-                # import ... ou from ... import ...
-                match = re.match(r'(?:from\s+(\S+)\s+)?import\s+(.+)', line)
-                if match:
-                    module = match.group(1) or match.group(2).split(",")[0].strip()
-                    includes.append({
-                        "target": module.split()[0],
-                        "line": i,
-                        "type": "import",
-                    })
+        if content is None:
+            content = file_path.read_text(encoding="utf-8", errors="replace")
+
+        if language in ("c", "cpp"):
+            # #include <...> ou #include "..."
+            pattern, kind = INCLUDE_C_PATTERN, "include"
+        elif language == "python":
+            # import ... ou from ... import ...
+            pattern, kind = IMPORT_PY_PATTERN, "import"
+        else:
+            return includes
+
+        line, pos = 1, 0
+        for match in pattern.finditer(content):
+            line += content.count("\n", pos, match.start())
+            pos = match.start()
+            if kind == "include":
+                target = match.group(1)
+            else:
+                module = match.group(1) or match.group(2).split(",")[0].strip()
+                target = module.split()[0]
+            includes.append({
+                "target": target,
+                "line": line,
+                "type": kind,
+            })
     except Exception:
         pass
 
     return includes
 
 
+SYMBOL_INSERT_SQL = """
+    INSERT INTO symbols (
+        file_id, name, qualified_name, kind, line_start, line_end,
+        signature, visibility, complexity, is_static,
+        doc_comment, has_doc, base_classes_json
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def symbol_row(file_id: int, sym: dict[str, Any]) -> tuple:
+    """Paramètres de SYMBOL_INSERT_SQL pour un symbole parsé."""
+    return (
+        file_id,
+        sym.get("name", ""),
+        sym.get("qualified_name"),
+        sym.get("kind", "unknown"),
+        sym.get("line_start"),
+        sym.get("line_end"),
+        sym.get("signature", ""),
+        sym.get("visibility", "public"),
+        sym.get("complexity", 0),
+        1 if sym.get("is_static") else 0,
+        sym.get("doc_comment", ""),
+        1 if sym.get("doc_comment") else 0,
+        json.dumps(sym.get("base_classes")) if sym.get("base_classes") else None,
+    )
+
+
 def step_4_index_symbols(
     config: BootstrapConfig,
     logger: logging.Logger,
@@ -752,12 +1039,12 @@ def step_4_index_symbols(
     print(f"\n{Colors.BOLD}Step 4/9:{Colors.RESET} Indexing symbols and relations...")
 
     # Vérifier si ctags est disponible
-    ctags_available = shutil.which("ctags") is not None
-    if not ctags_available:
+    has_ctags = ctags_available()
+    if not has_ctags:
         logger.warning("ctags not found, using fallback parsing")
         stats.warnings.append("ctags not found, using limited parsing")
 
-    conn = sqlite3.connect(str(config.db_path))
+    conn = connect_db(config.db_path)
     cursor = conn.cursor()
 
     progress = ProgressBar(len(files), "Indexing")
@@ -765,6 +1052,13 @@ def step_4_index_symbols(
     # Index de tous les symboles pour les relations
     all_symbols: dict[str, int] = {}
 
+    # Un processus ctags par lot plutôt qu'un par fichier C/C++
+    ctags_symbols: dict[str, list[dict[str, Any]]] = {}
+    if has_ctags:
+        ctags_symbols = run_ctags_batch([
+            f["full_path"] for f in files if f.get("language", "") in ("c", "cpp")
+        ])
+
     for file_info in files:
         progress.update()
 
@@ -772,46 +1066,37 @@ def step_4_index_symbols(
         file_path = file_info["full_path"]
         language = file_info.get("language", "")
 
+        # Une seule lecture pour les symboles et les includes
+        try:
+            data = file_path.read_bytes()
+        except OSError as e:
+            logger.debug(f"Cannot read {file_info['path']}: {e}")
+            continue
+
         # Parser les symboles
         if language == "python":
-            symbols = parse_python_file(file_path)
-        elif ctags_available and language in ("c", "cpp"):
-            symbols = run_ctags(file_path)
+            symbols = parse_python_file(file_path, content=data)
+        elif has_ctags and language in ("c", "cpp"):
+            symbols = ctags_symbols.get(str(file_path), [])
         else:
             symbols = []
 
-        # Insérer les symboles avec tous les champs
-        for sym in symbols:
-            cursor.execute("""
-                INSERT INTO symbols (
-                    file_id, name, qualified_name, kind, line_start, line_end,
-                    signature, visibility, complexity, is_static,
-                    doc_comment, has_doc, base_classes_json
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                file_id,
-                sym.get("name", ""),
-                sym.get("qualified_name"),
-                sym.get("kind", "unknown"),
-                sym.get("line_start"),
-                sym.get("line_end"),
-                sym.get("signature", ""),
-                sym.get("visibility", "public"),
-                sym.get("complexity", 0),
-                1 if sym.get("is_static") else 0,
-                sym.get("doc_comment", ""),
-                1 if sym.get("doc_comment") else 0,
-                json.dumps(sym.get("base_classes")) if sym.get("base_classes") else None,
-            ))
-
-            sym_id = cursor.lastrowid
-            stats.symbols_indexed += 1
+        # Insérer les symboles avec tous les champs (une requête préparée par fichier)
+        if symbols:
+            cursor.executemany(SYMBOL_INSERT_SQL, [symbol_row(file_id, sym) for sym in symbols])
+            stats.symbols_indexed += len(symbols)
 
-            # Indexer pour les relations
-            all_symbols[sym.get("name", "")] = sym_id
+            # Indexer pour les relations (à nom égal, le dernier inséré l'emporte)
+            cursor.execute(
+                "SELECT id, name FROM symbols WHERE file_id = ? ORDER BY id",
+                (file_id,)
+            )
+            all_symbols.update({name: sym_id for sym_id, name in cursor.fetchall()})
 
         # Extraire les includes/imports
-        includes = extract_includes(file_path, language)
+        includes = extract_includes(
+            file_path, language, content=data.decode("utf-8", errors="replace")
+        )
         for inc in includes:
             # Chercher le fichier cible
             target_pattern = f"%{inc['target']}%"
@@ -843,6 +1128,19 @@ def step_4_index_symbols(
 # STEP 4b: EXTRACT CALL RELATIONS
 # =============================================================================
 
+# Appel de fonction candidat : identifiant suivi d'une parenthèse
+CALL_PATTERN = re.compile(r'\b([a-zA-Z_]\w*)\s*\(')
+
+# Mots-clés suivis d'une parenthèse qui ne sont pas des appels (construit
+# une fois pour toutes au lieu d'un set par fichier)
+CALL_KEYWORDS = frozenset({
+    "if", "for", "while", "switch", "catch", "sizeof", "typeof",
+    "return", "else", "do", "case", "default", "break", "continue",
+    "struct", "class", "enum", "union", "typedef", "define",
+    "elif", "except", "with", "assert", "print",
+    "function", "const", "let", "var", "new",
+})
+
 def extract_python_calls_for_bootstrap(
     file_path: Path,
     symbols: list[dict[str, Any]],
@@ -859,7 +1157,6 @@ def extract_python_calls_for_bootstrap(
     Returns:
         Liste de dict avec: caller, callee, line
     """
-    import ast
 
     try:
         content = file_path.read_text(encoding="utf-8")
@@ -925,7 +1222,7 @@ def step_4b_extract_relations(
     """Étape 4b : Extraire les relations d'appels entre symboles."""
     print(f"\n{Colors.BOLD}Step 4b/9:{Colors.RESET} Extracting call relations...")
 
-    conn = sqlite3.connect(str(config.db_path))
+    conn = connect_db(config.db_path)
     cursor = conn.cursor()
 
     # Construire l'index global des symboles: name -> id
@@ -974,31 +1271,24 @@ def step_4b_extract_relations(
             # Utiliser regex pour C/C++/JS
             calls = extract_calls_regex_for_bootstrap(file_path, file_symbols, all_symbols)
 
-        # Insérer les relations
+        # Résoudre les IDs des appels
+        relation_rows = []
         for call in calls:
-            caller_name = call["caller"]
-            callee_name = call["callee"]
-            line = call["line"]
-
-            # Trouver les IDs
-            caller_id = all_symbols.get(caller_name)
-            callee_id = all_symbols.get(callee_name)
+            caller_id = all_symbols.get(call["caller"])
+            callee_id = all_symbols.get(call["callee"])
 
             if caller_id and callee_id and caller_id != callee_id:
-                try:
-                    cursor.execute("""
-                        INSERT INTO relations (
-                            source_id, target_id, relation_type,
-                            location_file_id, location_line, count, is_direct
-                        ) VALUES (?, ?, 'calls', ?, ?, 1, 1)
-                    """, (caller_id, callee_id, file_id, line))
-                    relations_count += 1
-                except sqlite3.IntegrityError:
-                    # Relation déjà existante, incrémenter le compteur
-                    cursor.execute("""
-                        UPDATE relations SET count = count + 1
-                        WHERE source_id = ? AND target_id = ? AND relation_type = 'calls'
-                    """, (caller_id, callee_id))
+                relation_rows.append((caller_id, callee_id, file_id, call["line"]))
+
+        # Insérer les relations (executemany)
+        relation_sql = """
+            INSERT INTO relations (
+                source_id, target_id, relation_type,
+                location_file_id, location_line, count, is_direct
+            ) VALUES (?, ?, 'calls', ?, ?, 1, 1)
+        """
+        cursor.executemany(relation_sql, relation_rows)
+        relations_count += len(relation_rows)
 
         logger.debug(f"Extracted {len(calls)} calls from {file_info['path']}")
 
@@ -1010,6 +1300,25 @@ def step_4b_extract_relations(
     print(f"  {Colors.GREEN}✓{Colors.RESET} Extracted {relations_count} call relations")
 
 
+def callers_by_line(
+    local_functions: dict[str, dict[str, int]],
+    line_count: int,
+) -> list[Optional[str]]:
+    """
+    Table ligne -> fonction englobante (index 0 inutilisé).
+
+    Peinte dans l'ordre inverse d'insertion : en cas de chevauchement la
+    première fonction l'emporte, comme le parcours linéaire d'origine.
+    """
+    callers: list[Optional[str]] = [None] * (line_count + 1)
+    for name, info in reversed(local_functions.items()):
+        start = max(info["start"], 1)
+        end = min(info["end"], line_count)
+        if start <= end:
+            callers[start:end + 1] = [name] * (end - start + 1)
+    return callers
+
+
 def extract_calls_regex_for_bootstrap(
     file_path: Path,
     symbols: list[dict[str, Any]],
@@ -1026,16 +1335,6 @@ def extract_calls_regex_for_bootstrap(
     calls = []
     lines = content.split("\n")
 
-    call_pattern = re.compile(r'\b([a-zA-Z_]\w*)\s*\(')
-
-    keywords = {
-        "if", "for", "while", "switch", "catch", "sizeof", "typeof",
-        "return", "else", "do", "case", "default", "break", "continue",
-        "struct", "class", "enum", "union", "typedef", "define",
-        "elif", "except", "with", "assert", "print",
-        "function", "const", "let", "var", "new",
-    }
-
     # Index des fonctions locales avec leurs plages
     local_functions = {}
     for sym in symbols:
@@ -1045,6 +1344,7 @@ def extract_calls_regex_for_bootstrap(
                 "end": sym.get("line_end") or sym["line_start"] + 200,
             }
 
+    callers: Optional[list[Optional[str]]] = None
     in_block_comment = False
 
     for line_num, line in enumerate(lines, 1):
@@ -1061,21 +1361,19 @@ def extract_calls_regex_for_bootstrap(
         if stripped.startswith("//") or stripped.startswith("#"):
             continue
 
-        for match in call_pattern.finditer(line):
+        for match in CALL_PATTERN.finditer(line):
             callee_name = match.group(1)
 
-            if callee_name in keywords:
+            if callee_name in CALL_KEYWORDS:
                 continue
 
             if callee_name not in all_symbols and callee_name not in local_functions:
                 continue
 
-            # Trouver le caller
-            caller_name = None
-            for func_name, func_info in local_functions.items():
-                if func_info["start"] <= line_num <= func_info["end"]:
-                    caller_name = func_name
-                    break
+            # Trouver le caller (table construite au premier appel trouvé)
+            if callers is None:
+                callers = callers_by_line(local_functions, len(lines))
+            caller_name = callers[line_num]
 
             if caller_name and caller_name != callee_name:
                 calls.append({
@@ -1091,6 +1389,18 @@ def extract_calls_regex_for_bootstrap(
 # STEP 5: CALCULATE METRICS
 # =============================================================================
 
+# Mots-clés et opérateurs de branchement, en une seule alternative : un
+# parcours du texte au lieu d'un findall par mot-clé (mêmes totaux, les
+# alternatives ne pouvant pas se chevaucher)
+BRANCH_KEYWORDS_PATTERN = re.compile(
+    r'\b(?:if|else|elif|for|while|case|catch|and|or)\b'
+    r'|\b\?\s*:|\b&&\b|\b\|\|\b'
+)
+
+# Définitions de fonctions C/C++ (estimation du nombre de fonctions)
+FUNCTION_DEF_PATTERN = re.compile(r'\b\w+\s*\([^)]*\)\s*\{')
+
+
 def calculate_complexity(file_path: Path, language: str) -> dict[str, Any]:
     """Calcule la complexité cyclomatique d'un fichier."""
     complexity_sum = 0
@@ -1100,16 +1410,8 @@ def calculate_complexity(file_path: Path, language: str) -> dict[str, Any]:
     try:
         content = file_path.read_text(encoding="utf-8", errors="replace")
 
-        # Compter les mots-clés de branchement
-        branch_keywords = [
-            r'\bif\b', r'\belse\b', r'\belif\b', r'\bfor\b', r'\bwhile\b',
-            r'\bcase\b', r'\bcatch\b', r'\b\?\s*:', r'\b&&\b', r'\b\|\|\b',
-            r'\band\b', r'\bor\b',
-        ]
-
         # Complexité par fonction (estimation)
         if language == "python":
-            import ast
             try:
                 with warnings.catch_warnings():
                     warnings.filterwarnings("ignore", category=SyntaxWarning)
@@ -1117,9 +1419,7 @@ def calculate_complexity(file_path: Path, language: str) -> dict[str, Any]:
                 for node in ast.walk(tree):
                     if isinstance(node, ast.FunctionDef):
                         func_content = ast.unparse(node)
-                        func_complexity = 1
-                        for kw in branch_keywords:
-                            func_complexity += len(re.findall(kw, func_content))
+                        func_complexity = 1 + len(BRANCH_KEYWORDS_PATTERN.findall(func_content))
                         complexity_sum += func_complexity
                         complexity_max = max(complexity_max, func_complexity)
                         function_count += 1
@@ -1127,10 +1427,9 @@ def calculate_complexity(file_path: Path, language: str) -> dict[str, Any]:
                 pass
         else:
             # Estimation globale pour C/C++
-            for kw in branch_keywords:
-                complexity_sum += len(re.findall(kw, content))
+            complexity_sum = len(BRANCH_KEYWORDS_PATTERN.findall(content))
             complexity_max = complexity_sum  # Approximation
-            function_count = len(re.findall(r'\b\w+\s*\([^)]*\)\s*\{', content))
+            function_count = len(FUNCTION_DEF_PATTERN.findall(content))
 
     except Exception:
         pass
@@ -1144,6 +1443,42 @@ def calculate_complexity(file_path: Path, language: str) -> dict[str, Any]:
     }
 
 
+# En dessous de ce nombre de fichiers, le coût de démarrage du pool l'emporte
+PARALLEL_MIN_FILES = 16
+
+# Nombre de processus pour le calcul des métriques
+METRICS_MAX_WORKERS = os.cpu_count() or 1
+
+
+def iter_complexities(files: list[dict[str, Any]]):
+    """
+    Calcule la complexité de chaque fichier, dans l'ordre de `files`.
+
+    Le calcul (ast.parse + regex) est purement CPU et tient le GIL : il est
+    réparti sur un pool de processus, les écritures en base restant dans le
+    processus principal. Repli séquentiel si le pool ne peut pas démarrer
+    ou s'interrompt (on reprend au premier fichier non traité).
+    """
+    paths = [f["full_path"] for f in files]
+    languages = [f.get("language", "") for f in files]
+    done = 0
+
+    workers = min(METRICS_MAX_WORKERS, len(files))
+    if workers > 1 and len(files) >= PARALLEL_MIN_FILES:
+        chunksize = max(1, min(64, len(files) // (workers * 4)))
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                for complexity in pool.map(calculate_complexity, paths, languages, chunksize=chunksize):
+                    yield complexity
+                    done += 1
+            return
+        except (OSError, BrokenProcessPool):
+            pass
+
+    for file_path, language in zip(paths[done:], languages[done:]):
+        yield calculate_complexity(file_path, language)
+
+
 def step_5_calculate_metrics(
     config: BootstrapConfig,
     logger: logging.Logger,
@@ -1153,19 +1488,15 @@ def step_5_calculate_metrics(
     """Étape 5 : Calculer les métriques."""
     print(f"\n{Colors.BOLD}Step 5/9:{Colors.RESET} Calculating metrics...")
 
-    conn = sqlite3.connect(str(config.db_path))
+    conn = connect_db(config.db_path)
     cursor = conn.cursor()
 
     progress = ProgressBar(len(files), "Metrics")
 
-    for file_info in files:
+    for file_info, complexity in zip(files, iter_complexities(files)):
         progress.update()
 
         file_id = file_info["id"]
-        file_path = file_info["full_path"]
-        language = file_info.get("language", "")
-
-        complexity = calculate_complexity(file_path, language)
 
         # Score de documentation
         cursor.execute("""
@@ -1221,6 +1552,21 @@ def get_git_commits(file_path: str, days: int, project_root: Path) -> int:
         return 0
 
 
+# Nombre max de contributeurs conservés par fichier
+MAX_CONTRIBUTORS = 10
+
+
+def rank_contributors(counts: Counter) -> list[str]:
+    """
+    Sélectionne les contributeurs principaux d'un fichier.
+
+    Les auteurs sont classés par nombre de commits sur le fichier ; à égalité,
+    le plus récent l'emporte (ordre d'insertion du Counter, l'historique
+    étant parcouru du plus récent au plus ancien).
+    """
+    return [author for author, _ in counts.most_common(MAX_CONTRIBUTORS)]
+
+
 def get_git_contributors(file_path: str, project_root: Path) -> list[str]:
     """Récupère les contributeurs d'un fichier."""
     try:
@@ -1232,8 +1578,7 @@ def get_git_contributors(file_path: str, project_root: Path) -> list[str]:
             timeout=10,
         )
         if result.stdout.strip():
-            contributors = list(set(result.stdout.strip().split("\n")))
-            return contributors[:10]  # Limite à 10
+            return rank_contributors(Counter(result.stdout.strip().split("\n")))
         return []
     except Exception:
         return []
@@ -1254,6 +1599,85 @@ def get_git_last_modified(file_path: str, project_root: Path) -> Optional[str]:
         return None
 
 
+def collect_git_activity(project_root: Path) -> Optional[dict[str, dict[str, Any]]]:
+    """
+    Collecte l'activité Git de tous les fichiers en un seul `git log`.
+
+    Remplace les 5 appels git par fichier (commits 30/90/365j, contributeurs,
+    dernière modification) par un unique parcours de l'historique.
+
+    Returns:
+        Dict {path: {commits_30d, commits_90d, commits_365d, contributors,
+        last_modified}} ou None si git a échoué (l'appelant se rabat alors
+        sur les fonctions par fichier).
+    """
+    try:
+        result = subprocess.run(
+            [
+                "git", "-c", "core.quotepath=off", "log", "--relative",
+                "--name-only", "--format=%x1e%ct%x1f%aI%x1f%an",
+            ],
+            capture_output=True,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+            cwd=str(project_root),
+            timeout=300,
+        )
+    except Exception:
+        return None
+
+    if result.returncode != 0:
+        return None
+
+    now = time.time()
+    cutoffs = {
+        "commits_30d": now - 30 * 86400,
+        "commits_90d": now - 90 * 86400,
+        "commits_365d": now - 365 * 86400,
+    }
+
+    activity: dict[str, dict[str, Any]] = {}
+
+    # Les commits sortent du plus récent au plus ancien
+    for record in result.stdout.split("\x1e"):
+        if not record.strip():
+            continue
+
+        header, _, names = record.partition("\n")
+        try:
+            commit_ts, author_date, author = header.split("\x1f", 2)
+            commit_ts = int(commit_ts)
+        except ValueError:
+            continue
+
+        for path in names.split("\n"):
+            if not path:
+                continue
+
+            info = activity.get(path)
+            if info is None:
+                info = activity[path] = {
+                    "commits_30d": 0,
+                    "commits_90d": 0,
+                    "commits_365d": 0,
+                    "contributors": Counter(),
+                    "last_modified": author_date,
+                }
+
+            for key, cutoff in cutoffs.items():
+                if commit_ts >= cutoff:
+                    info[key] += 1
+
+            if author:
+                info["contributors"][author] += 1
+
+    for info in activity.values():
+        info["contributors"] = rank_contributors(info["contributors"])
+
+    return activity
+
+
 def step_6_analyze_git(
     config: BootstrapConfig,
     logger: logging.Logger,
@@ -1269,9 +1693,14 @@ def step_6_analyze_git(
         stats.warnings.append("Not a Git repository")
         return
 
-    conn = sqlite3.connect(str(config.db_path))
+    conn = connect_db(config.db_path)
     cursor = conn.cursor()
 
+    # Un seul git log pour tout le dépôt (fallback par fichier si échec)
+    activity = collect_git_activity(config.project_root)
+    if activity is None:
+        logger.warning("Batched git log failed, falling back to per-file queries")
+
     progress = ProgressBar(len(files), "Git analysis")
 
     for file_info in files:
@@ -1280,11 +1709,25 @@ def step_6_analyze_git(
         file_id = file_info["id"]
         file_path = file_info["path"]
 
-        commits_30d = get_git_commits(file_path, 30, config.project_root)
-        commits_90d = get_git_commits(file_path, 90, config.project_root)
-        commits_365d = get_git_commits(file_path, 365, config.project_root)
-        contributors = get_git_contributors(file_path, config.project_root)
-        last_modified = get_git_last_modified(file_path, config.project_root)
+        if activity is not None:
+            info = activity.get(file_path)
+            if info:
+                commits_30d = info["commits_30d"]
+                commits_90d = info["commits_90d"]
+                commits_365d = info["commits_365d"]
+                contributors = info["contributors"]
+                last_modified = info["last_modified"]
+            else:
+                # Fichier jamais commité
+                commits_30d = commits_90d = commits_365d = 0
+                contributors = []
+                last_modified = None
+        else:
+            commits_30d = get_git_commits(file_path, 30, config.project_root)
+            commits_90d = get_git_commits(file_path, 90, config.project_root)
+            commits_365d = get_git_commits(file_path, 365, config.project_root)
+            contributors = get_git_contributors(file_path, config.project_root)
+            last_modified = get_git_last_modified(file_path, config.project_root)
 
         cursor.execute("""
             UPDATE files SET
@@ -1349,20 +1792,20 @@ def matches_pattern(path: str, patterns: list[str]) -> bool:
     return False
 
 
-def check_security_content(file_path: Path) -> bool:
-    """Vérifie si le fichier contient du code sensible."""
-    security_patterns = [
-        r'\bpassword\b', r'\bsecret\b', r'\btoken\b', r'\bapi_key\b',
-        r'\bprivate_key\b', r'\bcredential\b',
-        r'\bAES\b', r'\bRSA\b', r'\bSHA256\b', r'\bMD5\b', r'\bbcrypt\b',
-        r'\bencrypt\b', r'\bdecrypt\b', r'\bhash\b',
-    ]
+# Mots-clés de code sensible, en minuscules (cherchés dans le contenu mis
+# en minuscules) : une seule recherche au lieu d'une par mot-clé
+SECURITY_CONTENT_PATTERN = re.compile(
+    r'\b(?:password|secret|token|api_key|private_key|credential'
+    r'|aes|rsa|sha256|md5|bcrypt|encrypt|decrypt|hash)\b'
+)
 
+
+def check_security_content(file_path: Path, content: Optional[str] = None) -> bool:
+    """Vérifie si le fichier contient du code sensible (content : texte déjà lu)."""
     try:
-        content = file_path.read_text(encoding="utf-8", errors="replace").lower()
-        for pattern in security_patterns:
-            if re.search(pattern, content, re.IGNORECASE):
-                return True
+        if content is None:
+            content = file_path.read_text(encoding="utf-8", errors="replace")
+        return SECURITY_CONTENT_PATTERN.search(content.lower()) is not None
     except Exception:
         pass
 
@@ -1378,7 +1821,7 @@ def step_7_mark_critical(
     """Étape 7 : Marquer les fichiers critiques."""
     print(f"\n{Colors.BOLD}Step 7/9:{Colors.RESET} Marking critical files...")
 
-    conn = sqlite3.connect(str(config.db_path))
+    conn = connect_db(config.db_path)
     cursor = conn.cursor()
 
     critical_count = 0
@@ -1698,7 +2141,7 @@ def step_8_import_patterns(
     """Étape 8 : Importer les patterns par défaut."""
     print(f"\n{Colors.BOLD}Step 8/9:{Colors.RESET} Importing default patterns...")
 
-    conn = sqlite3.connect(str(config.db_path))
+    conn = connect_db(config.db_path)
     cursor = conn.cursor()
 
     imported = 0
@@ -1744,7 +2187,7 @@ def step_9_verify_integrity(
     """Étape 9 : Vérifier l'intégrité de la base."""
     print(f"\n{Colors.BOLD}Step 9/9:{Colors.RESET} Verifying database integrity...")
 
-    conn = sqlite3.connect(str(config.db_path))
+    conn = connect_db(config.db_path)
     cursor = conn.cursor()
 
     issues = []
@@ -1893,7 +2336,7 @@ def get_checkpoint(config: BootstrapConfig) -> Optional[IndexCheckpoint]:
         return None
 
     try:
-        conn = sqlite3.connect(str(config.db_path))
+        conn = connect_db(config.db_path)
         conn.row_factory = sqlite3.Row
         cursor = conn.execute("SELECT * FROM index_checkpoints WHERE id = 1")
         row = cursor.fetchone()
@@ -1938,7 +2381,7 @@ def save_checkpoint(
         return False
 
     try:
-        conn = sqlite3.connect(str(config.db_path))
+        conn = connect_db(config.db_path)
 
         # Utiliser INSERT OR REPLACE pour mettre à jour la ligne unique
         conn.execute("""
@@ -2064,6 +2507,9 @@ def reindex_file(
     """
     Réindexe un seul fichier : supprime l'ancien index et réindexe.
 
+    Un fichier déjà indexé avec le même hash de contenu (checkout, revert,
+    touch) est laissé tel quel.
+
     Args:
         config: Configuration du bootstrap
         logger: Logger
@@ -2080,10 +2526,23 @@ def reindex_file(
         logger.warning(f"File not found for reindexing: {file_path}")
         return 0, 0
 
+    # Lire le contenu (une seule lecture pour le hash, les métriques et les symboles)
+    try:
+        data = full_path.read_bytes()
+    except Exception as e:
+        logger.warning(f"Cannot read {file_path}: {e}")
+        return 0, 0
+
+    content_hash = get_content_hash(full_path, content=data)
+
     # 1. Supprimer les anciennes données
-    cursor.execute("SELECT id FROM files WHERE path = ?", (file_path,))
+    cursor.execute("SELECT id, content_hash FROM files WHERE path = ?", (file_path,))
     existing = cursor.fetchone()
 
+    if existing and existing[1] == content_hash:
+        logger.debug(f"Unchanged: {file_path}")
+        return 0, 0
+
     if existing:
         file_id = existing[0]
         # Supprimer les symboles (les relations sont supprimées en cascade)
@@ -2109,22 +2568,15 @@ def reindex_file(
         logger.warning(f"Unknown language for {file_path}")
         return 0, 0
 
-    # Lire le contenu
-    try:
-        content = full_path.read_text(encoding="utf-8", errors="replace")
-    except Exception as e:
-        logger.warning(f"Cannot read {file_path}: {e}")
-        return 0, 0
-
     # Calculer les métriques
-    line_counts = count_lines(full_path)
-    content_hash = get_content_hash(full_path)
+    text = data.decode("utf-8", errors="replace")
+    line_counts = count_lines(full_path, content=text)
     module = get_module_from_path(file_path, config.project_root)
 
     # Déterminer si c'est critique
     is_critical = matches_pattern(file_path, config.critical_paths) or \
                   matches_pattern(file_path, config.high_importance_paths)
-    security_sensitive = check_security_content(full_path)
+    security_sensitive = check_security_content(full_path, content=text)
 
     # Insérer le fichier
     cursor.execute("""
@@ -2143,35 +2595,13 @@ def reindex_file(
     # Parser les symboles
     symbols = []
     if language == "python":
-        symbols = parse_python_file(full_path)
-    elif language in ("c", "cpp") and shutil.which("ctags"):
+        symbols = parse_python_file(full_path, content=data)
+    elif language in ("c", "cpp") and ctags_available():
         symbols = run_ctags(full_path)
 
     # Insérer les symboles
-    symbols_count = 0
-    for sym in symbols:
-        cursor.execute("""
-            INSERT INTO symbols (
-                file_id, name, qualified_name, kind, line_start, line_end,
-                signature, visibility, complexity, is_static,
-                doc_comment, has_doc, base_classes_json
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            file_id,
-            sym.get("name", ""),
-            sym.get("qualified_name"),
-            sym.get("kind", "unknown"),
-            sym.get("line_start"),
-            sym.get("line_end"),
-            sym.get("signature", ""),
-            sym.get("visibility", "public"),
-            sym.get("complexity", 0),
-            1 if sym.get("is_static") else 0,
-            sym.get("doc_comment", ""),
-            1 if sym.get("doc_comment") else 0,
-            json.dumps(sym.get("base_classes")) if sym.get("base_classes") else None,
-        ))
-        symbols_count += 1
+    cursor.executemany(SYMBOL_INSERT_SQL, [symbol_row(file_id, sym) for sym in symbols])
+    symbols_count = len(symbols)
 
     logger.debug(f"Reindexed {file_path}: {symbols_count} symbols")
     return symbols_count, 0
@@ -2265,7 +2695,7 @@ def run_incremental(
         print(f"  Renamed: {len(changes['renamed'])} files")
 
     # Ouvrir la connexion
-    conn = sqlite3.connect(str(config.db_path))
+    conn = connect_db(config.db_path)
     conn.execute("PRAGMA foreign_keys = ON")
 
     try:
@@ -2589,7 +3019,7 @@ def main() -> int:
     # Update meta and save checkpoint
     if success:
         try:
-            conn = sqlite3.connect(str(config.db_path))
+            conn = connect_db(config.db_path)
             conn.execute(
                 "UPDATE agentdb_meta SET value = ? WHERE key = 'project_name'",
                 (config.project_root.name,)
@@ -13,6 +13,7 @@ Usage:
 """
 
 import argparse
+import heapq
 import json
 import re
 import sqlite3
@@ -425,14 +426,14 @@ def generate_markdown(report: SonarReport, commit: str | None, branch: str | Non
     lines.append("| Fichier | Blocker | Critical | Major | Minor | Total |")
     lines.append("|---------|---------|----------|-------|-------|-------|")
 
-    # Sort files by total issues
-    file_totals = []
-    for file_path, counts in report.by_file.items():
-        total = sum(counts.values())
-        file_totals.append((file_path, counts, total))
-    file_totals.sort(key=lambda x: x[2], reverse=True)
+    # Top N files by total issues (partial selection, no full sort)
+    file_totals = [
+        (file_path, counts, sum(counts.values()))
+        for file_path, counts in report.by_file.items()
+    ]
+    top_files = heapq.nlargest(top_n, file_totals, key=lambda x: x[2])
 
-    for file_path, counts, total in file_totals[:top_n]:
+    for file_path, counts, total in top_files:
         b = counts.get("Blocker", 0)
         c = counts.get("Critical", 0)
         m = counts.get("Major", 0)
@@ -452,11 +453,11 @@ def generate_markdown(report: SonarReport, commit: str | None, branch: str | Non
     lines.append("| Règle | Description | Count |")
     lines.append("|-------|-------------|-------|")
 
-    # Sort rules by count
+    # Top N rules by count
     rule_items = [(rule, data["name"], data["count"]) for rule, data in report.by_rule.items()]
-    rule_items.sort(key=lambda x: x[2], reverse=True)
+    top_rules = heapq.nlargest(top_n, rule_items, key=lambda x: x[2])
 
-    for rule, name, count in rule_items[:top_n]:
+    for rule, name, count in top_rules:
         # Truncate long rule names
         display_name = name[:50] + "..." if len(name) > 50 else name
         lines.append(f"| {rule} | {display_name} | {count} |")
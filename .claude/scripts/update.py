@@ -18,6 +18,7 @@ Usage:
 from __future__ import annotations
 
 import argparse
+import ast
 import hashlib
 import json
 import logging
@@ -26,12 +27,31 @@ import shutil
 import sqlite3
 import subprocess
 import sys
+import threading
 import time
+from collections import Counter
 from dataclasses import dataclass, field
 from datetime import datetime
+from functools import lru_cache
+from itertools import repeat
 from pathlib import Path
 from typing import Any, Optional
 
+try:
+    import xxhash
+except ImportError:  # xxhash est optionnel, fallback sur blake3/hashlib
+    xxhash = None
+
+try:
+    import blake3
+except ImportError:  # blake3 est optionnel, fallback sur hashlib
+    blake3 = None
+
+try:
+    import orjson
+except ImportError:  # orjson est optionnel, fallback sur json
+    orjson = None
+
 # =============================================================================
 # CONFIGURATION
 # =============================================================================
@@ -55,6 +75,7 @@ if not sys.stdout.isatty():
 class UpdateStats:
     """Statistiques de mise à jour."""
     files_updated: int = 0
+    files_unchanged: int = 0
     files_added: int = 0
     files_removed: int = 0
     symbols_added: int = 0
@@ -89,6 +110,28 @@ def setup_logging(verbose: bool = False) -> logging.Logger:
 logger = setup_logging()
 
 
+# =============================================================================
+# DATABASE
+# =============================================================================
+
+# PRAGMAs par connexion (mêmes réglages que agentdb.db) : sans synchronous=NORMAL,
+# chaque commit d'un fichier mis à jour ferait un fsync.
+_SQLITE_PRAGMAS = (
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA cache_size = -64000",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA mmap_size = 268435456",
+)
+
+
+def _connect(db_path: Path) -> sqlite3.Connection:
+    """Ouvre la base avec les PRAGMAs de performance."""
+    conn = sqlite3.connect(str(db_path))
+    for pragma in _SQLITE_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
 # =============================================================================
 # FUNCTION 1: GET_MODIFIED_FILES
 # =============================================================================
@@ -218,7 +261,8 @@ def update_file(
     db_path: Path,
     project_root: Path,
     file_path: str,
-    stats: UpdateStats
+    stats: UpdateStats,
+    force: bool = False
 ) -> bool:
     """
     Met à jour un fichier dans la base de données.
@@ -227,11 +271,15 @@ def update_file(
     2. Réindexe le fichier
     3. Met à jour les métriques
 
+    Un fichier dont le hash de contenu n'a pas changé depuis la dernière
+    indexation (checkout, revert, touch) est laissé tel quel.
+
     Args:
         db_path: Chemin vers la base de données
         project_root: Racine du projet
         file_path: Chemin relatif du fichier
         stats: Statistiques à mettre à jour
+        force: Réindexer même si le contenu est inchangé
 
     Returns:
         True si succès
@@ -242,13 +290,13 @@ def update_file(
         logger.warning(f"File not found: {file_path}")
         return False
 
-    conn = sqlite3.connect(str(db_path))
+    conn = _connect(db_path)
     conn.row_factory = sqlite3.Row
     cursor = conn.cursor()
 
     try:
         # 1. Trouver le fichier existant
-        cursor.execute("SELECT id FROM files WHERE path = ?", (file_path,))
+        cursor.execute("SELECT id, content_hash FROM files WHERE path = ?", (file_path,))
         row = cursor.fetchone()
 
         if not row:
@@ -257,6 +305,17 @@ def update_file(
 
         file_id = row["id"]
 
+        # Une seule lecture du fichier pour le parsing, les includes et les métriques
+        data = full_path.read_bytes()
+        content_hash = _get_content_hash(full_path, content=data)
+
+        if not force and row["content_hash"] == content_hash:
+            stats.files_unchanged += 1
+            logger.debug(f"Unchanged: {file_path}")
+            return True
+
+        content = data.decode("utf-8", errors="replace")
+
         # 2. Supprimer les anciens symboles (CASCADE supprime les relations)
         cursor.execute("SELECT COUNT(*) FROM symbols WHERE file_id = ?", (file_id,))
         old_symbol_count = cursor.fetchone()[0]
@@ -271,29 +330,16 @@ def update_file(
         )
 
         # 4. Réindexer le fichier
-        new_symbols = _parse_file(full_path)
+        new_symbols = _parse_file(full_path, content=data)
 
-        for sym in new_symbols:
-            cursor.execute("""
-                INSERT INTO symbols (
-                    file_id, name, kind, line_start, line_end,
-                    signature, doc_comment, has_doc
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                file_id,
-                sym.get("name", ""),
-                sym.get("kind", "unknown"),
-                sym.get("line_start"),
-                sym.get("line_end"),
-                sym.get("signature", ""),
-                sym.get("doc_comment", ""),
-                1 if sym.get("doc_comment") else 0,
-            ))
-            stats.symbols_added += 1
+        cursor.executemany(
+            _SYMBOL_INSERT_SQL, [_symbol_row(file_id, sym) for sym in new_symbols]
+        )
+        stats.symbols_added += len(new_symbols)
 
         # 5. Réextraire les includes/imports
         language = _get_language(full_path.suffix)
-        includes = _extract_includes(full_path, language)
+        includes = _extract_includes(full_path, language, content=content)
 
         for inc in includes:
             cursor.execute(
@@ -309,9 +355,8 @@ def update_file(
                 """, (file_id, target[0], inc["line"]))
 
         # 6. Mettre à jour les métriques du fichier
-        line_counts = _count_lines(full_path)
-        complexity = _calculate_complexity(full_path, language)
-        content_hash = _get_content_hash(full_path)
+        line_counts = _count_lines(full_path, content=content)
+        complexity = _calculate_complexity(full_path, language, content=content)
 
         # Score de documentation
         cursor.execute("""
@@ -376,8 +421,9 @@ def _add_new_file(
 
     try:
         language = _get_language(full_path.suffix)
-        line_counts = _count_lines(full_path)
-        content_hash = _get_content_hash(full_path)
+        data = full_path.read_bytes()
+        line_counts = _count_lines(full_path, content=data.decode("utf-8", errors="replace"))
+        content_hash = _get_content_hash(full_path, content=data)
         module = _get_module_from_path(file_path)
 
         cursor.execute("""
@@ -402,24 +448,11 @@ def _add_new_file(
         file_id = cursor.lastrowid
 
         # Parser et indexer les symboles
-        symbols = _parse_file(full_path)
-        for sym in symbols:
-            cursor.execute("""
-                INSERT INTO symbols (
-                    file_id, name, kind, line_start, line_end,
-                    signature, doc_comment, has_doc
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                file_id,
-                sym.get("name", ""),
-                sym.get("kind", "unknown"),
-                sym.get("line_start"),
-                sym.get("line_end"),
-                sym.get("signature", ""),
-                sym.get("doc_comment", ""),
-                1 if sym.get("doc_comment") else 0,
-            ))
-            stats.symbols_added += 1
+        symbols = _parse_file(full_path, content=data)
+        cursor.executemany(
+            _SYMBOL_INSERT_SQL, [_symbol_row(file_id, sym) for sym in symbols]
+        )
+        stats.symbols_added += len(symbols)
 
         conn.commit()
         stats.files_added += 1
@@ -449,7 +482,7 @@ def remove_file(
     Returns:
         True si succès
     """
-    conn = sqlite3.connect(str(db_path))
+    conn = _connect(db_path)
     cursor = conn.cursor()
 
     try:
@@ -504,7 +537,7 @@ def update_activity(
     Returns:
         Nombre de fichiers mis à jour
     """
-    conn = sqlite3.connect(str(db_path))
+    conn = _connect(db_path)
     conn.row_factory = sqlite3.Row
     cursor = conn.cursor()
 
@@ -523,16 +556,32 @@ def update_activity(
 
         files = cursor.fetchall()
 
+        # Un seul git log pour tous les fichiers concernés
+        activity = _collect_git_activity(
+            project_root,
+            [row["path"] for row in files] if file_paths else None,
+        )
+        if activity is None:
+            logger.warning("Batched git log failed, falling back to per-file queries")
+
         for file_row in files:
             file_id = file_row["id"]
             file_path = file_row["path"]
 
-            # Compter les commits par période
-            commits_30d = _get_git_commits(file_path, 30, project_root)
-            commits_90d = _get_git_commits(file_path, 90, project_root)
-            commits_365d = _get_git_commits(file_path, 365, project_root)
-            last_modified = _get_git_last_modified(file_path, project_root)
-            contributors = _get_git_contributors(file_path, project_root)
+            if activity is not None:
+                info = activity.get(file_path) or {}
+                commits_30d = info.get("commits_30d", 0)
+                commits_90d = info.get("commits_90d", 0)
+                commits_365d = info.get("commits_365d", 0)
+                last_modified = info.get("last_modified")
+                contributors = info.get("contributors", [])
+            else:
+                # Compter les commits par période
+                commits_30d = _get_git_commits(file_path, 30, project_root)
+                commits_90d = _get_git_commits(file_path, 90, project_root)
+                commits_365d = _get_git_commits(file_path, 365, project_root)
+                last_modified = _get_git_last_modified(file_path, project_root)
+                contributors = _get_git_contributors(file_path, project_root)
 
             cursor.execute("""
                 UPDATE files SET
@@ -566,6 +615,107 @@ def update_activity(
         conn.close()
 
 
+# Nombre max de chemins passés à un seul git log (limite de ligne de commande)
+GIT_PATHSPEC_CHUNK = 500
+
+
+def _collect_git_activity(
+    project_root: Path,
+    file_paths: Optional[list[str]] = None
+) -> Optional[dict[str, dict[str, Any]]]:
+    """
+    Collecte l'activité Git de plusieurs fichiers en un seul processus git.
+
+    Remplace les 5 appels git par fichier (_get_git_*) par un `git log
+    --name-only` restreint aux fichiers demandés (ou à tout le dépôt).
+
+    Args:
+        project_root: Racine du projet
+        file_paths: Fichiers à analyser (défaut: tous)
+
+    Returns:
+        Dict {path: {commits_30d, commits_90d, commits_365d, contributors,
+        last_modified}}, ou None si git a échoué
+    """
+    if file_paths:
+        chunks = [
+            file_paths[i:i + GIT_PATHSPEC_CHUNK]
+            for i in range(0, len(file_paths), GIT_PATHSPEC_CHUNK)
+        ]
+    else:
+        chunks = [[]]
+
+    now = time.time()
+    cutoffs = {
+        "commits_30d": now - 30 * 86400,
+        "commits_90d": now - 90 * 86400,
+        "commits_365d": now - 365 * 86400,
+    }
+    activity: dict[str, dict[str, Any]] = {}
+
+    for chunk in chunks:
+        cmd = [
+            "git", "-c", "core.quotepath=off", "log", "--relative",
+            "--name-only", "--format=%x1e%ct%x1f%aI%x1f%an",
+        ]
+        if chunk:
+            cmd += ["--", *chunk]
+
+        try:
+            result = subprocess.run(
+                cmd,
+                capture_output=True,
+                text=True,
+                encoding="utf-8",
+                errors="replace",
+                cwd=str(project_root),
+                timeout=120,
+            )
+        except Exception:
+            return None
+
+        if result.returncode != 0:
+            return None
+
+        # Les commits sortent du plus récent au plus ancien
+        for record in result.stdout.split("\x1e"):
+            if not record.strip():
+                continue
+
+            header, _, names = record.partition("\n")
+            try:
+                commit_ts, author_date, author = header.split("\x1f", 2)
+                commit_ts = int(commit_ts)
+            except ValueError:
+                continue
+
+            for path in names.split("\n"):
+                if not path:
+                    continue
+
+                info = activity.get(path)
+                if info is None:
+                    info = activity[path] = {
+                        "commits_30d": 0,
+                        "commits_90d": 0,
+                        "commits_365d": 0,
+                        "contributors": Counter(),
+                        "last_modified": author_date,
+                    }
+
+                for key, cutoff in cutoffs.items():
+                    if commit_ts >= cutoff:
+                        info[key] += 1
+
+                if author:
+                    info["contributors"][author] += 1
+
+    for info in activity.values():
+        info["contributors"] = _rank_contributors(info["contributors"])
+
+    return activity
+
+
 def _get_git_commits(file_path: str, days: int, project_root: Path) -> int:
     """Compte les commits pour un fichier."""
     try:
@@ -596,6 +746,21 @@ def _get_git_last_modified(file_path: str, project_root: Path) -> Optional[str]:
         return None
 
 
+# Nombre max de contributeurs conservés par fichier
+MAX_CONTRIBUTORS = 10
+
+
+def _rank_contributors(counts: Counter) -> list[str]:
+    """
+    Sélectionne les contributeurs principaux d'un fichier.
+
+    Les auteurs sont classés par nombre de commits sur le fichier ; à égalité,
+    le plus récent l'emporte (ordre d'insertion du Counter, l'historique
+    étant parcouru du plus récent au plus ancien).
+    """
+    return [author for author, _ in counts.most_common(MAX_CONTRIBUTORS)]
+
+
 def _get_git_contributors(file_path: str, project_root: Path) -> list[str]:
     """Récupère les contributeurs d'un fichier."""
     try:
@@ -607,7 +772,7 @@ def _get_git_contributors(file_path: str, project_root: Path) -> list[str]:
             timeout=10,
         )
         if result.stdout.strip():
-            return list(set(result.stdout.strip().split("\n")))[:10]
+            return _rank_contributors(Counter(result.stdout.strip().split("\n")))
         return []
     except Exception:
         return []
@@ -621,7 +786,8 @@ def update_incremental(
     project_root: Path,
     commit: Optional[str] = None,
     update_git_activity: bool = True,
-    verbose: bool = False
+    verbose: bool = False,
+    force: bool = False
 ) -> dict[str, Any]:
     """
     Orchestre la mise à jour incrémentale complète.
@@ -638,6 +804,7 @@ def update_incremental(
         commit: Commit de référence (défaut: HEAD~1)
         update_git_activity: Mettre à jour les stats git
         verbose: Mode verbeux
+        force: Réindexer aussi les fichiers dont le contenu est inchangé
 
     Returns:
         Rapport de mise à jour
@@ -690,13 +857,13 @@ def update_incremental(
     if changes["added"]:
         print(f"\n{Colors.CYAN}Adding new files...{Colors.RESET}")
         for file_path in changes["added"]:
-            update_file(db_path, project_root, file_path, stats)
+            update_file(db_path, project_root, file_path, stats, force=force)
 
     # 4. Traiter les fichiers modifiés
     if changes["modified"]:
         print(f"\n{Colors.CYAN}Updating modified files...{Colors.RESET}")
         for file_path in changes["modified"]:
-            update_file(db_path, project_root, file_path, stats)
+            update_file(db_path, project_root, file_path, stats, force=force)
 
     # 5. Mettre à jour l'activité Git pour les fichiers touchés
     if update_git_activity:
@@ -717,6 +884,8 @@ def update_incremental(
 
     print(f"\n{Colors.BOLD}Summary:{Colors.RESET}")
     print(f"  Files updated:  {stats.files_updated}")
+    if stats.files_unchanged:
+        print(f"  Files unchanged: {stats.files_unchanged}")
     print(f"  Files added:    {stats.files_added}")
     print(f"  Files removed:  {stats.files_removed}")
     print(f"  Symbols added:  {stats.symbols_added}")
@@ -733,6 +902,7 @@ def update_incremental(
     return {
         "success": len(stats.errors) == 0,
         "files_updated": stats.files_updated,
+        "files_unchanged": stats.files_unchanged,
         "files_added": stats.files_added,
         "files_removed": stats.files_removed,
         "symbols_added": stats.symbols_added,
@@ -771,27 +941,39 @@ def _get_module_from_path(path: str) -> str:
     return "root"
 
 
-def _count_lines(file_path: Path) -> dict[str, int]:
-    """Compte les lignes d'un fichier."""
+# Préfixes des lignes de commentaire (hors blocs /* */)
+_LINE_COMMENT_PREFIXES = ("//", "#")
+
+
+def _count_lines(file_path: Path, content: Optional[str] = None) -> dict[str, int]:
+    """
+    Compte les lignes d'un fichier (content : texte déjà lu).
+
+    Les lignes sont strippées une seule fois ; sans bloc /* */ dans le
+    fichier, blanches et commentaires se comptent sans boucle Python.
+    """
     try:
-        content = file_path.read_text(encoding="utf-8", errors="replace")
-        lines = content.split("\n")
+        if content is None:
+            content = file_path.read_text(encoding="utf-8", errors="replace")
+        lines = list(map(str.strip, content.split("\n")))
 
         total = len(lines)
-        blank = sum(1 for line in lines if not line.strip())
-
-        comment = 0
-        in_block = False
-        for line in lines:
-            stripped = line.strip()
-            if stripped.startswith("/*"):
-                in_block = True
-            if in_block:
-                comment += 1
-                if "*/" in stripped:
-                    in_block = False
-            elif stripped.startswith("//") or stripped.startswith("#"):
-                comment += 1
+        blank = lines.count("")
+
+        if "/*" not in content:
+            comment = sum(map(str.startswith, lines, repeat(_LINE_COMMENT_PREFIXES)))
+        else:
+            comment = 0
+            in_block = False
+            for stripped in lines:
+                if stripped.startswith("/*"):
+                    in_block = True
+                if in_block:
+                    comment += 1
+                    if "*/" in stripped:
+                        in_block = False
+                elif stripped.startswith(_LINE_COMMENT_PREFIXES):
+                    comment += 1
 
         return {
             "total": total,
@@ -803,48 +985,78 @@ def _count_lines(file_path: Path) -> dict[str, int]:
         return {"total": 0, "code": 0, "comment": 0, "blank": 0}
 
 
-def _get_content_hash(file_path: Path) -> str:
-    """Calcule le hash MD5 du contenu."""
-    try:
-        return hashlib.md5(file_path.read_bytes()).hexdigest()
-    except Exception:
-        return ""
+# Taille des blocs lus pour hacher un fichier
+HASH_CHUNK_SIZE = 1024 * 1024
+
 
+def _get_content_hash(file_path: Path, content: Optional[bytes] = None) -> str:
+    """
+    Calcule l'empreinte du contenu (même algorithme que l'indexeur AgentDB).
 
-def _calculate_complexity(file_path: Path, language: str) -> dict[str, Any]:
-    """Calcule la complexité cyclomatique."""
+    Sans `content` (octets déjà lus), le fichier est haché par blocs :
+    mémoire bornée quelle que soit sa taille.
+    """
+    if xxhash is not None:
+        hasher = xxhash.xxh3_128()
+    elif blake3 is not None:
+        hasher = blake3.blake3()
+    else:
+        hasher = hashlib.blake2b(digest_size=16)
+    if content is not None:
+        hasher.update(content)
+    else:
+        try:
+            with open(file_path, "rb") as f:
+                for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                    hasher.update(chunk)
+        except Exception:
+            return ""
+    if xxhash is None and blake3 is not None:
+        return hasher.hexdigest(length=16)
+    return hasher.hexdigest()
+
+
+# Mots-clés et opérateurs de branchement, en une seule alternative : un
+# parcours du texte au lieu d'un findall par mot-clé (mêmes totaux, les
+# alternatives ne pouvant pas se chevaucher)
+_BRANCH_KEYWORDS_PATTERN = re.compile(
+    r'\b(?:if|else|elif|for|while|case|catch)\b|\b&&\b|\b\|\|\b'
+)
+
+# Définitions de fonctions C/C++ (estimation du nombre de fonctions)
+_FUNCTION_DEF_PATTERN = re.compile(r'\b\w+\s*\([^)]*\)\s*\{')
+
+
+def _calculate_complexity(
+    file_path: Path,
+    language: str,
+    content: Optional[str] = None
+) -> dict[str, Any]:
+    """Calcule la complexité cyclomatique (content : texte déjà lu)."""
     complexity_sum = 0
     complexity_max = 0
     function_count = 0
 
     try:
-        content = file_path.read_text(encoding="utf-8", errors="replace")
-
-        branch_keywords = [
-            r'\bif\b', r'\belse\b', r'\belif\b', r'\bfor\b', r'\bwhile\b',
-            r'\bcase\b', r'\bcatch\b', r'\b&&\b', r'\b\|\|\b',
-        ]
+        if content is None:
+            content = file_path.read_text(encoding="utf-8", errors="replace")
 
         if language == "python":
-            import ast
             try:
                 tree = ast.parse(content)
                 for node in ast.walk(tree):
                     if isinstance(node, ast.FunctionDef):
                         func_content = ast.unparse(node)
-                        func_complexity = 1
-                        for kw in branch_keywords:
-                            func_complexity += len(re.findall(kw, func_content))
+                        func_complexity = 1 + len(_BRANCH_KEYWORDS_PATTERN.findall(func_content))
                         complexity_sum += func_complexity
                         complexity_max = max(complexity_max, func_complexity)
                         function_count += 1
             except Exception:
                 pass
         else:
-            for kw in branch_keywords:
-                complexity_sum += len(re.findall(kw, content))
+            complexity_sum = len(_BRANCH_KEYWORDS_PATTERN.findall(content))
             complexity_max = complexity_sum
-            function_count = len(re.findall(r'\b\w+\s*\([^)]*\)\s*\{', content))
+            function_count = len(_FUNCTION_DEF_PATTERN.findall(content))
 
     except Exception:
         pass
@@ -856,24 +1068,73 @@ def _calculate_complexity(file_path: Path, language: str) -> dict[str, Any]:
     }
 
 
-def _parse_file(file_path: Path) -> list[dict[str, Any]]:
-    """Parse un fichier et retourne les symboles."""
+_SYMBOL_INSERT_SQL = """
+    INSERT INTO symbols (
+        file_id, name, kind, line_start, line_end,
+        signature, doc_comment, has_doc
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def _symbol_row(file_id: int, sym: dict[str, Any]) -> tuple:
+    """Paramètres de _SYMBOL_INSERT_SQL pour un symbole parsé."""
+    return (
+        file_id,
+        sym.get("name", ""),
+        sym.get("kind", "unknown"),
+        sym.get("line_start"),
+        sym.get("line_end"),
+        sym.get("signature", ""),
+        sym.get("doc_comment", ""),
+        1 if sym.get("doc_comment") else 0,
+    )
+
+
+def _parse_file(file_path: Path, content: Optional[bytes] = None) -> list[dict[str, Any]]:
+    """Parse un fichier et retourne les symboles (content : octets déjà lus)."""
     language = _get_language(file_path.suffix)
 
     if language == "python":
-        return _parse_python_file(file_path)
+        return _parse_python_file(file_path, content)
     elif language in ("c", "cpp"):
         return _parse_with_ctags(file_path)
     else:
         return []
 
 
-def _parse_python_file(file_path: Path) -> list[dict[str, Any]]:
-    """Parse un fichier Python avec ast."""
-    import ast
-
+def _expr_source(node: ast.expr) -> str:
+    """Source d'une annotation : formes courantes sans ast.unparse (même résultat)."""
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Constant):
+        value = node.value
+        if value is None or isinstance(value, (bool, int)):
+            return repr(value)
+        if (isinstance(value, str) and node.kind is None and value.isprintable()
+                and "'" not in value and "\\" not in value):
+            return f"'{value}'"
+    elif isinstance(node, ast.Attribute):
+        if isinstance(node.value, ast.Name):
+            return f"{node.value.id}.{node.attr}"
+    elif isinstance(node, ast.Subscript):
+        inner = node.slice
+        # Un seul élément ou un élément étoilé : ast.unparse garde la
+        # virgule finale (tuple[int,], X[*Ts,])
+        if (isinstance(inner, ast.Tuple) and len(inner.elts) > 1
+                and not any(isinstance(e, ast.Starred) for e in inner.elts)):
+            args = ", ".join(_expr_source(e) for e in inner.elts)
+            return f"{_expr_source(node.value)}[{args}]"
+        if not isinstance(inner, (ast.Tuple, ast.Slice)):
+            return f"{_expr_source(node.value)}[{_expr_source(inner)}]"
+    return ast.unparse(node)
+
+
+def _parse_python_file(file_path: Path, content: Optional[bytes] = None) -> list[dict[str, Any]]:
+    """Parse un fichier Python avec ast (content : octets déjà lus)."""
     try:
-        content = file_path.read_text(encoding="utf-8")
+        if content is None:
+            content = file_path.read_bytes()
+        # ast.parse décode lui-même les octets (UTF-8 strict ou déclaration PEP 263)
         tree = ast.parse(content)
         symbols = []
 
@@ -883,12 +1144,12 @@ def _parse_python_file(file_path: Path) -> list[dict[str, Any]]:
                 for arg in node.args.args:
                     arg_str = arg.arg
                     if arg.annotation:
-                        arg_str += f": {ast.unparse(arg.annotation)}"
+                        arg_str += f": {_expr_source(arg.annotation)}"
                     args.append(arg_str)
 
                 signature = f"({', '.join(args)})"
                 if node.returns:
-                    signature += f" -> {ast.unparse(node.returns)}"
+                    signature += f" -> {_expr_source(node.returns)}"
 
                 symbols.append({
                     "name": node.name,
@@ -913,60 +1174,106 @@ def _parse_python_file(file_path: Path) -> list[dict[str, Any]]:
         return []
 
 
+@lru_cache(maxsize=None)
+def _ctags_available() -> bool:
+    """ctags est-il dans le PATH ? (recherché une fois par processus)"""
+    return shutil.which("ctags") is not None
+
+
+def _parse_ctags_line(line: bytes) -> Optional[dict[str, Any]]:
+    """Parse une ligne JSON de ctags (None si vide ou invalide)."""
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        if orjson is not None:
+            return orjson.loads(line)
+        return json.loads(line)
+    except ValueError:  # json/orjson.JSONDecodeError
+        return None
+
+
 def _parse_with_ctags(file_path: Path) -> list[dict[str, Any]]:
-    """Parse avec ctags."""
-    if not shutil.which("ctags"):
+    """Parse avec ctags (sortie JSON lue ligne à ligne, sans pseudo-tags)."""
+    if not _ctags_available():
         return []
 
     try:
-        result = subprocess.run(
+        proc = subprocess.Popen(
             ["ctags", "--output-format=json", "--fields=*", "-o", "-", str(file_path)],
-            capture_output=True,
-            text=True,
-            timeout=30,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
         )
-
-        symbols = []
-        for line in result.stdout.strip().split("\n"):
-            if line:
-                try:
-                    tag = json.loads(line)
-                    symbols.append({
-                        "name": tag.get("name", ""),
-                        "kind": tag.get("kind", "unknown"),
-                        "line_start": tag.get("line", 0),
-                        "signature": tag.get("signature", ""),
-                    })
-                except json.JSONDecodeError:
-                    pass
-
-        return symbols
-    except Exception:
+    except OSError:
         return []
 
+    timed_out = threading.Event()
 
-def _extract_includes(file_path: Path, language: str) -> list[dict[str, Any]]:
-    """Extrait les includes/imports."""
-    includes = []
+    def on_timeout() -> None:
+        timed_out.set()
+        proc.kill()
 
+    timer = threading.Timer(30, on_timeout)
+    timer.start()
     try:
-        content = file_path.read_text(encoding="utf-8", errors="replace")
-        lines = content.split("\n")
+        symbols = []
+        with proc.stdout:
+            for line in proc.stdout:
+                tag = _parse_ctags_line(line)
+                if tag is None or tag.get("_type") == "ptag":
+                    continue
+                symbols.append({
+                    "name": tag.get("name", ""),
+                    "kind": tag.get("kind", "unknown"),
+                    "line_start": tag.get("line", 0),
+                    "signature": tag.get("signature", ""),
+                })
+        proc.wait()
+    finally:
+        timer.cancel()
+
+    return [] if timed_out.is_set() else symbols
 
-        for i, line in enumerate(lines, 1):
-            line = line.strip()
 
-            if language in ("c", "cpp"):
-                match = re.match(r'#include\s*[<"]([^>"]+)[>"]', line)
-                if match:
-                    includes.append({"target": match.group(1), "line": i})
+# Includes/imports cherchés en une passe sur tout le contenu (re.M) plutôt
+# que ligne à ligne : [^\S\n] remplace \s pour ne pas changer de ligne, et
+# l'import capturé commence sur un caractère non blanc (ligne « strippée »)
+_INCLUDE_C_PATTERN = re.compile(r'^[^\S\n]*#include[^\S\n]*[<"]([^>"\n]+)[>"]', re.M)
+_IMPORT_PY_PATTERN = re.compile(
+    r'^[^\S\n]*(?:from[^\S\n]+(\S+)[^\S\n]+)?import[^\S\n]+(\S.*)', re.M
+)
 
-            elif language == "python":
-                match = re.match(r'(?:from\s+(\S+)\s+)?import\s+(.+)', line)
-                if match:
-                    module = match.group(1) or match.group(2).split(",")[0].strip()
-                    includes.append({"target": module.split()[0], "line": i})
 
+def _extract_includes(
+    file_path: Path,
+    language: str,
+    content: Optional[str] = None
+) -> list[dict[str, Any]]:
+    """Extrait les includes/imports (content : texte déjà lu)."""
+    includes = []
+
+    try:
+        if content is None:
+            content = file_path.read_text(encoding="utf-8", errors="replace")
+
+        if language in ("c", "cpp"):
+            pattern = _INCLUDE_C_PATTERN
+        elif language == "python":
+            pattern = _IMPORT_PY_PATTERN
+        else:
+            return includes
+
+        line, pos = 1, 0
+        for match in pattern.finditer(content):
+            line += content.count("\n", pos, match.start())
+            pos = match.start()
+            if pattern is _INCLUDE_C_PATTERN:
+                target = match.group(1)
+            else:
+                module = match.group(1) or match.group(2).split(",")[0].strip()
+                target = module.split()[0]
+            includes.append({"target": target, "line": line})
     except Exception:
         pass
 
@@ -997,6 +1304,11 @@ def main() -> int:
         default=Path.cwd(),
         help="Project root directory"
     )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Reindex files even if their content hash is unchanged"
+    )
     parser.add_argument(
         "--verbose", "-v",
         action="store_true",
@@ -1010,6 +1322,7 @@ def main() -> int:
         commit=args.commit,
         update_git_activity=not args.no_activity,
         verbose=args.verbose,
+        force=args.force,
     )
 
     return 0 if result.get("success") else 1
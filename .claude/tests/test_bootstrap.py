@@ -0,0 +1,59 @@
+"""
+Tests du script bootstrap.py.
+
+Le script est autonome (il n'importe pas agentdb) : il est chargé
+directement depuis scripts/.
+"""
+
+import importlib.util
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRIPT_PATH = Path(__file__).parent.parent / "scripts" / "bootstrap.py"
+
+
+@pytest.fixture(scope="module")
+def bootstrap():
+    """Module bootstrap chargé depuis son fichier."""
+    spec = importlib.util.spec_from_file_location("bootstrap", SCRIPT_PATH)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["bootstrap"] = module
+    try:
+        spec.loader.exec_module(module)
+        yield module
+    finally:
+        sys.modules.pop("bootstrap", None)
+
+
+def _git(repo, *args):
+    subprocess.run(
+        ["git", "-c", "user.name=t", "-c", "user.email=t@t", *args],
+        cwd=repo, check=True, capture_output=True,
+    )
+
+
+# =============================================================================
+# TESTS ACTIVITÉ GIT
+# =============================================================================
+
+class TestCollectGitActivity:
+    """Tests de la collecte groupée de l'activité Git."""
+
+    def test_paths_relative_to_project_in_subdirectory(self, bootstrap, tmp_path):
+        project = tmp_path / "sub"
+        project.mkdir()
+        (project / "a.py").write_text("x = 1\n")
+        (tmp_path / "outside.py").write_text("y = 2\n")
+        _git(tmp_path, "init", "-q")
+        _git(tmp_path, "add", "-A")
+        _git(tmp_path, "commit", "-qm", "init")
+
+        activity = bootstrap.collect_git_activity(project)
+
+        # Clés comparables à files.path (relatif à project_root)
+        assert list(activity) == ["a.py"]
+        assert activity["a.py"]["commits_30d"] == 1
+        assert activity["a.py"]["contributors"]
@@ -122,6 +122,16 @@ class TestFileRepository:
         retrieved = repo.get_by_path("nonexistent/file.c")
         assert retrieved is None
 
+    def test_get_ids_by_paths(self, db):
+        """Teste la résolution groupée de chemins en IDs."""
+        repo = FileRepository(db)
+        a_id = repo.insert(File(path="a.c", filename="a.c"))
+        b_id = repo.insert(File(path="b.c", filename="b.c"))
+
+        ids = repo.get_ids_by_paths(["b.c", "missing.c", "a.c", "b.c"])
+
+        assert ids == {"a.c": a_id, "b.c": b_id}
+
     def test_get_all(self, db):
         """Teste la récupération de tous les fichiers."""
         repo = FileRepository(db)
@@ -249,6 +259,22 @@ class TestSymbolRepository:
         assert created.complexity == 25
         assert created.nesting_depth == 5
 
+    def test_insert_many_assigns_ids(self, db):
+        """Teste que insert_many reporte les IDs générés sur les symboles."""
+        file_id = FileRepository(db).insert(File(path="src/ids.c", filename="ids.c"))
+        repo = SymbolRepository(db)
+        repo.insert(Symbol(file_id=file_id, name="first", kind="function"))
+        symbols = [
+            Symbol(file_id=file_id, name=f"func_{i}", kind="function")
+            for i in range(3)
+        ]
+
+        count = repo.insert_many(symbols)
+
+        assert count == 3
+        for sym in symbols:
+            assert repo.get_by_id(sym.id).name == sym.name
+
     def test_get_by_id(self, db, file_id):
         """Teste la récupération par ID."""
         repo = SymbolRepository(db)
@@ -216,11 +216,58 @@ class TestTransactions:
         row = db.fetch_one("SELECT path FROM files WHERE path = 'error.c'")
         assert row is None
 
+    def test_execute_inside_transaction_defers_commit(self, db):
+        """Teste que execute() ne commite pas à l'intérieur d'une transaction."""
+        from agentdb.db import TransactionError
+
+        try:
+            with db.transaction():
+                db.execute("INSERT INTO files (path, filename) VALUES ('tx.c', 'tx.c')")
+                raise RuntimeError("abort")
+        except TransactionError:
+            pass  # Expected
+
+        row = db.fetch_one("SELECT path FROM files WHERE path = 'tx.c'")
+        assert row is None
+
+    def test_nested_transaction_rolls_back_savepoint_only(self, db):
+        """Teste qu'une transaction imbriquée n'annule que ses écritures."""
+        from agentdb.db import TransactionError
+
+        with db.transaction():
+            db.execute("INSERT INTO files (path, filename) VALUES ('outer.c', 'outer.c')")
+            try:
+                with db.transaction():
+                    db.execute("INSERT INTO files (path, filename) VALUES ('inner.c', 'inner.c')")
+                    raise RuntimeError("abort inner")
+            except TransactionError:
+                pass  # Expected
+
+        assert db.fetch_one("SELECT path FROM files WHERE path = 'outer.c'") is not None
+        assert db.fetch_one("SELECT path FROM files WHERE path = 'inner.c'") is None
+
     def test_connection_isolation_level(self, db):
         """Vérifie le niveau d'isolation de la connexion."""
         # La connexion devrait avoir un isolation_level défini
         assert db.connection.isolation_level is not None or db.connection.isolation_level == ""
 
+    def test_deferred_indexes_are_rebuilt(self, db):
+        """Teste que les index supprimés pendant un chargement sont recréés."""
+        def symbol_indexes():
+            rows = db.fetch_all(
+                "SELECT name FROM sqlite_master WHERE type = 'index' "
+                "AND tbl_name = 'symbols' AND sql IS NOT NULL"
+            )
+            return {r["name"] for r in rows}
+
+        before = symbol_indexes()
+        assert "idx_symbols_file_id" in before
+
+        with db.transaction(), db.deferred_indexes("symbols"):
+            assert symbol_indexes() == set()
+
+        assert symbol_indexes() == before
+
 
 # =============================================================================
 # TESTS DES MÉTHODES UTILITAIRES
@@ -296,6 +343,27 @@ class TestUtilityMethods:
         assert row["cnt"] == 3
         assert rows_affected == 3
 
+    def test_insert_many_ids(self, db):
+        """Teste insert_many_ids : IDs dans l'ordre, refus des insertions partielles."""
+        from agentdb.db import DatabaseError
+        db.execute("INSERT INTO files (path, filename) VALUES ('a.c', 'a.c')")
+
+        ids = db.insert_many_ids(
+            "INSERT INTO files (path, filename) VALUES (?, ?)",
+            [("b.c", "b.c"), ("c.c", "c.c")],
+        )
+
+        paths = {r["id"]: r["path"] for r in db.fetch_all("SELECT id, path FROM files")}
+        assert [paths[i] for i in ids] == ["b.c", "c.c"]
+
+        # Une ligne ignorée rendrait les IDs déduits faux
+        with pytest.raises(DatabaseError):
+            db.insert_many_ids(
+                "INSERT OR IGNORE INTO files (path, filename) VALUES (?, ?)",
+                [("a.c", "a.c"), ("d.c", "d.c")],
+            )
+        assert db.fetch_one("SELECT 1 FROM files WHERE path = 'd.c'") is None
+
 
 # =============================================================================
 # TESTS DE GESTION DES ERREURS
@@ -0,0 +1,577 @@
+"""
+Tests pour l'indexeur de code AgentDB.
+
+Teste :
+- Indexation d'un fichier Python (symboles, appels)
+- Indexation d'un répertoire (séquentielle et via le pool de processus)
+- Réindexation d'un fichier existant
+- Fichiers inchangés ignorés (hash de contenu)
+- Réindexation des fichiers modifiés depuis un commit Git
+"""
+
+import ast
+import fnmatch
+import pytest
+import subprocess
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import agentdb.indexer as indexer_module
+from agentdb.indexer import (
+    CodeIndexer, CtagsDaemon, IndexerConfig, analyze_file, calculate_complexity,
+    check_ctags_available, compute_content_hash, count_lines, ctags_to_symbols,
+    extract_calls_regex, hash_file, parse_ctags_output,
+)
+
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+@pytest.fixture
+def project(tmp_path):
+    """Petit projet Python sur disque."""
+    pkg = tmp_path / "pkg"
+    pkg.mkdir()
+    (pkg / "core.py").write_text(
+        "import os\n"
+        "\n"
+        "def helper():\n"
+        "    return os.getcwd()\n"
+        "\n"
+        "def run():\n"
+        "    helper()\n"
+    )
+    (pkg / "cli.py").write_text(
+        "def main():\n"
+        "    run()\n"
+        "    helper()\n"
+    )
+    (pkg / "broken.py").write_text("def (:\n")
+    return tmp_path
+
+
+@pytest.fixture
+def indexer(db, project):
+    """Indexeur sans ctags sur le projet de test."""
+    config = IndexerConfig(project_root=project, ctags_path="/nonexistent/ctags")
+    return CodeIndexer(db, config)
+
+
+def _snapshot(db):
+    """Contenu indexé, indépendant des IDs."""
+    symbols = db.fetch_all(
+        """
+        SELECT f.path, s.name, s.kind FROM symbols s
+        JOIN files f ON s.file_id = f.id ORDER BY f.path, s.name
+        """
+    )
+    calls = db.fetch_all(
+        """
+        SELECT src.name AS caller, tgt.name AS callee FROM relations r
+        JOIN symbols src ON r.source_id = src.id
+        JOIN symbols tgt ON r.target_id = tgt.id
+        ORDER BY caller, callee
+        """
+    )
+    return symbols, calls
+
+
+# =============================================================================
+# TESTS
+# =============================================================================
+
+class TestIndexFile:
+    """Tests de index_file."""
+
+    def test_index_python_file(self, db, indexer):
+        result = indexer.index_file("pkg/core.py")
+
+        assert result.success
+        assert result.symbols_count == 2
+        assert result.relations_count == 1
+        row = db.fetch_one("SELECT * FROM files WHERE path = 'pkg/core.py'")
+        assert row["language"] == "python"
+        assert row["content_hash"]
+
+    def test_reindex_replaces_symbols(self, db, indexer):
+        indexer.index_file("pkg/core.py")
+        indexer.index_file("pkg/core.py")
+
+        count = db.fetch_scalar("SELECT COUNT(*) FROM symbols")
+        assert count == 2
+
+    def test_symbol_cache_follows_reindexed_files(self, db, indexer, project):
+        (project / "pkg" / "other.py").write_text("def helper():\n    pass\n")
+        for path in ("pkg/core.py", "pkg/other.py", "pkg/cli.py"):
+            indexer.index_file(path)
+        (project / "pkg" / "other.py").write_text("def unrelated():\n    pass\n")
+        indexer.index_file("pkg/other.py")
+        indexer.index_file("pkg/cli.py", force=True)
+
+        rows = db.fetch_all("SELECT name, MAX(id) AS id FROM symbols GROUP BY name")
+        assert indexer._symbol_cache == {r["name"]: r["id"] for r in rows}
+        assert {"caller": "main", "callee": "helper"} in _snapshot(db)[1]
+
+    def test_unchanged_file_is_skipped(self, indexer):
+        first = indexer.index_file("pkg/core.py")
+        second = indexer.index_file("pkg/core.py")
+        forced = indexer.index_file("pkg/core.py", force=True)
+
+        assert not first.skipped
+        assert second.skipped
+        assert (second.symbols_count, second.relations_count) == (2, 1)
+        assert not forced.skipped
+
+    @pytest.mark.parametrize("mmap_min_size", [1, 1 << 30])
+    def test_hash_file_matches_content_hash(self, project, monkeypatch, mmap_min_size):
+        monkeypatch.setattr(indexer_module, "MMAP_MIN_SIZE", mmap_min_size)
+        path = project / "pkg" / "core.py"
+
+        assert hash_file(path) == compute_content_hash(path.read_bytes())
+
+    def test_syntax_error_is_not_fatal(self, indexer):
+        result = indexer.index_file("pkg/broken.py")
+
+        assert result.success
+        assert result.symbols_count == 0
+
+    def test_analyze_file_keeps_candidate_calls(self, project):
+        analysis = analyze_file(str(project / "pkg" / "cli.py"), "python")
+
+        assert [s.name for s in analysis.symbols] == ["main"]
+        assert {c["callee"] for c in analysis.calls} == {"run", "helper"}
+
+    def test_python_complexity_ignores_strings_and_comments(self, tmp_path):
+        source = tmp_path / "mod.py"
+        source.write_text(
+            "def simple():\n"
+            "    # if this or that and more\n"
+            "    return 'for x in y if a and b'\n"
+            "\n"
+            "def branchy(x):\n"
+            "    if x and x > 1:\n"
+            "        return 1\n"
+            "    return 0\n"
+        )
+
+        cx = calculate_complexity(str(source), "python")
+
+        assert cx["sum"] == 3
+        assert cx["max"] == 3
+        assert cx["avg"] == 1.5
+
+    def test_python_signature_matches_unparse(self):
+        tree = ast.parse(
+            "def f(a: int, b: dict[str, list[int]] = None, *args: os.PathLike,\n"
+            "      c: 'Fwd' = u'x', d: int | None = -1, **kw: tuple[()]) -> Optional[str]: ...\n"
+            "def g(x: tuple[int,], y: X[*Ts]) -> Literal[*Ts]: ...\n"
+        )
+        func = tree.body[0]
+
+        sig = indexer_module._python_signature(func)
+
+        assert sig == (
+            "def f(a: int, b: dict[str, list[int]] = None, *args: os.PathLike, "
+            "c: 'Fwd' = u'x', d: int | None = -1, **kw: tuple[()]) -> Optional[str]"
+        )
+        # Virgule finale conservée comme par ast.unparse
+        assert indexer_module._python_signature(tree.body[1]) == (
+            "def g(x: tuple[int,], y: X[*Ts,]) -> Literal[*Ts,]"
+        )
+
+    def test_python_symbols_parse_given_content(self, tmp_path):
+        # content fourni : le fichier (absent ici) n'est pas relu
+        symbols = indexer_module.extract_python_symbols(
+            tmp_path / "missing.py", 0, content="def f():\n    pass\n"
+        )
+
+        assert [s.name for s in symbols] == ["f"]
+
+    def test_python_complexity_survives_deep_expressions(self, tmp_path):
+        source = tmp_path / "deep.py"
+        source.write_text("def f(a):\n    return " + " + ".join(["a"] * 1500) + " if a else 0\n")
+
+        cx = calculate_complexity(str(source), "python")
+
+        assert cx == {"sum": 2, "avg": 2.0, "max": 2}
+
+    def test_c_complexity_ignores_question_marks_after_last_colon(self):
+        content = "int f(int a) {\n    return a ? 1 : 0;\n}\n// why? " + "? " * 5000 + "\n"
+
+        cx = calculate_complexity("main.c", "c", content=content)
+
+        assert cx == {"sum": 2, "avg": 2.0, "max": 2}
+
+    def test_count_lines_python_docstrings_and_strings(self):
+        content = (
+            '"""Docstring\n'
+            '# pas un commentaire\n'
+            '"""\n'
+            'SQL = """\n'
+            '# dans une chaîne\n'
+            '"""\n'
+            '\n'
+            'x = "# pas un commentaire"  # commentaire\n'
+        )
+
+        counts = count_lines("mod.py", "python", content=content)
+
+        assert counts == {"total": 9, "code": 4, "comment": 3, "blank": 2}
+
+        # Chaînes seules sur leur ligne mais dans une expression : du code
+        content = (
+            'NAMES = [\n'
+            '    "alpha",\n'
+            '    "beta"\n'
+            ']\n'
+            'msg = (\n'
+            '    "hello "\n'
+            '    "world"\n'
+            ')\n'
+            'def f():\n'
+            '    r"""Docstring\n'
+            '    sur deux lignes."""\n'
+        )
+
+        counts = count_lines("mod.py", "python", content=content)
+
+        assert counts == {"total": 12, "code": 9, "comment": 2, "blank": 1}
+
+    def test_count_lines_c_comment_markers_in_strings(self):
+        content = (
+            'const char *s = "/* pas un commentaire";\n'
+            '// commentaire\n'
+            '/* bloc\n'
+            '   fin */ int x;\n'
+        )
+
+        counts = count_lines("main.c", "c", content=content)
+
+        assert counts == {"total": 5, "code": 2, "comment": 2, "blank": 1}
+
+
+    @pytest.mark.parametrize("path, module", [
+        ("main.c", None), ("src/main.c", "src"), ("src/net/http.c", "net"),
+        ("lib/a/b/c.c", "a"), ("pkg/core.py", "pkg"), ("pkg/sub/x.py", "pkg"),
+    ])
+    def test_detect_module(self, indexer, project, path, module):
+        assert indexer._detect_module(project / path) == module
+        assert indexer._detect_module(project / path) == module  # depuis le cache
+
+    @pytest.mark.parametrize("name, file_type", [
+        ("a.h", "header"), ("test_a.h", "header"), ("test_a.py", "test"),
+        ("spec.json", "test"), ("a.yaml", "config"), ("README.md", "doc"), ("a.c", "source"),
+    ])
+    def test_detect_file_type(self, indexer, name, file_type):
+        assert indexer._detect_file_type(Path(name)) == file_type
+
+    @pytest.mark.parametrize("path, content, sensitive", [
+        ("src/auth.c", "", True), ("src/main.c", "x = 1", False),
+        ("src/main.c", "PassWord = 1", True), ("src/main.c", "API_KEY = 1", True),
+        ("src/main.c", "monkey_keyboard = 1", False),
+    ])
+    def test_is_security_sensitive(self, indexer, path, content, sensitive):
+        assert indexer._is_security_sensitive(path, content) is sensitive
+
+
+class TestExtractCalls:
+    """Tests de l'extraction d'appels par regex (C/C++/JS)."""
+
+    def test_caller_is_enclosing_function(self):
+        content = (
+            "int helper(void) { return 0; }\n"
+            "int run(void) {\n"
+            "    /* helper(); */\n"
+            "    return helper();\n"
+            "}\n"
+            "int main(void) {\n"
+            "    run();\n"
+            "    helper();\n"
+            "}\n"
+        )
+        symbols = [
+            {"name": "helper", "kind": "function", "line_start": 1, "line_end": 1},
+            {"name": "run", "kind": "function", "line_start": 2, "line_end": 5},
+            {"name": "main", "kind": "function", "line_start": 6, "line_end": None},
+        ]
+
+        calls = extract_calls_regex("main.c", symbols, {}, content=content)
+
+        assert [(c["caller"], c["callee"], c["line"]) for c in calls] == [
+            ("run", "helper", 4),
+            ("main", "run", 7),
+            ("main", "helper", 8),
+        ]
+
+
+class TestIndexerConfig:
+    """Tests des patterns glob de la configuration."""
+
+    @pytest.mark.parametrize("path", [
+        "build/x.c", "src/build/x.c", "web/app.min.js", "x.pyc",
+        "pkg/__pycache__/m.py", "src/auth/login.c", "src/core/api.py", "main.c",
+    ])
+    def test_glob_union_matches_fnmatch(self, path):
+        config = IndexerConfig()
+
+        for patterns, check in (
+            (config.exclude_patterns, config.is_excluded),
+            (config.critical_paths, config.is_critical),
+            (config.high_importance_paths, config.is_high_importance),
+        ):
+            assert check(path) == any(fnmatch.fnmatch(path, p) for p in patterns)
+
+    def test_modified_patterns_are_recompiled(self):
+        config = IndexerConfig()
+        assert not config.is_excluded("gen/out.c")
+
+        config.exclude_patterns.append("gen/**")
+
+        assert config.is_excluded("gen/out.c")
+
+    @pytest.mark.parametrize("path, pruned", [
+        ("node_modules", True), (".git", True), ("build", True),
+        ("src", False), ("src/build", False), ("lib.min.js", False),
+    ])
+    def test_excluded_dir_prunes_only_fully_excluded_dirs(self, path, pruned):
+        config = IndexerConfig()
+
+        assert config.is_excluded_dir(path) == pruned
+        if pruned:
+            assert config.is_excluded(f"{path}/any/file.c")
+
+    def test_language_for_follows_reassigned_extensions(self):
+        config = IndexerConfig()
+        assert config.language_for(".py") == "python"
+        assert config.language_for(".txt") is None
+
+        config.extensions = {"text": [".txt"]}
+
+        assert config.language_for(".txt") == "text"
+        assert config.language_for(".py") is None
+
+
+class TestCtags:
+    """Tests de la détection de ctags."""
+
+    def test_check_ctags_available_is_memoized(self, monkeypatch):
+        calls = []
+
+        def fake_run(cmd, **kwargs):
+            calls.append(cmd)
+            return subprocess.CompletedProcess(cmd, 0, stdout="Universal Ctags 6.0.0", stderr="")
+
+        monkeypatch.setattr(indexer_module.subprocess, "run", fake_run)
+        check_ctags_available.cache_clear()
+        try:
+            first = check_ctags_available("/opt/ctags")
+            second = check_ctags_available("/opt/ctags")
+        finally:
+            check_ctags_available.cache_clear()
+
+        assert first == second == (True, "/opt/ctags")
+        assert len(calls) == 1
+
+    def test_ctags_output_is_cached_by_content(self, db, project, tmp_path, monkeypatch):
+        (project / "main.c").write_text("int main(void)\n{\n    return 0;\n}\n")
+        calls = []
+
+        def fake_run_ctags(file_path, ctags_path="ctags", language=None):
+            calls.append(file_path)
+            return [{"name": "main", "kind": "function", "line": 1, "end": 4}]
+
+        monkeypatch.setattr(indexer_module, "run_ctags", fake_run_ctags)
+        config = IndexerConfig(
+            project_root=project, ctags_path="/nonexistent/ctags",
+            ctags_cache_dir=tmp_path / "ctags_cache",
+        )
+        indexer = CodeIndexer(db, config)
+        indexer.ctags_available = True
+
+        first = indexer.index_file("main.c")
+        second = indexer.index_file("main.c", force=True)
+
+        assert first.symbols_count == second.symbols_count == 1
+        assert len(calls) == 1
+        assert len(list(config.ctags_cache_dir.iterdir())) == 1
+
+        # Autre version de ctags : les tags en cache ne sont plus relus
+        monkeypatch.setattr(indexer_module, "_ctags_version", lambda path: "Universal Ctags 7.0")
+        upgraded = CodeIndexer(db, config)
+        upgraded.ctags_available = True
+        upgraded.index_file("main.c", force=True)
+
+        assert len(calls) == 2
+
+    def test_daemon_answers_generate_tags_requests(self, project, tmp_path):
+        fake_ctags = tmp_path / "ctags"
+        fake_ctags.write_text(
+            f"#!{sys.executable}\n"
+            "import json, sys\n"
+            "print(json.dumps({'_type': 'program', 'name': 'Universal Ctags'}), flush=True)\n"
+            "for line in sys.stdin:\n"
+            "    name = json.loads(line)['filename']\n"
+            "    print(json.dumps({'_type': 'tag', 'name': 'main', 'path': name, 'kind': 'function'}))\n"
+            "    print(json.dumps({'_type': 'completed', 'command': 'generate-tags'}), flush=True)\n"
+        )
+        fake_ctags.chmod(0o755)
+        daemon = CtagsDaemon(str(fake_ctags))
+
+        assert daemon.start()
+        try:
+            first = daemon.tags_for(str(project / "pkg" / "core.py"))
+            second = daemon.tags_for(str(project / "pkg" / "cli.py"))
+        finally:
+            daemon.close()
+
+        assert [t["name"] for t in first + second] == ["main", "main"]
+        assert second[0]["path"] == str(project / "pkg" / "cli.py")
+        assert not daemon.is_running
+        assert not CtagsDaemon(str(tmp_path / "missing")).start()
+
+    def test_signature_and_return_type_from_pattern(self):
+        tags = [
+            {"name": "foo", "kind": "function", "pattern": "/^struct node_s *foo(int a, char *b)$/"},
+            {"name": "bar", "kind": "prototype", "pattern": "/^static int bar(void (*cb)(int));$/"},
+        ]
+
+        foo, bar = ctags_to_symbols(tags, file_id=1)
+
+        assert foo.signature == "struct node_s *foo(int a, char *b)"
+        assert foo.return_type == "struct node_s"
+        assert bar.signature == "static int bar(void (*cb)"
+
+    def test_parse_ctags_output_accepts_bytes(self):
+        output = (
+            b'{"_type": "ptag", "name": "JSON_OUTPUT_VERSION"}\n'
+            b'{"_type": "tag", "name": "main", "kind": "function", "line": 10}\n'
+            b'not json\n'
+        )
+
+        tags = parse_ctags_output(output)
+
+        assert [tag["name"] for tag in tags] == ["main"]
+        assert parse_ctags_output(output.decode()) == tags
+
+
+class TestIndexDirectory:
+    """Tests de index_directory."""
+
+    def test_index_directory(self, db, indexer):
+        results = indexer.index_directory(".")
+
+        assert len(results) == 3
+        assert all(r.success for r in results)
+        symbols, calls = _snapshot(db)
+        assert len(symbols) == 3
+        assert ("run", "helper") in {(c["caller"], c["callee"]) for c in calls}
+
+    def test_parallel_matches_serial(self, db, indexer, monkeypatch):
+        indexer.index_directory(".")
+        serial = _snapshot(db)
+
+        db.execute("DELETE FROM files")
+        monkeypatch.setattr(indexer_module, "PARALLEL_MIN_FILES", 1)
+        monkeypatch.setattr(indexer_module, "INDEXER_MAX_WORKERS", 2)
+        indexer.index_directory(".")
+
+        assert _snapshot(db) == serial
+
+    def test_reindex_skips_unchanged_files(self, db, indexer):
+        indexer.index_directory(".")
+        before = _snapshot(db)
+
+        results = indexer.index_directory(".")
+
+        assert all(r.skipped for r in results)
+        assert _snapshot(db) == before
+
+    def test_dependents_of_changed_file_are_relinked(self, db, indexer, project):
+        indexer.index_directory(".")
+        before = _snapshot(db)
+
+        core = project / "pkg" / "core.py"
+        core.write_text(core.read_text() + "\n# modifié\n")
+        results = {r.file_path: r for r in indexer.index_directory(".")}
+
+        assert not results["pkg/core.py"].skipped
+        assert not results["pkg/cli.py"].skipped  # appelle helper/run
+        assert results["pkg/broken.py"].skipped
+        assert _snapshot(db) == before
+
+    def test_incremental_matches_fresh_index(self, db, indexer, project):
+        # main() appelle helper ; extra.py appelle main() et un nom encore inconnu
+        (project / "pkg" / "extra.py").write_text("def outer():\n    main()\n    later()\n")
+        indexer.index_directory(".")
+
+        core = project / "pkg" / "core.py"
+        core.write_text(core.read_text() + "\ndef later():\n    pass\n")
+        indexer.index_directory(".")
+        incremental = _snapshot(db)
+
+        db.execute("DELETE FROM files")
+        indexer.index_directory(".")
+
+        assert incremental == _snapshot(db)
+        calls = {(c["caller"], c["callee"]) for c in incremental[1]}
+        assert {("outer", "later"), ("outer", "main")} <= calls
+
+
+@pytest.mark.skipif(not indexer_module.shutil.which("git"), reason="git absent")
+class TestReindexSince:
+    """Tests de la réindexation guidée par Git."""
+
+    @staticmethod
+    def _git(project, *args):
+        subprocess.run(
+            ["git", "-c", "user.name=t", "-c", "user.email=t@t", *args],
+            cwd=project, check=True, capture_output=True,
+        )
+
+    def test_only_changed_files_are_reindexed(self, db, indexer, project):
+        self._git(project, "init", "-q")
+        self._git(project, "add", "-A")
+        self._git(project, "commit", "-qm", "init")
+        indexer.index_directory(".")
+        assert db.get_meta(indexer_module.LAST_INDEXED_COMMIT_KEY)
+
+        core = project / "pkg" / "core.py"
+        core.write_text(core.read_text() + "\ndef extra():\n    pass\n")
+        self._git(project, "commit", "-qam", "core")
+        (project / "pkg" / "new.py").write_text("def fresh():\n    pass\n")
+        (project / "pkg" / "broken.py").unlink()
+
+        results = indexer.reindex_since()
+
+        assert sorted(r.file_path for r in results) == ["pkg/core.py", "pkg/new.py"]
+        symbols, _ = _snapshot(db)
+        assert {"extra", "fresh"} <= {s["name"] for s in symbols}
+        assert not db.fetch_one("SELECT 1 FROM files WHERE path = 'pkg/broken.py'")
+        # HEAD mémorisé : seul le fichier non commité reste à relire
+        assert [r.file_path for r in indexer.reindex_since()] == ["pkg/new.py"]
+
+    def test_renamed_files_drop_their_old_path(self, db, indexer, project):
+        (project / "pkg" / "été.py").write_text("def accent():\n    pass\n")
+        self._git(project, "init", "-q")
+        self._git(project, "add", "-A")
+        self._git(project, "commit", "-qm", "init")
+        indexer.index_directory(".")
+
+        # Renommage commité, puis renommage seulement indexé par git
+        self._git(project, "mv", "pkg/core.py", "pkg/renamed.py")
+        self._git(project, "commit", "-qm", "rename")
+        self._git(project, "mv", "pkg/cli.py", "pkg/cli2.py")
+        (project / "pkg" / "été.py").write_text("def accent():\n    return 1\n")
+
+        indexer.reindex_since()
+
+        paths = {r["path"] for r in db.fetch_all("SELECT path FROM files")}
+        assert {"pkg/renamed.py", "pkg/cli2.py", "pkg/été.py"} <= paths
+        assert not paths & {"pkg/core.py", "pkg/cli.py"}
+        names = [r["name"] for r in db.fetch_all("SELECT name FROM symbols")]
+        assert names.count("helper") == 1
+        assert names.count("main") == 1
+        assert names.count("accent") == 1
@@ -548,6 +548,19 @@ class TestMCPSearchSymbols:
         for sym in result["results"]:
             assert sym["name"].startswith("lcd_") or "lcd_" in sym["name"].lower()
 
+    def test_search_unknown_name_after_new_symbol(self, db):
+        """Teste qu'un nom absent ne renvoie rien, puis est trouvé une fois ajouté."""
+        db.execute("INSERT INTO files (path, filename) VALUES ('src/a.c', 'a.c')")
+        db.execute("INSERT INTO symbols (file_id, name, kind) VALUES (1, 'uart_init', 'function')")
+
+        result = search_symbols(db, query="*spi_send*")
+        assert result["results"] == []
+        assert result["total"] == 0
+
+        db.execute("INSERT INTO symbols (file_id, name, kind) VALUES (1, 'SPI_Send', 'function')")
+        result = search_symbols(db, query="*spi_send*")
+        assert [s["name"] for s in result["results"]] == ["SPI_Send"]
+
 
 # =============================================================================
 # TESTS DE GET_FILE_METRICS